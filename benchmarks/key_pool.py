@@ -0,0 +1,80 @@
+"""
+API key pool simulation.
+
+Drives GenAIService with fake model clients that enforce a per-key quota and
+reports how requests spread across keys, how many hit 429s and how many
+failed once every key was exhausted.
+
+Usage:
+    python -m benchmarks.key_pool
+    python -m benchmarks.key_pool --keys 4 --fake-rpm 20 --pool-rpm 30 --requests 100
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from src.services.fake_genai import FakeGenerativeModel, FakeQuota  # noqa: E402
+from src.services.genai_service import GenAIService  # noqa: E402
+from src.services.key_pool import KeyPool  # noqa: E402
+from src.utils.exceptions import AIServiceError  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+logger.setLevel("ERROR")
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Send concurrent requests through a pooled service backed by the fake."""
+    quota = FakeQuota(args.fake_rpm)
+    keys = [f"fake-key-{i:04d}" for i in range(args.keys)]
+    pool = KeyPool(
+        keys,
+        lambda key: FakeGenerativeModel(key, quota),
+        requests_per_minute=args.pool_rpm,
+        burst=args.burst,
+        max_wait_seconds=args.max_wait,
+    )
+    service = GenAIService(pool=pool)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int) -> bool:
+        async with semaphore:
+            try:
+                await service.generate_response(f"question {i}")
+                return True
+            except AIServiceError:
+                return False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{sum(results)}/{len(results)} succeeded in {elapsed:.2f}s\n")
+    print(f"{'key':<10} {'requests':>9} {'ok':>6} {'429s':>6} {'tokens':>7} {'cooldown s':>11}")
+    for usage in service.key_usage():
+        print(
+            f"{usage['key']:<10} {usage['requests']:>9} {usage['successes']:>6} "
+            f"{usage['rate_limited']:>6} {usage['tokens_remaining']:>7.2f} "
+            f"{usage['cooldown_seconds']:>11.2f}"
+        )
+
+
+def main() -> None:
+    """Parse arguments and run the simulation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--fake-rpm", type=int, default=15, help="Quota the fake enforces per key")
+    parser.add_argument("--pool-rpm", type=float, default=15, help="Quota the pool assumes per key")
+    parser.add_argument("--burst", type=float, default=15)
+    parser.add_argument("--max-wait", type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Knowledge base retrieval benchmark.
+
+Measures BM25 search latency over the bundled articles and over synthetic
+corpora of a few thousand passages built from the same vocabulary.
+
+Usage:
+    python -m benchmarks.knowledge_search
+    python -m benchmarks.knowledge_search --documents 1000 3000 10000 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from collections import Counter
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from src.services.knowledge_service import KnowledgeBase, Passage  # noqa: E402
+from src.services.semantic_cache import tokenize  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+logger.setLevel("WARNING")
+
+QUERIES = [
+    "How big should my emergency fund be?",
+    "What is compound interest?",
+    "How do I start investing as a beginner?",
+    "What is the 50/30/20 budgeting rule?",
+    "What are the benefits of a Roth IRA?",
+    "How should I prioritize paying off debt vs saving?",
+    "Help me understand 401(k) contributions",
+    "Is term life insurance better than whole life insurance?",
+    "How do capital gains taxes work?",
+    "Should I refinance my mortgage?",
+]
+
+
+def synthetic_knowledge_base(num_documents: int, seed: int = 7) -> KnowledgeBase:
+    """
+    Build a knowledge base of synthetic passages from the bundled vocabulary.
+
+    Terms are drawn with Zipfian frequencies, ranked by their frequency in the
+    bundled articles.
+    """
+    rng = random.Random(seed)
+    bundled = KnowledgeBase.from_directory()
+    counts = Counter(token for p in bundled.passages for token in tokenize(p.text))
+    vocabulary = [token for token, _ in counts.most_common()]
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    passages = []
+    for i in range(num_documents):
+        heading = " ".join(rng.choices(vocabulary, weights, k=5))
+        text = " ".join(rng.choices(vocabulary, weights, k=rng.randint(60, 200)))
+        passages.append(Passage(f"Synthetic {i}", heading, text))
+    return KnowledgeBase(passages)
+
+
+def measure(knowledge_base: KnowledgeBase, num_queries: int) -> dict:
+    """Measure per-query search latency in microseconds."""
+    timings = []
+    for i in range(num_queries):
+        query = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        knowledge_base.search(query, k=3)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return {
+        "mean_us": statistics.fmean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p99_us": timings[int(len(timings) * 0.99) - 1],
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, nargs="+", default=[1000, 3000, 5000])
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    corpora = [("bundled", KnowledgeBase.from_directory())]
+    for num_documents in args.documents:
+        start = time.perf_counter()
+        knowledge_base = synthetic_knowledge_base(num_documents)
+        build_ms = (time.perf_counter() - start) * 1000
+        corpora.append((f"synthetic ({build_ms:.0f} ms build)", knowledge_base))
+
+    print(f"{'corpus':<28} {'passages':>9} {'mean us':>8} {'p50 us':>8} {'p99 us':>8}")
+    for name, knowledge_base in corpora:
+        result = measure(knowledge_base, args.queries)
+        print(
+            f"{name:<28} {len(knowledge_base.passages):>9} {result['mean_us']:>8.1f} "
+            f"{result['p50_us']:>8.1f} {result['p99_us']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+End-to-end chat load test.
+
+Starts the app in a subprocess against the fake model backend (unless
+``--base-url`` points at a running server) and drives ``/chat`` or
+``/chat/stream`` with virtual users holding multi-turn conversations. Each
+conversation opens with one of the welcome message's sample questions and
+continues with follow-ups, sending the growing history the way the web client
+does. Reports throughput, errors and p50/p95/p99 latency for the whole request
+and for each server stage reported in the ``Server-Timing`` header (or the
+stream's ``done`` event), and saves results as JSON for comparing runs.
+
+Requires httpx (``pip install httpx``, listed in requirements.txt).
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --users 50 --duration 60 --stream --output run.json
+    python -m benchmarks.load_test --latency-ms 300 --error-rate 0.02 --compare run.json
+    python -m benchmarks.load_test --base-url http://localhost:8000 --conversations 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from src.config.agent_config import RESPONSE_TEMPLATES  # noqa: E402
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx is only needed for this benchmark
+    httpx = None
+
+OPENING_QUESTIONS = re.findall(r'^- "(.+)"$', RESPONSE_TEMPLATES["welcome"], re.MULTILINE)
+
+FOLLOW_UPS = [
+    "Can you explain that in simpler terms?",
+    "What if the interest rate were 7% instead?",
+    "Calculate loan payment for $250,000 at 6.5% for 30 years",
+    "How much should I save monthly to retire with $1,000,000 in 25 years at 7%?",
+    "What's the difference between a Roth IRA and a traditional IRA?",
+    "My monthly expenses are $3,500, how big should my emergency fund be?",
+    "Should I pay off my car loan early or invest the extra money?",
+    "How does inflation affect that plan?",
+    "What are index funds and why are they recommended?",
+    "Estimate federal income tax on $85,000 of income for a single filer",
+    "How often should I rebalance my portfolio?",
+    "Thanks! Can you summarize the key points?",
+]
+
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(values: List[float]) -> Dict:
+    """Get the count, mean and percentiles of latencies in milliseconds."""
+    if not values:
+        return {"count": 0}
+    array = np.array(values, dtype=float)
+    summary = {"count": int(array.size), "mean_ms": round(float(array.mean()), 3)}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(float(np.percentile(array, p)), 3)
+    summary["max_ms"] = round(float(array.max()), 3)
+    return summary
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Read stage durations from a ``Server-Timing`` header value."""
+    stages = {}
+    for metric in header.split(","):
+        name, _, params = metric.strip().partition(";")
+        match = re.search(r"dur=([0-9.]+)", params)
+        if match:
+            stages[name] = float(match.group(1))
+    return stages
+
+
+def parse_source(header: str) -> Optional[str]:
+    """Read the answer source from a ``Server-Timing`` header value."""
+    match = re.search(r'source;desc="([^"]*)"', header)
+    return match.group(1) if match else None
+
+
+class Results:
+    """Latencies, stage timings and outcomes collected during a run."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.first_byte: List[float] = []
+        self.stages: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Counter = Counter()
+        self.sources: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.conversations = 0
+
+    def record(
+        self,
+        status: str,
+        latency_ms: float,
+        stages: Dict[str, float],
+        source: Optional[str],
+        first_byte_ms: Optional[float] = None,
+    ) -> None:
+        """Record one request."""
+        self.statuses[status] += 1
+        if status != "200":
+            return
+        self.latencies.append(latency_ms)
+        if first_byte_ms is not None:
+            self.first_byte.append(first_byte_ms)
+        for stage, duration in stages.items():
+            self.stages[stage].append(duration)
+        if source:
+            self.sources[source] += 1
+
+    def report(self, elapsed: float, config: Dict) -> Dict:
+        """Summarize the run as a JSON-serializable dictionary."""
+        requests = sum(self.statuses.values())
+        ok = self.statuses.get("200", 0)
+        report = {
+            "config": config,
+            "elapsed_s": round(elapsed, 3),
+            "conversations": self.conversations,
+            "requests": requests,
+            "throughput_rps": round(ok / elapsed, 3) if elapsed else 0.0,
+            "error_rate": round((requests - ok) / requests, 4) if requests else 0.0,
+            "statuses": dict(self.statuses),
+            "errors": dict(self.errors.most_common(10)),
+            "sources": dict(self.sources),
+            "latency": {"total": summarize(self.latencies)},
+        }
+        if self.first_byte:
+            report["latency"]["first_byte"] = summarize(self.first_byte)
+        for stage, values in self.stages.items():
+            report["latency"][stage] = summarize(values)
+        return report
+
+
+async def send_turn(
+    client: "httpx.AsyncClient", history: List[str], session_id: str, stream: bool, results: Results
+) -> Optional[str]:
+    """
+    Send one chat turn and record its outcome.
+
+    Returns:
+        The AI response text, or None if the request failed
+    """
+    payload = {"history": history, "session_id": session_id}
+    start = time.perf_counter()
+    try:
+        if not stream:
+            response = await client.post("/chat", json=payload)
+            latency = (time.perf_counter() - start) * 1000
+            if response.status_code != 200:
+                results.record(str(response.status_code), latency, {}, None)
+                return None
+            header = response.headers.get("server-timing", "")
+            results.record("200", latency, parse_server_timing(header), parse_source(header))
+            return response.json()["response"]
+
+        first_byte = None
+        parts, done = [], None
+        async with client.stream("POST", "/chat/stream", json=payload) as response:
+            if response.status_code != 200:
+                await response.aread()
+                latency = (time.perf_counter() - start) * 1000
+                results.record(str(response.status_code), latency, {}, None)
+                return None
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                if first_byte is None:
+                    first_byte = (time.perf_counter() - start) * 1000
+                event = json.loads(line)
+                if event["type"] == "response":
+                    parts.append(event["response"])
+                elif event["type"] == "delta":
+                    parts.append(event["text"])
+                elif event["type"] == "done":
+                    done = event
+                else:
+                    results.errors[event.get("detail") or event.get("reason") or "?"] += 1
+        latency = (time.perf_counter() - start) * 1000
+        if done is None:
+            results.record("stream_error", latency, {}, None)
+            return None
+        results.record("200", latency, done["timings"], done["source"], first_byte)
+        return "".join(parts)
+
+    except httpx.HTTPError as e:
+        results.errors[type(e).__name__] += 1
+        results.record(type(e).__name__, (time.perf_counter() - start) * 1000, {}, None)
+        return None
+
+
+async def virtual_user(
+    client: "httpx.AsyncClient",
+    args: argparse.Namespace,
+    rng: random.Random,
+    claim_conversation,
+    results: Results,
+) -> None:
+    """Hold conversations until the run's conversation budget or duration is used up."""
+    while claim_conversation():
+        results.conversations += 1
+        session_id = str(uuid.uuid4())
+        script = [rng.choice(OPENING_QUESTIONS)]
+        script += rng.sample(FOLLOW_UPS, min(args.turns - 1, len(FOLLOW_UPS)))
+        history: List[str] = []
+        for message in script:
+            history.append(f"User: {message}")
+            answer = await send_turn(client, list(history), session_id, args.stream, results)
+            if answer is None:
+                break
+            history.append(f"AI: {answer}")
+            if args.think_time > 0:
+                await asyncio.sleep(rng.expovariate(1 / args.think_time))
+
+
+async def run_load(base_url: str, args: argparse.Namespace) -> Dict:
+    """Drive the server with concurrent virtual users and summarize the run."""
+    results = Results()
+    deadline = time.perf_counter() + args.duration if args.duration else None
+    remaining = [args.conversations]
+
+    def claim_conversation() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        if remaining[0] <= 0:
+            return False
+        remaining[0] -= 1
+        return True
+
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        start = time.perf_counter()
+        users = [
+            virtual_user(client, args, random.Random(args.seed + i), claim_conversation, results)
+            for i in range(args.users)
+        ]
+        await asyncio.gather(*users)
+        elapsed = time.perf_counter() - start
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    return results.report(elapsed, config)
+
+
+def free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    """Start the app with the fake model backend and wait until it answers."""
+    port = free_port()
+    env = dict(os.environ)
+    env.update(
+        {
+            "GENAI_BACKEND": "fake",
+            "FAKE_GENAI_LATENCY_MS": str(args.latency_ms),
+            "FAKE_GENAI_LATENCY_DISTRIBUTION": args.distribution,
+            "FAKE_GENAI_LATENCY_SIGMA": str(args.sigma),
+            "FAKE_GENAI_CHUNK_INTERVAL_MS": str(args.chunk_interval_ms),
+            "FAKE_GENAI_ERROR_RATE": str(args.error_rate),
+            "FAKE_GENAI_RATE_LIMIT_RATE": str(args.rate_limit_rate),
+            "FAKE_GENAI_SEED": str(args.seed),
+        }
+    )
+    env.setdefault("GOOGLE_API_KEY", "benchmark")
+    # Keep the key pool from throttling the fake unless a quota is configured explicitly
+    env.setdefault("GENAI_REQUESTS_PER_MINUTE", "1000000")
+    env.setdefault("GENAI_KEY_BURST", "1000000")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "src.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    server = subprocess.Popen(command, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            httpx.get(f"{base_url}/", timeout=1)
+            return server, base_url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not start within 30s")
+
+
+def print_report(report: Dict, baseline: Optional[Dict] = None) -> None:
+    """Print a run summary, with changes against a baseline run if given."""
+
+    def delta(new: float, old: Optional[float]) -> str:
+        if not old:
+            return ""
+        return f" ({(new - old) / old * 100:+.1f}%)"
+
+    old_latency = (baseline or {}).get("latency", {})
+    print(
+        f"{report['requests']} requests in {report['conversations']} conversations, "
+        f"{report['elapsed_s']:.2f}s"
+    )
+    print(
+        f"throughput {report['throughput_rps']:.2f} req/s"
+        f"{delta(report['throughput_rps'], (baseline or {}).get('throughput_rps'))}, "
+        f"error rate {report['error_rate'] * 100:.2f}%"
+    )
+    print(f"statuses {report['statuses']}  sources {report['sources']}")
+    if report["errors"]:
+        print(f"errors {report['errors']}")
+    print(f"\n{'stage':<18} {'count':>6}" + "".join(f" {f'p{p} ms':>16}" for p in PERCENTILES))
+    for stage, summary in report["latency"].items():
+        if not summary["count"]:
+            continue
+        old = old_latency.get(stage, {})
+        cells = "".join(
+            f" {summary[f'p{p}_ms']:>8.2f}{delta(summary[f'p{p}_ms'], old.get(f'p{p}_ms')):>8}"
+            for p in PERCENTILES
+        )
+        print(f"{stage:<18} {summary['count']:>6}{cells}")
+
+
+def main() -> None:
+    """Parse arguments, run the load test and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", help="Test a running server instead of starting one")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--conversations", type=int, default=100, help="Conversations to run")
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead")
+    parser.add_argument("--turns", type=int, default=4, help="Messages per conversation")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause in seconds")
+    parser.add_argument("--stream", action="store_true", help="Use /chat/stream")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Fake model latency")
+    parser.add_argument(
+        "--distribution",
+        default="lognormal",
+        choices=["fixed", "uniform", "exponential", "lognormal"],
+    )
+    parser.add_argument("--sigma", type=float, default=0.5, help="Lognormal latency shape")
+    parser.add_argument("--chunk-interval-ms", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake 503 rate")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fake 429 rate")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Show changes against a previous results file")
+    args = parser.parse_args()
+
+    if httpx is None:
+        raise ImportError("The load test requires httpx: pip install httpx")
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server, base_url = start_server(args)
+    try:
+        report = asyncio.run(run_load(base_url, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
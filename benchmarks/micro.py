@@ -0,0 +1,458 @@
+"""
+Micro-benchmarks for the per-request CPU path with regression checks.
+
+Times calculation detection, number extraction, tool execution, context and
+prompt building, session writes, and every FinancialTools and GoalSolvers
+method. Inputs are realistic messages (short, typical and pasted-budget sizes)
+and conversations of 1 to 500 turns. Each case reports the best of several
+repeats in microseconds per operation.
+
+Results are compared with a stored baseline. A case is a regression when it
+is slower than the baseline by more than ``--threshold`` and by more than
+``--min-delta-us``, the noise floor for cases that take a few microseconds.
+Regressed cases are measured again after the full pass, up to ``--confirm``
+times, and fail only if every measurement stays over both limits; the run then
+exits with status 1.
+
+Baselines are machine specific, and the committed one only suits the machine
+it was recorded on. On CI, record a baseline from the base commit on the same
+runner in the same job, then compare the change against it:
+
+    git checkout "$BASE_SHA" && python -m benchmarks.micro --update-baseline --baseline base.json
+    git checkout "$HEAD_SHA" && python -m benchmarks.micro --baseline base.json
+
+To replace the committed baseline, run ``--update-baseline`` on the CI
+hardware (or an idle machine like it) and commit the result.
+
+Usage:
+    python -m benchmarks.micro
+    python -m benchmarks.micro --threshold 0.1 --filter build_prompt
+    python -m benchmarks.micro --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from src.agent import FinancialAgent, FinancialTools, GoalSolvers  # noqa: E402
+from src.services.chat_service import ChatService, ChatTurn  # noqa: E402
+from src.services.session_service import SessionService  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+logger.setLevel("WARNING")
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+
+HISTORY_TURNS = (1, 10, 50, 200, 500)
+
+MESSAGES = {
+    "short": "What's a good emergency fund size?",
+    "typical": (
+        "I'm 35 and have about $42,500 saved for retirement. If I contribute $800 a month "
+        "for the next 30 years and earn around 7% a year, how much will I have when I retire?"
+    ),
+    "pasted": (
+        "Here's my monthly budget so far: rent $1,850, utilities $210.50, groceries $640, "
+        "car payment $389, car insurance $142, gas $180, phone $85, internet $70, "
+        "streaming $45.97, gym $40, student loan $312 at 5.5%, credit card minimum $95 on a "
+        "$4,300 balance at 22.9%, dining out $260, clothing $75, gifts $50 and about $120 of "
+        "miscellaneous spending. My take-home pay is $6,250 after taxes and I have $3,200 in "
+        "checking and $8,900 in a savings account earning 4.25%. "
+    )
+    * 4
+    + "Given all of this, what should I prioritize first and how long would it take?",
+}
+
+AI_RESPONSE = (
+    "## Your Retirement Projection\n\n"
+    "Based on a **$800 monthly contribution** over 30 years at a 7% annual return, your savings "
+    "could grow to roughly **$1.3 million**, including your current balance.\n\n"
+    "- **Contributions**: $288,000\n- **Growth**: about $1 million\n\n"
+    "Keep in mind that returns vary from year to year, and inflation reduces purchasing power.\n\n"
+    "> **Important**: This is educational information only. Please consult a qualified "
+    "professional."
+)
+
+TOOL_MESSAGES = {
+    "compound_interest": "Calculate compound interest for $10,000 at 0.05 for 10 years",
+    "loan_payment": "What's the monthly loan payment on $250,000 at 6.5% for 30 years?",
+    "retirement_savings": "Retirement: saving $800 monthly for 30 years at 7%, with $42,500 saved",
+    "savings_goal": "How much do I need to save monthly to reach $1,000,000 in 25 years at 7%?",
+    "income_tax": "Estimate my federal income tax on $85,000 married filing jointly for 2025",
+    "debt_payoff": (
+        "Debt payoff plan: $4,300 at 22.9% with $95 minimum, $12,000 at 5.5% with $312 "
+        "minimum, $6,800 at 7.2% with $180 minimum, budget $900"
+    ),
+    "emergency_fund": "My monthly expenses are $3,500, how big should my emergency fund be?",
+}
+
+DEBTS = [
+    {"name": "Credit card", "balance": 4300, "apr": 22.9, "minimum_payment": 95},
+    {"name": "Student loan", "balance": 12000, "apr": 5.5, "minimum_payment": 312},
+    {"name": "Car loan", "balance": 6800, "apr": 7.2, "minimum_payment": 180},
+    {"name": "Store card", "balance": 1200, "apr": 26.9, "minimum_payment": 35},
+    {"name": "Personal loan", "balance": 9000, "apr": 11.0, "minimum_payment": 250},
+]
+
+# (name, function, operations per call)
+Case = Tuple[str, Callable[[], object], int]
+
+
+def history(turns: int) -> List[str]:
+    """Build a web-client style history of alternating user and AI entries."""
+    entries = []
+    for turn in range(turns):
+        entries.append(f"User: {MESSAGES['typical']} (question {turn})")
+        entries.append(f"AI: {AI_RESPONSE}")
+    return entries[:-1]
+
+
+def session_with_turns(service: SessionService, session_id: str, turns: int) -> None:
+    """Fill a session with recorded conversation turns."""
+    service.get_or_create_session(session_id, {"risk_tolerance": "moderate"})
+    for turn in range(turns):
+        service.add_conversation_entry(
+            session_id,
+            f"{MESSAGES['typical']} (question {turn})",
+            AI_RESPONSE,
+            ["Calculate retirement savings projections"] if turn % 3 == 0 else [],
+        )
+
+
+def agent_cases() -> List[Case]:
+    """Cases for FinancialAgent message handling and context building."""
+    agent = FinancialAgent()
+    cases: List[Case] = []
+    for size, message in MESSAGES.items():
+        cases.append(
+            (
+                f"agent.detect_calculation_request[{size}]",
+                lambda m=message: agent.detect_calculation_request(m),
+                1,
+            )
+        )
+        cases.append(
+            (f"agent.extract_numbers[{size}]", lambda m=message: agent.extract_numbers(m), 1)
+        )
+
+    for tool, message in TOOL_MESSAGES.items():
+        numbers = agent.extract_numbers(message)
+        cases.append(
+            (
+                f"agent.execute_tool[{tool}]",
+                lambda t=tool, n=numbers, m=message: agent.execute_tool(t, n, m),
+                1,
+            )
+        )
+
+    sessions = SessionService()
+    for turns in HISTORY_TURNS:
+        session_with_turns(sessions, f"context-{turns}", turns)
+        record = sessions.get_record(f"context-{turns}")
+        cases.append(
+            (
+                f"agent.get_enhanced_context[turns={turns}]",
+                lambda r=record: agent.get_enhanced_context(r),
+                1,
+            )
+        )
+    return cases
+
+
+def prompt_cases() -> List[Case]:
+    """Cases for model prompt concatenation with and without a calculation result."""
+    agent = FinancialAgent()
+    service = ChatService(SessionService(), genai_service=None, agent=agent)
+    sessions = SessionService()
+    cases: List[Case] = []
+    for turns in HISTORY_TURNS:
+        session_with_turns(sessions, f"prompt-{turns}", turns)
+        turn = ChatTurn(f"prompt-{turns}", sessions.get_record(f"prompt-{turns}"), history(turns))
+        cases.append(
+            (f"chat.build_prompt[turns={turns}]", lambda t=turn: service.build_prompt(t), 1)
+        )
+
+    turn = ChatTurn("prompt-10", sessions.get_record("prompt-10"), history(10))
+    turn.calculation_result = agent.execute_tool(
+        "retirement_savings", agent.extract_numbers(TOOL_MESSAGES["retirement_savings"])
+    )
+    cases.append(
+        ("chat.build_prompt[turns=10,calculation]", lambda t=turn: service.build_prompt(t), 1)
+    )
+    return cases
+
+
+def session_cases() -> List[Case]:
+    """Cases for SessionService writes, timed per operation."""
+    cases: List[Case] = []
+
+    def create_sessions(count: int = 100) -> None:
+        service = SessionService()
+        for i in range(count):
+            service.get_or_create_session(f"session-{i}", {"risk_tolerance": "moderate"})
+
+    cases.append(("session.get_or_create_session[new]", create_sessions, 100))
+
+    existing = SessionService()
+    existing.get_or_create_session("existing")
+    cases.append(
+        (
+            "session.get_or_create_session[existing]",
+            lambda: existing.get_or_create_session("existing"),
+            1,
+        )
+    )
+
+    for turns in HISTORY_TURNS:
+        # Writing a whole conversation includes compressing entries that go cold
+        cases.append(
+            (
+                f"session.add_conversation_entry[turns={turns}]",
+                lambda t=turns: session_with_turns(SessionService(), "writes", t),
+                turns,
+            )
+        )
+
+    profile = SessionService()
+    profile.get_or_create_session("profile")
+    cases.append(
+        (
+            "session.update_preferences",
+            lambda: profile.update_preferences("profile", {"risk_tolerance": "low"}),
+            1,
+        )
+    )
+    cases.append(
+        (
+            "session.update_financial_profile",
+            lambda: profile.update_financial_profile("profile", {"monthly_expenses": 3500}),
+            1,
+        )
+    )
+    return cases
+
+
+def tool_cases() -> List[Case]:
+    """Cases for every FinancialTools and GoalSolvers method."""
+    tools, solvers = FinancialTools, GoalSolvers
+    incomes = [20000 + 1000 * i for i in range(1000)]
+    return [
+        (
+            "tools.calculate_compound_interest",
+            lambda: tools.calculate_compound_interest(10000, 0.05, 10),
+            1,
+        ),
+        ("tools.calculate_loan_payment", lambda: tools.calculate_loan_payment(250000, 6.5, 30), 1),
+        (
+            "tools.calculate_retirement_savings",
+            lambda: tools.calculate_retirement_savings(800, 30, 7, 42500),
+            1,
+        ),
+        ("tools.calculate_emergency_fund", lambda: tools.calculate_emergency_fund(3500, 6), 1),
+        (
+            "tools.calculate_income_tax",
+            lambda: tools.calculate_income_tax(85000, "married_filing_jointly"),
+            1,
+        ),
+        (
+            "tools.calculate_income_tax_sweep[1000]",
+            lambda: tools.calculate_income_tax_sweep(incomes),
+            1,
+        ),
+        (
+            "tools.calculate_debt_payoff[3 debts]",
+            lambda: tools.calculate_debt_payoff(DEBTS[:3], 900),
+            1,
+        ),
+        (
+            "tools.calculate_debt_payoff[5 debts]",
+            lambda: tools.calculate_debt_payoff(DEBTS, 1200, custom_order=[4, 3, 2, 1, 0]),
+            1,
+        ),
+        (
+            "solvers.solve_monthly_contribution",
+            lambda: solvers.solve_monthly_contribution(1000000, 25, 7, 42500),
+            1,
+        ),
+        (
+            "solvers.solve_retirement_years",
+            lambda: solvers.solve_retirement_years(1000000, 800, 7, 42500),
+            1,
+        ),
+        (
+            "solvers.solve_retirement_return",
+            lambda: solvers.solve_retirement_return(1000000, 800, 30, 42500),
+            1,
+        ),
+        ("solvers.solve_loan_principal", lambda: solvers.solve_loan_principal(1580, 6.5, 30), 1),
+        ("solvers.solve_loan_rate", lambda: solvers.solve_loan_rate(250000, 1580, 30), 1),
+        ("solvers.solve_loan_term", lambda: solvers.solve_loan_term(250000, 1580, 6.5), 1),
+        (
+            "solvers.solve_compound_principal",
+            lambda: solvers.solve_compound_principal(20000, 0.05, 10),
+            1,
+        ),
+        ("solvers.solve_compound_rate", lambda: solvers.solve_compound_rate(20000, 10000, 10), 1),
+        ("solvers.solve_compound_time", lambda: solvers.solve_compound_time(20000, 10000, 0.05), 1),
+        (
+            "solvers.solve_emergency_fund_months",
+            lambda: solvers.solve_emergency_fund_months(12000, 3500),
+            1,
+        ),
+    ]
+
+
+def all_cases() -> List[Case]:
+    """Collect every benchmark case."""
+    return agent_cases() + prompt_cases() + session_cases() + tool_cases()
+
+
+def measure(function: Callable[[], object], operations: int, repeat: int, min_time: float) -> float:
+    """
+    Time a function as the best of several repeats.
+
+    Args:
+        function: Function to call
+        operations: Operations each call performs
+        repeat: Number of timed repeats
+        min_time: Minimum seconds per repeat; the loop count is scaled to reach it
+
+    Returns:
+        Microseconds per operation
+    """
+    timer = timeit.Timer(function)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+    best = min(timer.repeat(repeat=repeat, number=loops))
+    return best / loops / operations * 1e6
+
+
+def regressed(micros: float, old: float, threshold: float, min_delta: float) -> bool:
+    """Whether a timing is slower than the baseline by more than both limits."""
+    return micros / old - 1 > threshold and micros - old > min_delta
+
+
+def environment() -> Dict:
+    """Describe the machine results were recorded on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main() -> None:
+    """Run the benchmarks and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against the baseline as a fraction (0.25 is 25%%)",
+    )
+    parser.add_argument(
+        "--min-delta-us",
+        type=float,
+        default=0.5,
+        help="Slowdowns of at most this many microseconds per operation are treated as noise",
+    )
+    parser.add_argument(
+        "--confirm",
+        type=int,
+        default=3,
+        help="Times to measure a regressed case again before failing",
+    )
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--min-time", type=float, default=0.05, help="Seconds per repeat")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Save these results as the new baseline"
+    )
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    baseline: Dict = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != environment():
+            print("Warning: the baseline was recorded on a different machine or Python build\n")
+    old_results = baseline.get("results", {})
+
+    def row(name: str, micros: float, flag: str = "") -> None:
+        old = old_results.get(name)
+        if old:
+            change = micros / old - 1
+            print(f"{name:<48} {micros:>11.3f} {old:>11.3f} {change * 100:>+7.1f}%{flag}")
+        else:
+            print(f"{name:<48} {micros:>11.3f} {'-':>11} {'new':>8}")
+
+    def slower(name: str) -> bool:
+        old = old_results.get(name)
+        return bool(old) and regressed(results[name], old, args.threshold, args.min_delta_us)
+
+    cases = {
+        name: (function, operations)
+        for name, function, operations in all_cases()
+        if not args.filter or args.filter in name
+    }
+    results: Dict[str, float] = {}
+    print(f"{'case':<48} {'us/op':>11} {'baseline':>11} {'change':>8}")
+    for name, (function, operations) in cases.items():
+        results[name] = round(measure(function, operations, args.repeat, args.min_time), 4)
+        row(name, results[name], "  slower" if slower(name) else "")
+
+    # Measure slower cases again after the full pass, so a burst of load on the
+    # machine that slowed down one stretch of cases does not fail the run
+    regressions = [name for name in cases if slower(name)]
+    for attempt in range(1, args.confirm + 1):
+        if not regressions:
+            break
+        print(f"\nMeasuring {len(regressions)} slower case(s) again ({attempt}/{args.confirm})")
+        for name in regressions:
+            function, operations = cases[name]
+            micros = measure(function, operations, args.repeat, args.min_time)
+            # Keep the fastest measurement, as each one is already a best of repeats
+            results[name] = round(min(results[name], micros), 4)
+            flag = "  REGRESSION" if attempt == args.confirm else "  slower"
+            row(name, results[name], flag if slower(name) else "")
+        regressions = [name for name in regressions if slower(name)]
+
+    report = {"environment": environment(), "results": results}
+    if args.update_baseline:
+        if args.filter and os.path.exists(args.baseline):
+            # Keep cases that were not rerun
+            with open(args.baseline) as f:
+                report["results"] = {**json.load(f).get("results", {}), **results}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if regressions:
+        print(
+            f"\n{len(regressions)} case(s) regressed by more than {args.threshold * 100:g}% "
+            f"and {args.min_delta_us:g}us: " + ", ".join(regressions)
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
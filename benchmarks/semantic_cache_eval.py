@@ -0,0 +1,221 @@
+"""
+Offline evaluation of the semantic response cache.
+
+For each intent group the first question is cached; the remaining paraphrases
+should hit that entry, and the unrelated questions should miss. The tuning
+groups are the questions the synonym table was written against, so their hit
+rate is optimistic; the held-out groups were written separately and give the
+honest hit rate. Negative pairs ask something else about the same topic (for
+example "when" versus "why") and must miss: each first question is cached on
+its own and the second looked up.
+
+Reports hit rates on tuning and held-out paraphrases, the false-hit rate
+(hits served for the wrong intent, as a share of all paraphrase and unrelated
+lookups) and the negative-pair false-hit rate across similarity thresholds.
+
+Usage:
+    python -m benchmarks.semantic_cache_eval
+    python -m benchmarks.semantic_cache_eval --thresholds 0.8 0.85 0.9
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from src.services.semantic_cache import SemanticCache  # noqa: E402
+
+PARAPHRASE_GROUPS = [
+    [
+        "How big should my emergency fund be?",
+        "What size emergency fund do I need?",
+        "How large should an emergency fund be?",
+        "how much should I keep in my emergency fund",
+        "What's a good emergency fund size?",
+    ],
+    [
+        "What is compound interest?",
+        "Can you explain compound interest?",
+        "What does compound interest mean?",
+        "How does compound interest work?",
+    ],
+    [
+        "How do I start investing as a beginner?",
+        "How should a beginner start investing?",
+        "I'm a beginner, how do I begin investing?",
+    ],
+    [
+        "What is the 50/30/20 budgeting rule?",
+        "Can you explain the 50/30/20 budget rule?",
+        "What does the 50/30/20 rule for budgets mean?",
+    ],
+    [
+        "What are the benefits of a Roth IRA?",
+        "What benefits does a Roth IRA have?",
+        "Why would I want a Roth IRA, what are the benefits?",
+    ],
+    [
+        "How should I prioritize paying off debt vs saving?",
+        "Should I prioritize saving or paying off debt?",
+        "Paying off debt versus saving, which should I prioritize?",
+    ],
+    [
+        "Help me understand 401(k) contributions",
+        "Can you explain 401(k) contributions?",
+        "How do 401k contributions work?",
+    ],
+    [
+        "What is an index fund?",
+        "Can you explain what an index fund is?",
+        "What does index fund mean?",
+    ],
+    [
+        "How do tax brackets work?",
+        "Can you explain how tax brackets work?",
+        "What do tax brackets mean?",
+    ],
+    [
+        "Is term life insurance better than whole life insurance?",
+        "Term life vs whole life insurance, which is better?",
+        "What is the difference between term life and whole life insurance?",
+    ],
+]
+
+HELD_OUT_GROUPS = [
+    [
+        "What is a high-yield savings account?",
+        "Can you explain high-yield savings accounts?",
+        "What does a high-yield savings account mean?",
+    ],
+    [
+        "How do I make a budget?",
+        "How can I create a budget?",
+        "What's the best way to make a monthly budget?",
+    ],
+    [
+        "What is a sinking fund?",
+        "Can you explain sinking funds?",
+        "How does a sinking fund work?",
+    ],
+    [
+        "How much should I save for retirement?",
+        "How much do I need to save for retirement?",
+        "How much money should I be saving for retirement?",
+    ],
+    [
+        "What is the avalanche method for paying off debt?",
+        "How does the debt avalanche method work?",
+        "Can you explain the avalanche method of debt payoff?",
+    ],
+    [
+        "When should I start saving for retirement?",
+        "When is the right time to start saving for retirement?",
+        "At what age should I start saving for retirement?",
+    ],
+]
+
+# (cached question, lookup) pairs on the same topic that need different answers
+NEGATIVE_PAIRS = [
+    ("When should I start saving for retirement?", "Why should I start saving for retirement?"),
+    ("How much should I save for retirement?", "Where should I save for retirement?"),
+    ("Where should I keep my emergency fund?", "How big should my emergency fund be?"),
+    ("Why is my credit score low?", "How do I check my credit score?"),
+    ("When can I withdraw from my 401(k)?", "How much can I withdraw from my 401(k)?"),
+    ("Who needs life insurance?", "Why do I need life insurance?"),
+    ("Which index fund should I buy?", "When should I buy an index fund?"),
+    ("What is a traditional IRA?", "What is a Roth IRA?"),
+    ("Should I pay off my mortgage early?", "Should I pay off my car loan early?"),
+    ("How much house can I afford?", "How much car can I afford?"),
+    ("Why should I pay off debt before investing?", "When should I pay off debt before investing?"),
+    ("How long should I keep my emergency fund in cash?", "Where should I keep my emergency fund?"),
+]
+
+UNRELATED_QUESTIONS = [
+    "How big should my retirement fund be?",
+    "What is simple interest?",
+    "How do I stop investing?",
+    "What is the 4% retirement rule?",
+    "What are the downsides of a Roth IRA?",
+    "How should I prioritize paying off a car loan vs a mortgage?",
+    "Can you explain 403(b) contributions?",
+    "What is a bond fund?",
+    "How do capital gains taxes work?",
+    "Is renters insurance worth it?",
+    "What is a good credit score?",
+    "How much house can I afford?",
+    "What is dollar cost averaging?",
+    "Should I refinance my mortgage?",
+    "How do I build credit?",
+]
+
+
+def paraphrase_hits(cache: SemanticCache, groups: list, offset: int) -> tuple:
+    """Look up each group's paraphrases; count correct and wrong hits and lookups."""
+    correct_hits = false_hits = lookups = 0
+    for group_id, group in enumerate(groups, offset):
+        for question in group[1:]:
+            lookups += 1
+            response = cache.get(question)
+            if response == f"answer-{group_id}":
+                correct_hits += 1
+            elif response is not None:
+                false_hits += 1
+    return correct_hits, false_hits, lookups
+
+
+def evaluate(threshold: float) -> dict:
+    """Evaluate the cache at one similarity threshold."""
+    cache = SemanticCache(capacity=1000, threshold=threshold)
+    groups = PARAPHRASE_GROUPS + HELD_OUT_GROUPS
+    for group_id, group in enumerate(groups):
+        cache.put(group[0], f"answer-{group_id}")
+
+    start = time.perf_counter()
+    tuning_hits, tuning_false, tuning_lookups = paraphrase_hits(cache, PARAPHRASE_GROUPS, 0)
+    held_out_hits, held_out_false, held_out_lookups = paraphrase_hits(
+        cache, HELD_OUT_GROUPS, len(PARAPHRASE_GROUPS)
+    )
+    unrelated_false = sum(cache.get(question) is not None for question in UNRELATED_QUESTIONS)
+    lookups = tuning_lookups + held_out_lookups + len(UNRELATED_QUESTIONS)
+    elapsed = time.perf_counter() - start
+
+    negative_hits = 0
+    for cached, question in NEGATIVE_PAIRS:
+        pair_cache = SemanticCache(capacity=1, threshold=threshold)
+        pair_cache.put(cached, "answer")
+        negative_hits += pair_cache.get(question) is not None
+
+    return {
+        "threshold": threshold,
+        "tuning_hit_rate": tuning_hits / tuning_lookups,
+        "held_out_hit_rate": held_out_hits / held_out_lookups,
+        "false_hit_rate": (tuning_false + held_out_false + unrelated_false) / lookups,
+        "negative_false_hit_rate": negative_hits / len(NEGATIVE_PAIRS),
+        "lookup_us": elapsed / lookups * 1e6,
+    }
+
+
+def main() -> None:
+    """Run the evaluation and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--thresholds", type=float, nargs="+", default=[0.7, 0.75, 0.8, 0.85, 0.9, 0.95]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'threshold':>9} {'tuning hits':>12} {'held-out hits':>14} {'false hits':>11} "
+        f"{'negative hits':>14} {'lookup us':>10}"
+    )
+    for threshold in args.thresholds:
+        result = evaluate(threshold)
+        print(
+            f"{result['threshold']:>9.2f} {result['tuning_hit_rate']:>12.1%} "
+            f"{result['held_out_hit_rate']:>14.1%} {result['false_hit_rate']:>11.1%} "
+            f"{result['negative_false_hit_rate']:>14.1%} {result['lookup_us']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+JSON serialization benchmark.
+
+Compares FastAPI's generic encoding path (``jsonable_encoder`` followed by
+``JSONResponse``) with ``FastJSONResponse`` for session payloads of growing
+size, and the pydantic ``ChatResponse`` path with direct encoding for chat
+responses.
+
+Usage:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --turns 10 100 500 --repeat 50
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from src.api.models import ChatResponse  # noqa: E402
+from src.api.responses import FastJSONResponse  # noqa: E402
+from src.services.session_service import SessionService  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+from src.utils.serialization import orjson  # noqa: E402
+
+logger.setLevel("WARNING")
+
+AI_RESPONSE = (
+    "## Understanding Compound Interest\n\n"
+    "Compound interest is interest earned on both your original principal and the interest "
+    "that has already been added. Over long periods this makes growth accelerate.\n\n"
+    "| Year | Balance |\n|---|---|\n"
+    + "".join(f"| {y} | ${1000 * 1.05 ** y:,.2f} |\n" for y in range(10))
+)
+
+
+def session_payload(turns: int) -> dict:
+    """Build a session dictionary with the given number of conversation turns."""
+    service = SessionService()
+    service.get_or_create_session("benchmark", {"risk_tolerance": "moderate"})
+    for turn in range(turns):
+        service.add_conversation_entry(
+            "benchmark",
+            f"Question {turn}: how does compound interest work?",
+            AI_RESPONSE,
+            ["Calculate compound interest growth over time"] if turn % 2 else [],
+        )
+    return service.get_session("benchmark")
+
+
+def time_per_call(function, repeat: int) -> float:
+    """Get the mean time of a call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 200, 500])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}\n")
+    print(f"{'payload':<22} {'bytes':>9} {'generic us':>11} {'fast us':>9} {'speedup':>8}")
+
+    for turns in args.turns:
+        payload = session_payload(turns)
+        generic = time_per_call(lambda: JSONResponse(jsonable_encoder(payload)), args.repeat)
+        fast = time_per_call(lambda: FastJSONResponse(payload), args.repeat)
+        size = len(FastJSONResponse(payload).body)
+        print(
+            f"{f'session ({turns} turns)':<22} {size:>9} {generic:>11.1f} {fast:>9.1f} "
+            f"{generic / fast:>7.1f}x"
+        )
+
+    fields = {
+        "response": AI_RESPONSE,
+        "session_id": "benchmark",
+        "tools_used": ["Calculate compound interest growth over time"],
+        "confidence": 0.9,
+    }
+    repeat = args.repeat * 10
+    generic = time_per_call(lambda: JSONResponse(jsonable_encoder(ChatResponse(**fields))), repeat)
+    fast = time_per_call(lambda: FastJSONResponse(fields), repeat)
+    size = len(FastJSONResponse(fields).body)
+    print(f"{'chat response':<22} {size:>9} {generic:>11.1f} {fast:>9.1f} {generic / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
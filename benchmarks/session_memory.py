@@ -0,0 +1,139 @@
+"""
+Session memory benchmark.
+
+Reports bytes per session for the SessionService storage layout, alongside the
+legacy nested-dict layout for comparison. The default turn counts cover a short
+conversation and one longer than SESSION_CONFIG["hot_history_entries"], where
+older responses are stored compressed.
+
+Usage:
+    python -m benchmarks.session_memory
+    python -m benchmarks.session_memory --sessions 10000 100000 --turns 4 20
+"""
+
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from src.services.session_service import SessionService  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+logger.setLevel("WARNING")
+
+TOOL_DESCRIPTIONS = [
+    "Calculate compound interest growth over time",
+    "Calculate monthly loan payments",
+    "Project retirement savings growth",
+]
+
+AI_RESPONSE = (
+    "## Emergency Fund Basics\n\n"
+    "An emergency fund is money set aside for unexpected expenses such as job loss, "
+    "medical bills or urgent repairs. Most guidance suggests **3-6 months** of essential "
+    "expenses, kept in a liquid, low-risk account like a high-yield savings account.\n\n"
+    "- Start with a small goal such as $1,000\n"
+    "- Automate a fixed monthly transfer\n"
+    "- Replenish the fund after using it\n\n"
+    "> **Important**: This is educational information only. For personalized financial "
+    "advice, please consult a certified financial advisor.\n"
+)
+
+
+def _message(session_index: int, turn: int) -> str:
+    """Build a distinct user message so strings are not shared between sessions."""
+    return f"Session {session_index} turn {turn}: how big should my emergency fund be?"
+
+
+def _response(session_index: int, turn: int) -> str:
+    """Build a distinct AI response so strings are not shared between sessions."""
+    return f"Reply {session_index}.{turn}\n" + AI_RESPONSE
+
+
+def build_service(num_sessions: int, turns: int) -> SessionService:
+    """Populate a SessionService with synthetic conversations."""
+    service = SessionService()
+    for i in range(num_sessions):
+        session_id = f"session_{i}"
+        service.get_or_create_session(session_id)
+        for turn in range(turns):
+            service.add_conversation_entry(
+                session_id=session_id,
+                user_message=_message(i, turn),
+                ai_response=_response(i, turn),
+                tools_used=[TOOL_DESCRIPTIONS[turn % 3]] if turn % 2 else [],
+            )
+    return service
+
+
+def build_legacy(num_sessions: int, turns: int) -> dict:
+    """Populate the legacy nested-dict layout with the same conversations."""
+    sessions = {}
+    for i in range(num_sessions):
+        session_id = f"session_{i}"
+        sessions[session_id] = {
+            "session_id": session_id,
+            "created_at": datetime.now(),
+            "conversation_history": [
+                {
+                    "timestamp": datetime.now().isoformat(),
+                    "user_message": _message(i, turn),
+                    "ai_response": _response(i, turn),
+                    "tools_used": [str(TOOL_DESCRIPTIONS[turn % 3])] if turn % 2 else [],
+                }
+                for turn in range(turns)
+            ],
+            "preferences": {},
+            "financial_profile": {},
+        }
+    return sessions
+
+
+def measure(builder, num_sessions: int, turns: int) -> dict:
+    """Measure traced allocation size and build time for a layout builder."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = builder(num_sessions, turns)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    gc.collect()
+    return {
+        "bytes_per_session": current / num_sessions,
+        "total_mb": current / 1024 / 1024,
+        "build_seconds": elapsed,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument(
+        "--turns", type=int, nargs="+", default=[4, 20], help="Conversation turns per session"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'layout':<10} {'turns':>6} {'sessions':>9} {'bytes/session':>14} {'total MB':>10} "
+        f"{'build s':>8}"
+    )
+    for turns in args.turns:
+        for num_sessions in args.sessions:
+            for name, builder in (("legacy", build_legacy), ("compact", build_service)):
+                result = measure(builder, num_sessions, turns)
+                print(
+                    f"{name:<10} {turns:>6} {num_sessions:>9} "
+                    f"{result['bytes_per_session']:>14.0f} {result['total_mb']:>10.1f} "
+                    f"{result['build_seconds']:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # Agent module
 from .financial_agent import FinancialAgent
+from .solvers import GoalSolvers
 from .tools import FinancialTools
 
-__all__ = ["FinancialAgent", "FinancialTools"]
+__all__ = ["FinancialAgent", "FinancialTools", "GoalSolvers"]
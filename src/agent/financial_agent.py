@@ -3,11 +3,28 @@ Financial Advisor Agent with personality and tool integration.
 """
 
 import re
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from ..config import AGENT_PERSONALITY, AVAILABLE_TOOLS
+from ..config import (
+    AGENT_PERSONALITY,
+    AVAILABLE_TOOLS,
+    CALCULATION_GOALS,
+    CALCULATION_PARAMETERS,
+    CALCULATION_TEMPLATES,
+    INVERSE_QUESTION_PHRASES,
+    RESPONSE_TEMPLATES,
+)
+from .solvers import GoalSolvers
+from .tax_tables import LATEST_TAX_YEAR, TAX_TABLES
 from .tools import FinancialTools
 
+if TYPE_CHECKING:
+    from ..services.session_service import SessionRecord
+
+NUMBER_PATTERN = re.compile(r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+\.?\d*")
+PERCENT_SUFFIX = re.compile(r"\s*(?:%|percent\b)", re.IGNORECASE)
+TAX_YEAR_PATTERN = re.compile(r"\b(?:year|for)\s+(\d{4})\b", re.IGNORECASE)
+
 
 class FinancialAgent:
     """
@@ -17,9 +34,10 @@ class FinancialAgent:
     def __init__(self):
         """Initialize the financial agent with tools and personality."""
         self.tools = FinancialTools()
+        self.solvers = GoalSolvers()
         self.personality = AGENT_PERSONALITY
 
-    def get_enhanced_context(self, session_data: Optional[Dict] = None) -> str:
+    def get_enhanced_context(self, session_data: Optional["SessionRecord"] = None) -> str:
         """
         Generate enhanced context for the AI model.
 
@@ -48,6 +66,10 @@ AVAILABLE TOOLS:
 - Compound interest calculator
 - Loan payment calculator  
 - Retirement savings calculator
+- Debt payoff optimizer (avalanche, snowball)
+- Goal solvers (monthly savings, years or return needed for a target; loan amount a payment
+  affords, loan rate or term)
+- Federal income tax estimator (brackets, marginal and effective rates)
 
 When users ask for calculations, use the appropriate tool and explain the results.
 """
@@ -55,10 +77,10 @@ When users ask for calculations, use the appropriate tool and explain the result
         if session_data:
             user_context = f"""
 USER CONTEXT:
-- Session ID: {session_data.get('session_id', 'Unknown')}
-- Previous interactions: {len(session_data.get('conversation_history', []))}
-- User preferences: {session_data.get('preferences', {})}
-- Financial profile: {session_data.get('financial_profile', {})}
+- Session ID: {session_data.session_id}
+- Previous interactions: {len(session_data.conversation_history)}
+- User preferences: {session_data.preferences}
+- Financial profile: {session_data.financial_profile}
 """
             base_context += user_context
 
@@ -72,16 +94,64 @@ USER CONTEXT:
             message: User's message text
 
         Returns:
-            Dictionary with tool info if calculation detected, None otherwise
+            Dictionary with tool info if calculation detected, None otherwise.
+            Inverse questions (see ``asks_inverse_question``) also get the
+            ``goal`` solving them, or None if no goal solver fits.
         """
         message_lower = message.lower()
+        inverse = self.asks_inverse_question(message_lower)
 
         for tool_id, tool_config in AVAILABLE_TOOLS.items():
             if any(keyword in message_lower for keyword in tool_config["keywords"]):
-                return {"tool": tool_id, "description": tool_config["description"]}
+                if not inverse:
+                    return {"tool": tool_id, "description": tool_config["description"]}
+                # An inverse question goes to the first named tool with a matching goal
+                goal = self.detect_goal(tool_id, message_lower)
+                if goal is None:
+                    continue
+                return {
+                    "tool": tool_id,
+                    "goal": goal,
+                    "description": CALCULATION_GOALS[goal]["description"],
+                }
 
         return None
 
+    @staticmethod
+    def detect_goal(tool_name: str, message: str) -> Optional[str]:
+        """
+        Detect which goal solver answers an inverse question about a tool.
+
+        Args:
+            tool_name: Tool the message names
+            message: User's message text
+
+        Returns:
+            Name of the first matching goal in CALCULATION_GOALS, or None
+        """
+        message_lower = message.lower()
+        for goal, goal_config in CALCULATION_GOALS.items():
+            if goal_config["tool"] == tool_name and any(
+                keyword in message_lower for keyword in goal_config["keywords"]
+            ):
+                return goal
+        return None
+
+    @staticmethod
+    def asks_inverse_question(message: str) -> bool:
+        """
+        Check whether a message asks for a calculator input rather than its result.
+
+        Args:
+            message: User's message text
+
+        Returns:
+            True if the message uses inverse or affordability wording, such as
+            "how much house can I afford" or "how many years to reach"
+        """
+        message_lower = message.lower()
+        return any(phrase in message_lower for phrase in INVERSE_QUESTION_PHRASES)
+
     def extract_numbers(self, text: str) -> List[float]:
         """
         Extract numbers from text.
@@ -92,23 +162,107 @@ USER CONTEXT:
         Returns:
             List of extracted numbers as floats
         """
-        numbers = re.findall(r"\d+\.?\d*", text)
-        return [float(num) for num in numbers]
+        numbers = NUMBER_PATTERN.findall(text)
+        return [float(num.replace(",", "")) for num in numbers]
+
+    def percent_flags(self, text: str) -> List[bool]:
+        """
+        Tell which numbers in a text are written as percentages.
+
+        Args:
+            text: Text to extract numbers from
+
+        Returns:
+            One flag per number found by ``extract_numbers``, True if followed by % or "percent"
+        """
+        return [bool(PERCENT_SUFFIX.match(text, m.end())) for m in NUMBER_PATTERN.finditer(text)]
+
+    def validate_parameters(self, tool_name: str, numbers: List[float], message: str) -> bool:
+        """
+        Check that numbers read from a message fit a calculator unambiguously.
+
+        Numbers are assigned to parameters by position, so a calculator answer
+        is only served without the AI model when this check passes.
+
+        Args:
+            tool_name: Name of the detected tool
+            numbers: Numbers extracted from the message
+            message: User's message
+
+        Returns:
+            True if the expected numbers are all present with none left over,
+            the rate is written in consistent units and every value is plausible
+        """
+        spec = CALCULATION_PARAMETERS.get(tool_name)
+        if spec is None:
+            return False
+        values = list(numbers)
+        if tool_name == "income_tax":
+            values = self._tax_arguments(numbers, message)[0]
 
-    def execute_tool(self, tool_name: str, numbers: List[float]) -> Optional[Dict]:
+        ranges = spec["ranges"]
+        if "group_ranges" in spec:
+            groups, extra = divmod(len(values) - len(ranges), len(spec["group_ranges"]))
+            if groups < 1 or extra:
+                return False
+            ranges = spec["group_ranges"] * groups + ranges
+        if not spec["required"] <= len(values) <= len(ranges):
+            return False
+
+        rate_index = spec.get("rate_index")
+        if rate_index is not None:
+            flags = self.percent_flags(message)
+            if len(flags) == len(values) and flags[rate_index]:
+                pass
+            elif spec.get("decimal_rate") and values[rate_index] < 1:
+                values[rate_index] *= 100
+            else:
+                # A bare number could be a rate in either unit or not a rate at all
+                return False
+        return all(low <= value <= high for value, (low, high) in zip(values, ranges))
+
+    @staticmethod
+    def detect_filing_status(message: str) -> str:
+        """
+        Detect a tax filing status mentioned in a message.
+
+        Args:
+            message: User's message text
+
+        Returns:
+            Filing status, defaulting to single
+        """
+        message_lower = message.lower()
+        if "head of household" in message_lower:
+            return "head_of_household"
+        if "separate" in message_lower:
+            return "married_filing_separately"
+        if "married" in message_lower or "jointly" in message_lower:
+            return "married_filing_jointly"
+        return "single"
+
+    def execute_tool(
+        self, tool_name: str, numbers: List[float], message: str = ""
+    ) -> Optional[Dict]:
         """
         Execute the appropriate tool with extracted numbers.
 
         Args:
             tool_name: Name of the tool to execute
             numbers: List of numbers extracted from user message
+            message: User's message, for options given in words (such as filing status)
 
         Returns:
             Tool result dictionary or None if execution failed
         """
         try:
             if tool_name == "compound_interest" and len(numbers) >= 3:
-                return self.tools.calculate_compound_interest(numbers[0], numbers[1], numbers[2])
+                # The calculator takes a decimal rate; "5%" and a bare 5 both mean 0.05
+                flags = self.percent_flags(message)
+                rate = numbers[1]
+                if rate >= 1 or (len(flags) == len(numbers) and flags[1]):
+                    rate /= 100
+                return self.tools.calculate_compound_interest(numbers[0], rate, numbers[2])
             elif tool_name == "loan_payment" and len(numbers) >= 3:
                 return self.tools.calculate_loan_payment(numbers[0], numbers[1], int(numbers[2]))
             elif tool_name == "retirement_savings" and len(numbers) >= 3:
@@ -116,9 +270,140 @@ USER CONTEXT:
                 return self.tools.calculate_retirement_savings(
                     numbers[0], int(numbers[1]), numbers[2], current_savings
                 )
+            elif tool_name == "savings_goal" and len(numbers) >= 3:
+                # Target, years, annual return %, then optional current savings
+                current_savings = numbers[3] if len(numbers) > 3 else 0
+                result = self.solvers.solve_monthly_contribution(
+                    numbers[0], numbers[1], numbers[2], current_savings
+                )
+                if result["monthly_contribution"] is None:
+                    return {"error": "Calculation error: the target cannot be reached in that time"}
+                return {
+                    **result,
+                    "target": numbers[0],
+                    "years": numbers[1],
+                    "annual_return": numbers[2],
+                    "current_savings": current_savings,
+                }
+            elif tool_name == "income_tax" and numbers:
+                amounts, year = self._tax_arguments(numbers, message)
+                if not amounts:
+                    return None
+                filing_status = self.detect_filing_status(message)
+                result = self.tools.calculate_income_tax(amounts[0], filing_status, year)
+                return {**result, "filing_status_label": filing_status.replace("_", " ")}
+            elif tool_name == "debt_payoff" and len(numbers) >= 4 and len(numbers) % 3 == 1:
+                # Debts given as (balance, APR, minimum payment) triples, then the budget
+                debts = [
+                    {
+                        "balance": numbers[i],
+                        "apr": numbers[i + 1],
+                        "minimum_payment": numbers[i + 2],
+                    }
+                    for i in range(0, len(numbers) - 1, 3)
+                ]
+                return self.tools.calculate_debt_payoff(debts, numbers[-1])
             elif tool_name == "emergency_fund" and len(numbers) >= 1:
                 months_coverage = numbers[1] if len(numbers) > 1 else 6
                 return self.tools.calculate_emergency_fund(numbers[0], months_coverage)
         except Exception as e:
             return {"error": f"Calculation error: {str(e)}"}
         return None
+
+    def execute_goal(self, goal: str, numbers: List[float], message: str) -> Optional[Dict]:
+        """
+        Run the goal solver for an inverse question.
+
+        Args:
+            goal: Name of the goal in CALCULATION_GOALS
+            numbers: List of numbers extracted from user message
+            message: User's message, used to find the rate written as a percentage
+
+        Returns:
+            Solver result with its inputs, an error dictionary if the goal cannot
+            be reached, or None if the numbers do not fit the solver
+        """
+        spec = CALCULATION_GOALS[goal]
+        arguments = self._goal_arguments(spec, numbers, message)
+        if arguments is None:
+            return None
+        try:
+            result = getattr(self.solvers, spec["solver"])(**arguments)
+        except Exception as e:
+            return {"error": f"Calculation error: {str(e)}"}
+        if _has_missing_values(result) or result.get("converged") is False:
+            return {"error": "Calculation error: no solution for these inputs"}
+        return {**result, "solved_for": goal, **arguments}
+
+    def _goal_arguments(
+        self, spec: Dict, numbers: List[float], message: str
+    ) -> Optional[Dict[str, float]]:
+        """Assign numbers to a goal solver's parameters, or None if they do not fit."""
+        flags = self.percent_flags(message)
+        if len(flags) != len(numbers):
+            return None
+        arguments = {}
+        values = [value for value, is_percent in zip(numbers, flags) if not is_percent]
+        rates = [value for value, is_percent in zip(numbers, flags) if is_percent]
+        if "rate" in spec:
+            name, (low, high) = spec["rate"]
+            if len(rates) != 1 or not low <= rates[0] <= high:
+                return None
+            arguments[name] = rates[0]
+        elif rates:
+            return None
+
+        parameters = spec["parameters"]
+        if not spec["required"] <= len(values) <= len(parameters):
+            return None
+        for value, (name, (low, high)) in zip(values, parameters):
+            if not low <= value <= high:
+                return None
+            arguments[name] = value
+        return arguments
+
+    @staticmethod
+    def _tax_arguments(numbers: List[float], message: str) -> Tuple[List[float], int]:
+        """Split numbers into income amounts and the tax year."""
+        # Only a supported year right after "year" or "for" selects the tax year
+        for match in TAX_YEAR_PATTERN.finditer(message):
+            year = int(match.group(1))
+            if year in TAX_TABLES and year in numbers:
+                amounts = list(numbers)
+                amounts.remove(year)
+                return amounts, year
+        return list(numbers), LATEST_TAX_YEAR
+
+    def render_calculation(self, tool_name: str, result: Dict) -> Optional[str]:
+        """
+        Render a tool result as a deterministic Markdown answer.
+
+        Args:
+            tool_name: Name of the tool that produced the result
+            result: Tool result dictionary
+
+        Returns:
+            Markdown answer, or None if the result cannot be rendered or has
+            missing (None) values, such as a debt that is never paid off
+        """
+        template = CALCULATION_TEMPLATES.get(tool_name)
+        if template is None or "error" in result or _has_missing_values(result):
+            return None
+        try:
+            body = template.format(**result)
+        except (KeyError, ValueError, TypeError):
+            return None
+        return (
+            f"{RESPONSE_TEMPLATES['calculation_intro']}\n{body}{RESPONSE_TEMPLATES['disclaimer']}"
+        )
+
+
+def _has_missing_values(value) -> bool:
+    """Whether a tool result contains None anywhere, including nested values."""
+    if value is None:
+        return True
+    if isinstance(value, dict):
+        return any(_has_missing_values(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_missing_values(v) for v in value)
+    return False
@@ -0,0 +1,399 @@
+"""
+Goal-seeking solvers that invert the financial calculator formulas.
+
+Every solver accepts scalars or arrays (broadcast against each other) so
+many targets can be solved at once. Closed forms are used where they exist;
+otherwise a bracketed, safeguarded Newton iteration is used, which falls back
+to bisection whenever a Newton step leaves the bracket or stops shrinking fast
+enough, so it always converges for the monotonic formulas solved here.
+"""
+
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _future_value(current: np.ndarray, contribution: np.ndarray, rate: np.ndarray, months):
+    """Future value of a balance plus monthly contributions at a monthly rate."""
+    growth = (1 + rate) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(rate == 0, months, (growth - 1) / np.where(rate == 0, 1, rate))
+    return current * growth + contribution * annuity
+
+
+def _loan_payment(principal: np.ndarray, rate: np.ndarray, months):
+    """Monthly payment of an amortizing loan at a monthly rate."""
+    growth = (1 + rate) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = principal * rate * growth / (growth - 1)
+    return np.where(rate == 0, principal / months, payment)
+
+
+def solve_increasing(
+    f: Callable[[np.ndarray], np.ndarray],
+    lo: np.ndarray,
+    hi: np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 200,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Find roots of increasing functions elementwise within brackets.
+
+    Uses Newton steps with a forward-difference derivative, falling back to
+    bisection when a step would leave the bracket or would not be at most half
+    the step taken two iterations earlier. Step sizes therefore shrink at least
+    geometrically and every bracketed element converges within roughly
+    2 * log2(bracket width / tol) iterations.
+
+    Args:
+        f: Vectorized function, increasing in its argument for every element
+        lo: Lower bracket bounds
+        hi: Upper bracket bounds
+        tol: Absolute tolerance on the root
+        max_iter: Iteration cap
+
+    Returns:
+        Tuple of (roots, converged mask, iterations). Elements whose bracket
+        contains no sign change are NaN and not converged.
+    """
+    lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=float), np.asarray(hi, dtype=float))
+    lo, hi = lo.copy(), hi.copy()
+    bracketed = (f(lo) <= 0) & (f(hi) >= 0)
+
+    x = (lo + hi) / 2
+    dx = dx_old = hi - lo
+    done = ~bracketed
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        fx = f(x)
+        lo = np.where(fx < 0, x, lo)
+        hi = np.where(fx >= 0, x, hi)
+        done |= (np.abs(dx) <= tol) | (fx == 0)
+        if np.all(done):
+            break
+
+        step = np.maximum(np.abs(x) * 1e-7, 1e-10)
+        slope = (f(x + step) - fx) / step
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton_dx = fx / slope
+        newton = x - newton_dx
+        use_bisection = (
+            ~np.isfinite(newton)
+            | (newton <= lo)
+            | (newton >= hi)
+            | (np.abs(newton_dx) > np.abs(dx_old) / 2)
+        )
+        dx_old = dx
+        dx = np.where(use_bisection, x - (lo + hi) / 2, newton_dx)
+        x = np.where(done, x, x - dx)
+
+    converged = bracketed & done
+    return np.where(bracketed, x, np.nan), converged, iterations
+
+
+def _output(values, digits: int):
+    """Convert solver results to rounded Python values, with None where infeasible."""
+    values = np.asarray(values, dtype=float)
+    rounded = [round(float(v), digits) if np.isfinite(v) else None for v in values.ravel()]
+    return rounded[0] if values.ndim == 0 else rounded
+
+
+class GoalSolvers:
+    """
+    Inverse solvers for the FinancialTools formulas.
+
+    Units match FinancialTools: compound interest rates are decimals, loan and
+    retirement rates are percentages, and durations are in years.
+    """
+
+    @staticmethod
+    def solve_monthly_contribution(
+        target: ArrayLike,
+        years: ArrayLike,
+        annual_return: ArrayLike,
+        current_savings: ArrayLike = 0,
+    ) -> Dict:
+        """
+        Monthly contribution needed to reach a savings target (closed form).
+
+        Args:
+            target: Savings goal
+            years: Years until the goal
+            annual_return: Expected annual return (as percentage)
+            current_savings: Current balance
+
+        Returns:
+            Dictionary with monthly_contribution, total_contributions and formula
+        """
+        target, years, annual_return, current = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (target, years, annual_return, current_savings))
+        )
+        rate, months = annual_return / 12 / 100, years * 12
+        shortfall = target - _future_value(current, 0.0, rate, months)
+        # No months to save in gives no finite contribution, reported as None
+        with np.errstate(divide="ignore", invalid="ignore"):
+            contribution = np.maximum(shortfall / _future_value(0.0, 1.0, rate, months), 0.0)
+            total = contribution * months
+        return {
+            "monthly_contribution": _output(contribution, 2),
+            "total_contributions": _output(total, 2),
+            "formula": "C = (FV - PV(1 + r)^n) × r / ((1 + r)^n - 1)",
+        }
+
+    @staticmethod
+    def solve_retirement_years(
+        target: ArrayLike,
+        monthly_contribution: ArrayLike,
+        annual_return: ArrayLike,
+        current_savings: ArrayLike = 0,
+    ) -> Dict:
+        """
+        Years of saving needed to reach a target (closed form).
+
+        Args:
+            target: Savings goal
+            monthly_contribution: Monthly savings amount
+            annual_return: Expected annual return (as percentage)
+            current_savings: Current balance
+
+        Returns:
+            Dictionary with years and months (None where the goal is unreachable)
+        """
+        target, contribution, annual_return, current = np.broadcast_arrays(
+            *(
+                np.asarray(v, dtype=float)
+                for v in (target, monthly_contribution, annual_return, current_savings)
+            )
+        )
+        rate = annual_return / 12 / 100
+        with np.errstate(divide="ignore", invalid="ignore"):
+            safe_rate = np.where(rate == 0, 1.0, rate)
+            ratio = (target * safe_rate + contribution) / (current * safe_rate + contribution)
+            months = np.where(
+                rate == 0,
+                (target - current) / contribution,
+                np.log(ratio) / np.log1p(safe_rate),
+            )
+        months = np.where(target <= current, 0.0, months)
+        months = np.where(np.isfinite(months) & (months >= 0), months, np.inf)
+        return {
+            "years": _output(months / 12, 2),
+            "months": _output(np.ceil(months), 0),
+            "formula": "n = ln((FV·r + C) / (PV·r + C)) / ln(1 + r)",
+        }
+
+    @staticmethod
+    def solve_retirement_return(
+        target: ArrayLike,
+        monthly_contribution: ArrayLike,
+        years: ArrayLike,
+        current_savings: ArrayLike = 0,
+    ) -> Dict:
+        """
+        Annual return needed to reach a target (bracketed root-finding).
+
+        Args:
+            target: Savings goal
+            monthly_contribution: Monthly savings amount
+            years: Years until the goal
+            current_savings: Current balance
+
+        Returns:
+            Dictionary with annual_return (percentage), converged and iterations
+        """
+        target, contribution, years, current = np.broadcast_arrays(
+            *(
+                np.asarray(v, dtype=float)
+                for v in (target, monthly_contribution, years, current_savings)
+            )
+        )
+        months = years * 12
+        rate, converged, iterations = solve_increasing(
+            lambda r: _future_value(current, contribution, r, months) - target,
+            np.full(target.shape, -0.99 / 12),
+            np.full(target.shape, 1.0 / 12),
+        )
+        return {
+            "annual_return": _output(rate * 12 * 100, 4),
+            "converged": converged.tolist(),
+            "iterations": iterations,
+        }
+
+    @staticmethod
+    def solve_loan_principal(monthly_payment: ArrayLike, rate: ArrayLike, years: ArrayLike) -> Dict:
+        """
+        Largest loan a monthly payment can support (closed form).
+
+        Args:
+            monthly_payment: Affordable monthly payment
+            rate: Annual interest rate (as percentage)
+            years: Loan term in years
+
+        Returns:
+            Dictionary with principal and total_interest
+        """
+        payment, rate, years = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (monthly_payment, rate, years))
+        )
+        principal = payment / _loan_payment(1.0, rate / 12 / 100, years * 12)
+        return {
+            "principal": _output(principal, 2),
+            "total_interest": _output(payment * years * 12 - principal, 2),
+            "formula": "P = M × (1 - (1 + r)^-n) / r",
+        }
+
+    @staticmethod
+    def solve_loan_rate(principal: ArrayLike, monthly_payment: ArrayLike, years: ArrayLike) -> Dict:
+        """
+        Interest rate at which a loan has a given monthly payment (root-finding).
+
+        Args:
+            principal: Loan amount
+            monthly_payment: Target monthly payment
+            years: Loan term in years
+
+        Returns:
+            Dictionary with annual rate (percentage, None if no rate from 0-100%
+            gives the payment), converged and iterations
+        """
+        principal, payment, years = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (principal, monthly_payment, years))
+        )
+        months = years * 12
+        rate, converged, iterations = solve_increasing(
+            lambda r: _loan_payment(principal, r, months) - payment,
+            np.zeros(principal.shape),
+            np.full(principal.shape, 1.0 / 12),
+        )
+        return {
+            "rate": _output(rate * 12 * 100, 4),
+            "converged": converged.tolist(),
+            "iterations": iterations,
+        }
+
+    @staticmethod
+    def solve_loan_term(principal: ArrayLike, monthly_payment: ArrayLike, rate: ArrayLike) -> Dict:
+        """
+        Years needed to repay a loan with a given monthly payment (closed form).
+
+        Args:
+            principal: Loan amount
+            monthly_payment: Monthly payment
+            rate: Annual interest rate (as percentage)
+
+        Returns:
+            Dictionary with years and months (None if the payment never covers interest)
+        """
+        principal, payment, rate = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (principal, monthly_payment, rate))
+        )
+        monthly_rate = rate / 12 / 100
+        with np.errstate(divide="ignore", invalid="ignore"):
+            safe_rate = np.where(monthly_rate == 0, 1.0, monthly_rate)
+            months = np.where(
+                monthly_rate == 0,
+                principal / payment,
+                -np.log(1 - safe_rate * principal / payment) / np.log1p(safe_rate),
+            )
+        months = np.where(np.isfinite(months) & (months >= 0), months, np.inf)
+        return {
+            "years": _output(months / 12, 2),
+            "months": _output(np.ceil(months), 0),
+            "formula": "n = -ln(1 - rP / M) / ln(1 + r)",
+        }
+
+    @staticmethod
+    def solve_compound_principal(
+        target: ArrayLike, rate: ArrayLike, time: ArrayLike, compounds_per_year: int = 12
+    ) -> Dict:
+        """
+        Initial investment needed to grow to a target (closed form).
+
+        Args:
+            target: Target amount
+            rate: Annual interest rate (as decimal)
+            time: Time period in years
+            compounds_per_year: Number of times interest compounds per year
+
+        Returns:
+            Dictionary with principal
+        """
+        target, rate, time = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (target, rate, time))
+        )
+        n = compounds_per_year
+        return {
+            "principal": _output(target / (1 + rate / n) ** (n * time), 2),
+            "formula": "P = A / (1 + r/n)^(nt)",
+        }
+
+    @staticmethod
+    def solve_compound_rate(
+        target: ArrayLike, principal: ArrayLike, time: ArrayLike, compounds_per_year: int = 12
+    ) -> Dict:
+        """
+        Annual rate needed to grow a principal to a target (closed form).
+
+        Args:
+            target: Target amount
+            principal: Initial investment
+            time: Time period in years
+            compounds_per_year: Number of times interest compounds per year
+
+        Returns:
+            Dictionary with rate (as decimal)
+        """
+        target, principal, time = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (target, principal, time))
+        )
+        n = compounds_per_year
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = n * ((target / principal) ** (1 / (n * time)) - 1)
+        return {"rate": _output(rate, 6), "formula": "r = n((A/P)^(1/(nt)) - 1)"}
+
+    @staticmethod
+    def solve_compound_time(
+        target: ArrayLike, principal: ArrayLike, rate: ArrayLike, compounds_per_year: int = 12
+    ) -> Dict:
+        """
+        Years needed to grow a principal to a target (closed form).
+
+        Args:
+            target: Target amount
+            principal: Initial investment
+            rate: Annual interest rate (as decimal)
+            compounds_per_year: Number of times interest compounds per year
+
+        Returns:
+            Dictionary with years (None if the target is unreachable)
+        """
+        target, principal, rate = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (target, principal, rate))
+        )
+        n = compounds_per_year
+        with np.errstate(divide="ignore", invalid="ignore"):
+            years = np.log(target / principal) / (n * np.log1p(rate / n))
+        years = np.where(target <= principal, 0.0, years)
+        years = np.where(np.isfinite(years) & (years >= 0), years, np.inf)
+        return {"years": _output(years, 2), "formula": "t = ln(A/P) / (n ln(1 + r/n))"}
+
+    @staticmethod
+    def solve_emergency_fund_months(savings: ArrayLike, monthly_expenses: ArrayLike) -> Dict:
+        """
+        Months of expenses an emergency fund covers.
+
+        Args:
+            savings: Emergency fund balance
+            monthly_expenses: Monthly expense amount
+
+        Returns:
+            Dictionary with months_coverage
+        """
+        savings, expenses = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (savings, monthly_expenses))
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            months = savings / expenses
+        return {"months_coverage": _output(months, 2)}
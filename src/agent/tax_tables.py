@@ -0,0 +1,167 @@
+"""
+US federal income tax bracket tables.
+Each tax year lists the standard deduction and the lower bound and rate of
+every bracket per filing status. Tables are converted once into sorted arrays
+with the tax owed at each bracket's lower bound precomputed.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+FILING_STATUSES = (
+    "single",
+    "married_filing_jointly",
+    "married_filing_separately",
+    "head_of_household",
+)
+
+RATES = (0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37)
+
+TAX_TABLES = {
+    2024: {
+        "source": "IRS Rev. Proc. 2023-34",
+        "standard_deduction": {
+            "single": 14600,
+            "married_filing_jointly": 29200,
+            "married_filing_separately": 14600,
+            "head_of_household": 21900,
+        },
+        "bracket_starts": {
+            "single": (0, 11600, 47150, 100525, 191950, 243725, 609350),
+            "married_filing_jointly": (0, 23200, 94300, 201050, 383900, 487450, 731200),
+            "married_filing_separately": (0, 11600, 47150, 100525, 191950, 243725, 365600),
+            "head_of_household": (0, 16550, 63100, 100500, 191950, 243700, 609350),
+        },
+    },
+    2025: {
+        "source": "IRS Rev. Proc. 2024-40; standard deduction as amended by P.L. 119-21",
+        "standard_deduction": {
+            "single": 15750,
+            "married_filing_jointly": 31500,
+            "married_filing_separately": 15750,
+            "head_of_household": 23625,
+        },
+        "bracket_starts": {
+            "single": (0, 11925, 48475, 103350, 197300, 250525, 626350),
+            "married_filing_jointly": (0, 23850, 96950, 206700, 394600, 501050, 751600),
+            "married_filing_separately": (0, 11925, 48475, 103350, 197300, 250525, 375800),
+            "head_of_household": (0, 17000, 64850, 103350, 197300, 250500, 626350),
+        },
+    },
+    2026: {
+        "source": "IRS Rev. Proc. 2025-32",
+        "standard_deduction": {
+            "single": 16100,
+            "married_filing_jointly": 32200,
+            "married_filing_separately": 16100,
+            "head_of_household": 24150,
+        },
+        "bracket_starts": {
+            "single": (0, 12400, 50400, 105700, 201775, 256225, 640600),
+            "married_filing_jointly": (0, 24800, 100800, 211400, 403550, 512450, 768700),
+            "married_filing_separately": (0, 12400, 50400, 105700, 201775, 256225, 384350),
+            "head_of_household": (0, 17700, 67450, 105700, 201750, 256200, 640600),
+        },
+    },
+}
+
+LATEST_TAX_YEAR = max(TAX_TABLES)
+
+
+class TaxTable:
+    """Brackets for one tax year and filing status as sorted arrays."""
+
+    __slots__ = (
+        "year",
+        "filing_status",
+        "standard_deduction",
+        "starts",
+        "rates",
+        "base_tax",
+        "_starts",
+        "_base_tax",
+    )
+
+    def __init__(
+        self,
+        year: int,
+        filing_status: str,
+        standard_deduction: float,
+        brackets: List[Tuple[float, float]],
+    ):
+        """
+        Build a table from bracket lower bounds and rates.
+
+        Args:
+            year: Tax year
+            filing_status: Filing status the brackets apply to
+            standard_deduction: Standard deduction for the filing status
+            brackets: (lower bound, rate) pairs
+        """
+        brackets = sorted(brackets)
+        self.year = year
+        self.filing_status = filing_status
+        self.standard_deduction = float(standard_deduction)
+        self.starts = np.array([start for start, _ in brackets], dtype=float)
+        self.rates = np.array([rate for _, rate in brackets])
+        # Tax owed on income up to the start of each bracket
+        self.base_tax = np.concatenate(([0.0], np.cumsum(np.diff(self.starts) * self.rates[:-1])))
+        self._starts = self.starts.tolist()
+        self._base_tax = self.base_tax.tolist()
+
+    def bracket_index(self, taxable_income: float) -> int:
+        """Find the bracket a taxable income falls in."""
+        return max(bisect_right(self._starts, taxable_income) - 1, 0)
+
+    def tax(self, taxable_income: float) -> float:
+        """Compute the tax owed on a taxable income."""
+        if taxable_income <= 0:
+            return 0.0
+        i = self.bracket_index(taxable_income)
+        return self._base_tax[i] + (taxable_income - self._starts[i]) * float(self.rates[i])
+
+    def tax_many(self, taxable_incomes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute taxes and marginal rates for many taxable incomes at once.
+
+        Args:
+            taxable_incomes: Array of taxable incomes
+
+        Returns:
+            Tuple of (tax owed, marginal rate) arrays
+        """
+        taxable = np.maximum(np.asarray(taxable_incomes, dtype=float), 0.0)
+        index = np.maximum(np.searchsorted(self.starts, taxable, side="right") - 1, 0)
+        taxes = self.base_tax[index] + (taxable - self.starts[index]) * self.rates[index]
+        return taxes, self.rates[index]
+
+
+@lru_cache(maxsize=None)
+def get_tax_table(year: int, filing_status: str) -> TaxTable:
+    """
+    Get the bracket table for a tax year and filing status.
+
+    Args:
+        year: Tax year
+        filing_status: One of FILING_STATUSES
+
+    Returns:
+        TaxTable, built on first use and cached
+
+    Raises:
+        ValueError: If the year or filing status is not supported
+    """
+    if year not in TAX_TABLES:
+        raise ValueError(f"Tax year {year} is not supported, choose from {sorted(TAX_TABLES)}")
+    if filing_status not in FILING_STATUSES:
+        raise ValueError(
+            f"Filing status {filing_status!r} is not supported, choose from {list(FILING_STATUSES)}"
+        )
+    table = TAX_TABLES[year]
+    starts = table["bracket_starts"][filing_status]
+    return TaxTable(
+        year, filing_status, table["standard_deduction"][filing_status], list(zip(starts, RATES))
+    )
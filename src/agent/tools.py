@@ -2,7 +2,12 @@
 Financial calculation tools for the advisor agent.
 """
 
-from typing import Dict
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .tax_tables import LATEST_TAX_YEAR, TAX_TABLES, get_tax_table
 
 
 class FinancialTools:
@@ -116,3 +121,246 @@ class FinancialTools:
             "months_coverage": months_coverage,
             "explanation": f"Emergency fund should cover {months_coverage} months of expenses",
         }
+
+    @staticmethod
+    def calculate_income_tax(
+        income: float,
+        filing_status: str = "single",
+        year: int = LATEST_TAX_YEAR,
+        deductions: Optional[float] = None,
+    ) -> Dict:
+        """
+        Estimate US federal income tax on ordinary income.
+
+        Credits, payroll taxes, capital gains rates and state taxes are not included.
+
+        Args:
+            income: Gross annual income
+            filing_status: single, married_filing_jointly, married_filing_separately
+                or head_of_household
+            year: Tax year
+            deductions: Itemized deductions (the standard deduction is used if larger)
+
+        Returns:
+            Dictionary with taxable_income, tax, effective and marginal rates (as
+            percentages), after-tax income and the tax owed in each bracket
+        """
+        table = get_tax_table(year, filing_status)
+        deduction = max(table.standard_deduction, deductions or 0.0)
+        taxable = max(income - deduction, 0.0)
+        tax = table.tax(taxable)
+        top = table.bracket_index(taxable)
+
+        brackets = []
+        for i in range(top + 1):
+            upper = table.starts[i + 1] if i + 1 < len(table.starts) else taxable
+            taxed = min(taxable, upper) - table.starts[i]
+            brackets.append(
+                {
+                    "rate": round(float(table.rates[i]) * 100, 2),
+                    "taxed_amount": round(float(taxed), 2),
+                    "tax": round(float(taxed * table.rates[i]), 2),
+                }
+            )
+
+        return {
+            "income": income,
+            "filing_status": filing_status,
+            "year": year,
+            "deduction": round(deduction, 2),
+            "taxable_income": round(taxable, 2),
+            "tax": round(tax, 2),
+            "effective_rate": round(tax / income * 100, 2) if income > 0 else 0.0,
+            "marginal_rate": round(float(table.rates[top]) * 100, 2),
+            "after_tax_income": round(income - tax, 2),
+            "brackets": brackets,
+            "source": TAX_TABLES[year]["source"],
+        }
+
+    @staticmethod
+    def calculate_income_tax_sweep(
+        incomes: List[float],
+        filing_status: str = "single",
+        year: int = LATEST_TAX_YEAR,
+        deductions: Optional[float] = None,
+    ) -> Dict:
+        """
+        Estimate US federal income tax across many incomes at once.
+
+        Useful for "what if I earn more" comparisons and charts.
+
+        Args:
+            incomes: Gross annual incomes
+            filing_status: Filing status (see calculate_income_tax)
+            year: Tax year
+            deductions: Itemized deductions (the standard deduction is used if larger)
+
+        Returns:
+            Dictionary with lists of tax, effective and marginal rates (as
+            percentages) and after-tax income, aligned with ``incomes``
+        """
+        table = get_tax_table(year, filing_status)
+        deduction = max(table.standard_deduction, deductions or 0.0)
+        gross = np.asarray(incomes, dtype=float)
+        taxes, marginal = table.tax_many(gross - deduction)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            effective = np.where(gross > 0, taxes / gross * 100, 0.0)
+
+        return {
+            "filing_status": filing_status,
+            "year": year,
+            "deduction": round(deduction, 2),
+            "incomes": gross.round(2).tolist(),
+            "tax": taxes.round(2).tolist(),
+            "effective_rate": effective.round(2).tolist(),
+            "marginal_rate": (marginal * 100).round(2).tolist(),
+            "after_tax_income": (gross - taxes).round(2).tolist(),
+        }
+
+    @staticmethod
+    def calculate_debt_payoff(
+        debts: List[Dict],
+        monthly_budget: float,
+        custom_order: Optional[List[int]] = None,
+        max_years: int = 30,
+        start_date: Optional[date] = None,
+    ) -> Dict:
+        """
+        Compare debt payoff strategies with a month-by-month simulation.
+
+        Every strategy pays the minimum on each debt and puts the rest of the
+        budget toward debts in priority order; payments freed by a paid-off
+        debt roll over to the next one. All strategies and debts are simulated
+        together as arrays.
+
+        Args:
+            debts: List of dicts with balance, apr (as percentage) and
+                minimum_payment, plus an optional name
+            monthly_budget: Total amount available for debt payments each month
+            custom_order: Optional debt indices in the order they should be targeted
+            max_years: Simulation horizon in years
+            start_date: Date the first payment is made (defaults to today)
+
+        Returns:
+            Dictionary with per-strategy payoff dates, total interest, per-debt
+            results and a yearly balance schedule, whether any strategy is debt
+            free within ``max_years`` (``feasible``) and the recommended strategy
+            (None if none is)
+
+        Raises:
+            ValueError: If the budget does not cover the minimum payments or the
+                monthly interest
+        """
+        if not debts:
+            raise ValueError("At least one debt is required")
+
+        names = [debt.get("name") or f"Debt {i + 1}" for i, debt in enumerate(debts)]
+        balances = np.array([float(debt["balance"]) for debt in debts])
+        aprs = np.array([float(debt["apr"]) for debt in debts])
+        minimums = np.array([float(debt["minimum_payment"]) for debt in debts])
+        if (balances <= 0).any():
+            raise ValueError("Debt balances must be positive")
+        if minimums.sum() > monthly_budget:
+            raise ValueError(
+                f"Monthly budget {monthly_budget} does not cover minimum payments of {minimums.sum()}"
+            )
+        monthly_interest = float((balances * aprs / 12 / 100).sum())
+        if monthly_budget <= monthly_interest:
+            raise ValueError(
+                f"Monthly budget {monthly_budget} does not cover the {monthly_interest:.2f} of "
+                "interest the debts accrue each month, so they would never be paid off"
+            )
+
+        # Priority orders: highest rate first, smallest balance first, then any custom order
+        orders = {
+            "avalanche": np.lexsort((balances, -aprs)),
+            "snowball": np.lexsort((-aprs, balances)),
+        }
+        if custom_order is not None:
+            if sorted(custom_order) != list(range(len(debts))):
+                raise ValueError("custom_order must list every debt index exactly once")
+            orders["custom"] = np.array(custom_order)
+
+        strategies = list(orders)
+        order = np.stack([orders[name] for name in strategies])
+        num_strategies, num_months = len(strategies), max_years * 12
+        monthly_rates = aprs / 12 / 100
+        # Flat indices of each strategy's prioritized debts in the balance matrix
+        flat_order = order + np.arange(num_strategies)[:, None] * len(debts)
+
+        remaining = np.tile(balances, (num_strategies, 1))
+        interest_paid = np.zeros_like(remaining)
+        payoff_month = np.zeros(remaining.shape, dtype=int)
+        balance_history = np.zeros((num_months, num_strategies))
+
+        month = 0
+        while month < num_months and remaining.any():
+            interest = remaining * monthly_rates
+            remaining += interest
+            interest_paid += interest
+
+            minimum_paid = np.minimum(minimums, remaining)
+            remaining -= minimum_paid
+            extra = monthly_budget - minimum_paid.sum(axis=1)
+
+            # Pour the extra budget into debts in priority order
+            prioritized = remaining.take(flat_order)
+            already_covered = np.cumsum(prioritized, axis=1) - prioritized
+            extra_paid = np.clip(extra[:, None] - already_covered, 0, prioritized)
+            remaining.put(flat_order, prioritized - extra_paid)
+
+            month += 1
+            paid_off = remaining < 0.005
+            payoff_month[paid_off & (payoff_month == 0)] = month
+            remaining[paid_off] = 0.0
+            balance_history[month - 1] = remaining.sum(axis=1)
+
+        # Payment month 1 is made on the start date
+        start = start_date or date.today()
+        results = {}
+        for s, name in enumerate(strategies):
+            debt_free = bool((payoff_month[s] > 0).all())
+            months = int(payoff_month[s].max()) if debt_free else None
+            total_interest = float(interest_paid[s].sum())
+            results[name] = {
+                "months_to_debt_free": months,
+                "debt_free_date": _add_months(start, months - 1) if debt_free else None,
+                "total_interest": round(total_interest, 2),
+                "total_paid": round(float(balances.sum()) + total_interest, 2),
+                "payoff_order": [names[i] for i in order[s]],
+                "debts": [
+                    {
+                        "name": names[i],
+                        "payoff_month": int(payoff_month[s, i]) or None,
+                        "payoff_date": (
+                            _add_months(start, int(payoff_month[s, i]) - 1)
+                            if payoff_month[s, i]
+                            else None
+                        ),
+                        "interest_paid": round(float(interest_paid[s, i]), 2),
+                    }
+                    for i in range(len(debts))
+                ],
+                "schedule": [
+                    {"month": m, "balance": round(float(balance_history[m - 1, s]), 2)}
+                    for m in range(12, month + 1, 12)
+                ],
+            }
+
+        # Only a strategy that clears every debt within the horizon is recommended
+        feasible = [name for name in strategies if results[name]["months_to_debt_free"] is not None]
+        recommended = min(feasible, key=lambda name: results[name]["total_interest"], default=None)
+        return {
+            "monthly_budget": monthly_budget,
+            "minimum_payments": round(float(minimums.sum()), 2),
+            "total_debt": round(float(balances.sum()), 2),
+            "strategies": results,
+            "feasible": bool(feasible),
+            "recommended": recommended,
+        }
+
+
+def _add_months(start: date, months: int) -> str:
+    """Get the year and month that falls a number of months after a date."""
+    year, month = divmod(start.month - 1 + months, 12)
+    return f"{start.year + year:04d}-{month + 1:02d}"
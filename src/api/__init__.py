@@ -1,5 +1,13 @@
 # API module
-from .models import ChatRequest, ChatResponse, SessionData
+from .admin import admin_router
+from .models import BatchChatRequest, ChatRequest, ChatResponse, SessionData
 from .routes import router
 
-__all__ = ["router", "ChatRequest", "ChatResponse", "SessionData"]
+__all__ = [
+    "router",
+    "admin_router",
+    "ChatRequest",
+    "BatchChatRequest",
+    "ChatResponse",
+    "SessionData",
+]
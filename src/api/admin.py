@@ -0,0 +1,95 @@
+"""
+Admin routes for request profiles, event-loop lag, API key usage and metrics.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from ..config.settings import settings
+from ..utils.metrics import metrics
+from ..utils.profiling import Profiler
+from .auth import require_admin
+from .responses import FastJSONResponse
+from .routes import genai_service
+
+profiler = (
+    Profiler(
+        interval_ms=settings.profiling_interval_ms,
+        slow_request_ms=settings.profiling_slow_request_ms,
+        loop_lag_interval_ms=settings.profiling_loop_lag_interval_ms,
+        loop_stall_ms=settings.profiling_loop_stall_ms,
+        max_profiles=settings.profiling_max_profiles,
+    )
+    if settings.profiling_enabled
+    else None
+)
+
+
+# Every admin route requires a valid admin token
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+async def require_profiler() -> Profiler:
+    """Dependency resolving the profiler for admin requests."""
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    return profiler
+
+
+@admin_router.get("/profiles")
+async def list_profiles(profiler: Profiler = Depends(require_profiler)):
+    """List finished profiles, newest first."""
+    return FastJSONResponse([profile.summary() for profile in reversed(profiler.profiles)])
+
+
+@admin_router.get("/profiles/folded", response_class=PlainTextResponse)
+async def merged_profiles(
+    reason: Optional[str] = None, profiler: Profiler = Depends(require_profiler)
+):
+    """
+    Download all finished profiles merged as folded stacks.
+
+    Args:
+        reason: Only include profiles captured for this reason
+            (``header``, ``sampled``, ``slow`` or ``loop_stall``)
+
+    Returns:
+        Folded stacks for flamegraph.pl, speedscope or inferno
+    """
+    return PlainTextResponse(profiler.folded(reason))
+
+
+@admin_router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, profiler: Profiler = Depends(require_profiler)):
+    """Download one profile as folded stacks."""
+    profile = profiler.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile.folded())
+
+
+@admin_router.delete("/profiles")
+async def clear_profiles(profiler: Profiler = Depends(require_profiler)):
+    """Drop finished profiles and lag history."""
+    profiler.clear()
+    return FastJSONResponse({"message": "Profiles cleared"})
+
+
+@admin_router.get("/loop-lag")
+async def loop_lag(profiler: Profiler = Depends(require_profiler)):
+    """Get event-loop lag statistics."""
+    return FastJSONResponse(profiler.loop_lag_stats())
+
+
+@admin_router.get("/genai/keys")
+async def genai_key_usage():
+    """Get per-key request counts, rate limits, remaining quota and cooldowns."""
+    return FastJSONResponse(genai_service.key_usage())
+
+
+@admin_router.get("/metrics")
+async def get_metrics():
+    """Get in-process counters, such as cancelled generations by reason."""
+    return FastJSONResponse(metrics.snapshot())
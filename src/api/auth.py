@@ -0,0 +1,33 @@
+"""
+Admin token checks shared by admin and back-office routes.
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from ..config.settings import settings
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """
+    Check an admin token.
+
+    Admin access is denied to everyone when no ``admin_token`` is configured.
+
+    Args:
+        token: Token sent by the client
+
+    Returns:
+        True if the caller may use admin features
+    """
+    if not settings.admin_token:
+        return False
+    return token is not None and hmac.compare_digest(token, settings.admin_token)
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Dependency rejecting requests without a valid admin token."""
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
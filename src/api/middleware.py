@@ -0,0 +1,68 @@
+"""
+ASGI middleware for the API.
+"""
+
+import random
+from typing import Callable, Optional
+
+from ..utils.profiling import Profiler
+
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+
+
+class ProfilingMiddleware:
+    """
+    Run requests under the profiler on demand, by sampling, or when slow.
+
+    A request is profiled from the start when it sends ``X-Profile: 1`` with an
+    authorized ``X-Admin-Token``, or when it is picked by ``sample_rate``. Its
+    profile ID is returned in the ``X-Profile-Id`` response header. Other
+    requests are only traced when the profiler watches for slow requests.
+    """
+
+    def __init__(
+        self,
+        app,
+        profiler: Profiler,
+        sample_rate: float = 0.0,
+        authorize: Callable[[Optional[str]], bool] = lambda token: False,
+    ):
+        self.app = app
+        self.profiler = profiler
+        self.sample_rate = sample_rate
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = None
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER) == b"1":
+            token = headers.get(ADMIN_TOKEN_HEADER)
+            if self.authorize(token.decode("latin-1") if token is not None else None):
+                reason = "header"
+        if reason is None and self.sample_rate and random.random() < self.sample_rate:
+            reason = "sampled"
+        if reason is None and not self.profiler.watches_all_requests:
+            await self.app(scope, receive, send)
+            return
+
+        trace = self.profiler.begin(scope["method"], scope["path"], reason)
+        if reason is not None:
+            profile_id = trace.profile.profile_id.encode("latin-1")
+
+            async def send_with_profile_id(message):
+                if message["type"] == "http.response.start":
+                    headers = message.get("headers", [])
+                    message["headers"] = [*headers, (b"x-profile-id", profile_id)]
+                await send(message)
+
+        else:
+            send_with_profile_id = send
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            self.profiler.end(trace)
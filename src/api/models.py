@@ -5,7 +5,7 @@ Pydantic models for API request/response validation.
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ChatRequest(BaseModel):
@@ -16,6 +16,14 @@ class ChatRequest(BaseModel):
     user_preferences: Optional[Dict] = None
 
 
+class BatchChatRequest(BaseModel):
+    """Request model for the batch chat endpoint."""
+
+    items: List[ChatRequest] = Field(min_length=1, max_length=500)
+    concurrency: int = Field(default=8, ge=1, le=64)
+    isolate_sessions: bool = True
+
+
 class ChatResponse(BaseModel):
     """Response model for chat endpoint."""
 
@@ -0,0 +1,51 @@
+"""
+Fast JSON response classes for the API.
+"""
+
+from typing import Any, Dict
+
+from fastapi.responses import JSONResponse, Response
+
+from ..utils.serialization import json_dumps, ndjson_line
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when available.
+
+    Content may include datetimes and pydantic models, so handlers can return
+    it directly and skip FastAPI's generic ``jsonable_encoder`` pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+class PreEncodedJSONResponse(Response):
+    """Response for JSON bodies that were encoded ahead of time."""
+
+    media_type = "application/json"
+
+
+# Static response fragments encoded once at import time
+SESSION_DELETED_BODY = json_dumps({"message": "Session deleted"})
+_DELTA_PREFIX = b'{"type":"delta","text":'
+_DELTA_SUFFIX = b"}\n"
+
+
+def encode_event(event: Dict) -> bytes:
+    """
+    Encode a chat stream event as an NDJSON line.
+
+    ``delta`` events are by far the most frequent, so only their text is
+    encoded and spliced between pre-encoded fragments.
+
+    Args:
+        event: Event dictionary with a ``type`` key
+
+    Returns:
+        Encoded line bytes
+    """
+    if event["type"] == "delta":
+        return _DELTA_PREFIX + json_dumps(event["text"]) + _DELTA_SUFFIX
+    return ndjson_line(event)
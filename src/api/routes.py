@@ -2,17 +2,32 @@
 FastAPI routes for the financial advisor chat application.
 """
 
-import json
-import uuid
+import asyncio
+from contextlib import suppress
+from typing import Any, Awaitable, Optional
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 from ..agent import FinancialAgent
+from ..config.settings import settings
+from ..services.batch_service import run_batch
+from ..services.chat_service import ChatService
 from ..services.genai_service import GenAIService
+from ..services.knowledge_service import KnowledgeBase
+from ..services.semantic_cache import SemanticCache
 from ..services.session_service import SessionService
+from ..utils.exceptions import GenerationCancelled
 from ..utils.logger import logger
-from .models import ChatRequest, ChatResponse
+from ..utils.serialization import ndjson_line
+from .auth import require_admin
+from .models import BatchChatRequest, ChatRequest, ChatResponse
+from .responses import (
+    SESSION_DELETED_BODY,
+    FastJSONResponse,
+    PreEncodedJSONResponse,
+    encode_event,
+)
 
 router = APIRouter()
 
@@ -20,6 +35,64 @@ router = APIRouter()
 session_service = SessionService()
 genai_service = GenAIService()
 agent = FinancialAgent()
+semantic_cache = (
+    SemanticCache(
+        capacity=settings.semantic_cache_capacity, threshold=settings.semantic_cache_threshold
+    )
+    if settings.semantic_cache_enabled
+    else None
+)
+if not settings.knowledge_base_enabled:
+    knowledge_base = None
+elif settings.knowledge_index_path:
+    knowledge_base = KnowledgeBase.load(settings.knowledge_index_path)
+else:
+    knowledge_base = KnowledgeBase.from_directory()
+chat_service = ChatService(
+    session_service=session_service,
+    genai_service=genai_service,
+    agent=agent,
+    semantic_cache=semantic_cache,
+    knowledge_base=knowledge_base,
+    calculation_fast_path=settings.calculation_fast_path,
+    explain_calculations=settings.calculation_fast_path_explain,
+    knowledge_top_k=settings.knowledge_top_k,
+    knowledge_direct_answer_threshold=settings.knowledge_direct_answer_threshold,
+)
+
+
+# Nonstandard status (from nginx) for requests abandoned by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    """Wait until the client closes the connection."""
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _until_disconnected(request: Request, work: Awaitable) -> Optional[Any]:
+    """
+    Await work, cancelling it if the client disconnects first.
+
+    Args:
+        request: Request whose connection is watched
+        work: Awaitable producing the response
+
+    Returns:
+        The work's result, or None if the client disconnected
+    """
+    task = asyncio.ensure_future(work)
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnect.cancel()
+        if not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    return None if task.cancelled() else task.result()
 
 
 @router.get("/")
@@ -29,10 +102,13 @@ async def root():
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     """
     Process a chat message and return AI response.
 
+    The model call is cancelled if the client disconnects, or if a newer
+    message for the same session arrives first (409 Conflict).
+
     Args:
         request: Chat request with history and optional session info
 
@@ -40,62 +116,79 @@ async def chat(request: ChatRequest):
         ChatResponse with AI response, session ID, tools used, and confidence
     """
     try:
-        # Get or create session
-        session_id = request.session_id or str(uuid.uuid4())
-        session_data = session_service.get_or_create_session(
-            session_id=session_id, preferences=request.user_preferences
+        turn = chat_service.prepare_turn(
+            request.history, request.session_id, request.user_preferences
         )
+        fields = await _until_disconnected(http_request, chat_service.complete_turn(turn))
+        if fields is None:
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        # Fields already match ChatResponse, so skip re-validating and re-encoding them
+        return FastJSONResponse(fields, headers={"Server-Timing": turn.server_timing()})
+
+    except GenerationCancelled as e:
+        raise HTTPException(status_code=409, detail=f"Superseded by a newer message ({e.reason})")
+    except Exception as e:
+        logger.error(f"Chat error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Get the latest user message
-        latest_message = request.history[-1] if request.history else ""
 
-        # Check for calculation requests
-        calculation_request = agent.detect_calculation_request(latest_message)
-        tools_used = []
-        calculation_result = None
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Process a chat message and stream the response as NDJSON events.
 
-        if calculation_request:
-            numbers = agent.extract_numbers(latest_message)
-            if numbers:
-                calculation_result = agent.execute_tool(calculation_request["tool"], numbers)
-                tools_used.append(calculation_request["description"])
+    Args:
+        request: Chat request with history and optional session info
 
-        # Build enhanced prompt
-        context = agent.get_enhanced_context(session_data)
+    Returns:
+        StreamingResponse of ``response``, ``delta``, ``done``, ``cancelled``
+        and ``error`` events. The model stream is cancelled when the client
+        disconnects or a newer message for the same session arrives.
+    """
+    try:
+        turn = chat_service.prepare_turn(
+            request.history, request.session_id, request.user_preferences
+        )
+    except Exception as e:
+        logger.error(f"Chat error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Add calculation results to context if available
-        if calculation_result and "error" not in calculation_result:
-            context += f"\n\nCALCULATION RESULT:\n{json.dumps(calculation_result, indent=2)}\n\nPlease explain these results to the user in a clear, educational manner."
+    async def events():
+        try:
+            async for event in chat_service.stream_turn(turn):
+                yield encode_event(event)
+        except GenerationCancelled as e:
+            yield encode_event({"type": "cancelled", "reason": e.reason})
+        except Exception as e:
+            logger.error(f"Chat stream error: {str(e)}")
+            yield encode_event({"type": "error", "detail": str(e)})
 
-        # Combine context with conversation history
-        full_prompt = context + "\n\nCONVERSATION HISTORY:\n" + "\n".join(request.history)
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
-        # Generate response
-        response_text = await genai_service.generate_response(full_prompt)
 
-        # Update session
-        session_service.add_conversation_entry(
-            session_id=session_id,
-            user_message=latest_message,
-            ai_response=response_text,
-            tools_used=tools_used,
-        )
+@router.post("/chat/batch", dependencies=[Depends(require_admin)])
+async def chat_batch(request: BatchChatRequest):
+    """
+    Process many chat requests and stream results as NDJSON in completion order.
 
-        # Calculate confidence
-        confidence = 0.9 if calculation_result else 0.8
+    Batches are a back-office tool and require a valid ``X-Admin-Token``.
 
-        logger.info(f"Chat processed for session {session_id}, tools: {tools_used}")
+    Args:
+        request: Batch of chat requests with concurrency and session isolation options
 
-        return ChatResponse(
-            response=response_text,
-            session_id=session_id,
-            tools_used=tools_used,
-            confidence=confidence,
-        )
+    Returns:
+        StreamingResponse with one result object per item, including timings
+    """
+    items = [item.model_dump() for item in request.items]
+    logger.info(f"Batch of {len(items)} items started, concurrency {request.concurrency}")
 
-    except Exception as e:
-        logger.error(f"Chat error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    async def results():
+        async for result in run_batch(
+            chat_service, items, request.concurrency, request.isolate_sessions
+        ):
+            yield ndjson_line(result)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
 
 
 @router.get("/session/{session_id}")
@@ -104,11 +197,11 @@ async def get_session(session_id: str):
     session = session_service.get_session(session_id)
     if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    return session
+    return FastJSONResponse(session)
 
 
 @router.delete("/session/{session_id}")
 async def delete_session(session_id: str):
     """Delete a session."""
     session_service.delete_session(session_id)
-    return {"message": "Session deleted"}
+    return PreEncodedJSONResponse(SESSION_DELETED_BODY)
@@ -3,6 +3,10 @@ from .agent_config import (
     AGENT_PERSONALITY,
     API_CONFIG,
     AVAILABLE_TOOLS,
+    CALCULATION_GOALS,
+    CALCULATION_PARAMETERS,
+    CALCULATION_TEMPLATES,
+    INVERSE_QUESTION_PHRASES,
     RESPONSE_TEMPLATES,
     SESSION_CONFIG,
 )
@@ -13,6 +17,10 @@ __all__ = [
     "AGENT_PERSONALITY",
     "AVAILABLE_TOOLS",
     "RESPONSE_TEMPLATES",
+    "CALCULATION_TEMPLATES",
+    "CALCULATION_PARAMETERS",
+    "CALCULATION_GOALS",
+    "INVERSE_QUESTION_PHRASES",
     "SESSION_CONFIG",
     "API_CONFIG",
 ]
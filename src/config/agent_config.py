@@ -25,6 +25,48 @@ AGENT_PERSONALITY = {
 
 # Available Tools Configuration
 AVAILABLE_TOOLS = {
+    "debt_payoff": {
+        "name": "Debt Payoff Optimizer",
+        "description": "Compare debt payoff strategies (avalanche, snowball, custom)",
+        "keywords": [
+            "debt payoff",
+            "pay off debt",
+            "pay off my debt",
+            "paying off debt",
+            "avalanche",
+            "snowball",
+        ],
+        "parameters": ["debts", "monthly_budget", "custom_order"],
+    },
+    "savings_goal": {
+        "name": "Savings Goal Solver",
+        "description": "Find the monthly contribution needed to reach a savings target",
+        "keywords": [
+            # Phrasings that name a target, so contribution questions stay with retirement_savings
+            "savings goal",
+            "goal of",
+            "to reach",
+            "retire with",
+        ],
+        "parameters": ["target", "years", "annual_return", "current_savings"],
+    },
+    "income_tax": {
+        "name": "Income Tax Estimator",
+        "description": "Estimate federal income tax with marginal and effective rates",
+        "keywords": [
+            "income tax",
+            "federal tax",
+            "tax bracket",
+            "tax estimate",
+            "tax on my income",
+            "tax on my salary",
+            "taxes on my income",
+            "taxes on my salary",
+            "effective tax rate",
+            "marginal tax rate",
+        ],
+        "parameters": ["income", "filing_status", "year", "deductions"],
+    },
     "compound_interest": {
         "name": "Compound Interest Calculator",
         "description": "Calculate compound interest growth over time",
@@ -94,11 +136,254 @@ Try asking me questions like:
     "error_message": "I apologize, but I encountered an error processing your request. Please try rephrasing your question or contact support if the issue persists.",
 }
 
+# Deterministic answers for calculator results, keyed by tool ID.
+# Placeholders are filled from the tool's result dictionary.
+CALCULATION_TEMPLATES = {
+    "compound_interest": """
+## 📈 Compound Interest Projection
+
+| | Amount |
+|---|---|
+| **Final amount** | ${final_amount:,.2f} |
+| **Interest earned** | ${interest_earned:,.2f} |
+
+**Formula**: `{formula}`
+
+where *P* is the principal, *r* the annual rate, *n* the compounding periods per year and *t* the number of years.
+""",
+    "loan_payment": """
+## 🏠 Loan Payment Breakdown
+
+| | Amount |
+|---|---|
+| **Monthly payment** | ${monthly_payment:,.2f} |
+| **Total paid** | ${total_payment:,.2f} |
+| **Total interest** | ${total_interest:,.2f} |
+
+**Formula**: `M = P × r(1 + r)^n / ((1 + r)^n - 1)`
+
+where *P* is the loan amount, *r* the monthly interest rate and *n* the number of monthly payments.
+""",
+    "retirement_savings": """
+## 🏖️ Retirement Savings Projection
+
+| | Amount |
+|---|---|
+| **Projected savings** | ${total_savings:,.2f} |
+| **Your contributions** | ${contributions:,.2f} |
+| **Investment growth** | ${interest_earned:,.2f} |
+
+**Formula**: `FV = PV(1 + r)^n + C × ((1 + r)^n - 1) / r`
+
+where *PV* is your current savings, *C* the monthly contribution, *r* the monthly return and *n* the number of months.
+""",
+    "emergency_fund": """
+## 🛟 Emergency Fund Target
+
+| | Amount |
+|---|---|
+| **Recommended fund** | ${recommended_amount:,.2f} |
+| **Monthly expenses** | ${monthly_expenses:,.2f} |
+| **Months covered** | {months_coverage:g} |
+
+**Formula**: `Fund = monthly expenses × months of coverage`
+
+{explanation}.
+""",
+    "savings_goal": """
+## 🎯 Savings Goal Plan
+
+| | Amount |
+|---|---|
+| **Monthly contribution needed** | ${monthly_contribution:,.2f} |
+| **Savings target** | ${target:,.2f} |
+| **Starting balance** | ${current_savings:,.2f} |
+| **Total contributions** | ${total_contributions:,.2f} |
+
+Assumes {annual_return:g}% annual return over {years:g} years.
+
+**Formula**: `{formula}`
+
+where *FV* is the target, *PV* your current savings, *r* the monthly return and *n* the number of months.
+""",
+    "income_tax": """
+## 🧾 Federal Income Tax Estimate ({year}, {filing_status_label})
+
+| | Amount |
+|---|---|
+| **Income** | ${income:,.2f} |
+| **Deduction** | ${deduction:,.2f} |
+| **Taxable income** | ${taxable_income:,.2f} |
+| **Estimated federal tax** | ${tax:,.2f} |
+| **After-tax income** | ${after_tax_income:,.2f} |
+
+**Effective rate**: {effective_rate:g}% of income · **Marginal rate**: {marginal_rate:g}% on the next dollar
+
+**Method**: taxable income is income minus the larger of the standard or itemized deduction, and each slice of it is taxed at its bracket's rate. Credits, payroll and state taxes are not included. Figures from {source}.
+""",
+    "debt_payoff": """
+## 💳 Debt Payoff Plan
+
+Total debt **${total_debt:,.2f}** with a monthly budget of **${monthly_budget:,.2f}** (minimum payments: ${minimum_payments:,.2f}).
+
+| Strategy | Debt-free | Months | Total interest |
+|---|---|---|---|
+| **Avalanche** (highest rate first) | {strategies[avalanche][debt_free_date]} | {strategies[avalanche][months_to_debt_free]} | ${strategies[avalanche][total_interest]:,.2f} |
+| **Snowball** (smallest balance first) | {strategies[snowball][debt_free_date]} | {strategies[snowball][months_to_debt_free]} | ${strategies[snowball][total_interest]:,.2f} |
+
+**Lowest-cost strategy**: {recommended}
+
+**Method**: each month interest accrues at APR / 12, every debt receives its minimum payment, and the rest of the budget goes to the priority debt. Payments freed by a paid-off debt roll over to the next one.
+""",
+}
+
+# Wording that asks for a calculator input rather than its result, such as the
+# loan a payment affords or the years needed to reach a target. The calculators
+# would read the numbers as the wrong parameters, so these turns never get a
+# calculator answer: a matching goal solver runs instead (see CALCULATION_GOALS),
+# or the AI model answers on its own.
+INVERSE_QUESTION_PHRASES = [
+    "afford",
+    "how much can i borrow",
+    "how much house",
+    "how long",
+    "how many years",
+    "how many months",
+    "how soon",
+    "when will i",
+    "when can i",
+    "what rate",
+    "what interest rate",
+    "what return",
+    "rate of return",
+    "to reach",
+]
+
+# Goal solvers for inverse questions, checked in order against the tool a message
+# names. The rate is the one number written as a percentage ("7%"); the other
+# numbers fill ``parameters`` in order, at least ``required`` of them, each within
+# its (low, high) range. Solver results are explained by the AI model and never
+# answered from a template.
+CALCULATION_GOALS = {
+    "loan_principal": {
+        "tool": "loan_payment",
+        "description": "Find the loan amount a monthly payment affords",
+        "keywords": ["afford", "how much can i borrow", "how much house"],
+        "solver": "solve_loan_principal",
+        "rate": ("rate", (0, 30)),
+        "parameters": [("monthly_payment", (10, 1e6)), ("years", (1, 50))],
+        "required": 2,
+    },
+    "loan_rate": {
+        "tool": "loan_payment",
+        "description": "Find the interest rate implied by a loan payment",
+        "keywords": ["what rate", "what interest rate"],
+        "solver": "solve_loan_rate",
+        "parameters": [
+            ("principal", (100, 1e8)),
+            ("monthly_payment", (10, 1e6)),
+            ("years", (1, 50)),
+        ],
+        "required": 3,
+    },
+    "loan_term": {
+        "tool": "loan_payment",
+        "description": "Find how long a loan takes to repay",
+        "keywords": ["how long", "how many years", "how many months", "how soon"],
+        "solver": "solve_loan_term",
+        "rate": ("rate", (0, 30)),
+        "parameters": [("principal", (100, 1e8)), ("monthly_payment", (10, 1e6))],
+        "required": 2,
+    },
+    "retirement_years": {
+        "tool": "savings_goal",
+        "description": "Find how long it takes to reach a savings target",
+        "keywords": [
+            "how long",
+            "how many years",
+            "how many months",
+            "how soon",
+            "when will i",
+            "when can i",
+        ],
+        "solver": "solve_retirement_years",
+        "rate": ("annual_return", (0, 15)),
+        "parameters": [
+            ("target", (100, 1e10)),
+            ("monthly_contribution", (1, 1e6)),
+            ("current_savings", (0, 1e10)),
+        ],
+        "required": 2,
+    },
+    "retirement_return": {
+        "tool": "savings_goal",
+        "description": "Find the annual return needed to reach a savings target",
+        "keywords": ["what return", "what rate", "rate of return"],
+        "solver": "solve_retirement_return",
+        "parameters": [
+            ("target", (100, 1e10)),
+            ("monthly_contribution", (1, 1e6)),
+            ("years", (1, 70)),
+            ("current_savings", (0, 1e10)),
+        ],
+        "required": 3,
+    },
+    "monthly_contribution": {
+        "tool": "savings_goal",
+        "description": "Find the monthly contribution needed to reach a savings target",
+        "keywords": ["how much", "to reach"],
+        "solver": "solve_monthly_contribution",
+        "rate": ("annual_return", (0, 15)),
+        "parameters": [("target", (100, 1e10)), ("years", (1, 70)), ("current_savings", (0, 1e10))],
+        "required": 2,
+    },
+}
+
+# Parameters a calculator reads positionally from a message, as (low, high) ranges
+# in order. A calculator answer is served without the AI model only when at least
+# ``required`` numbers are given, none is left unclaimed and each is in range.
+# Rates are checked as percentages and must be written as one ("5%"), except that
+# a tool taking a decimal rate also accepts a decimal ("0.05").
+CALCULATION_PARAMETERS = {
+    "compound_interest": {
+        "required": 3,
+        "ranges": [(1, 1e9), (0.01, 25), (0.1, 100)],
+        "rate_index": 1,
+        "decimal_rate": True,
+    },
+    "loan_payment": {
+        "required": 3,
+        "ranges": [(100, 1e8), (0, 30), (1, 50)],
+        "rate_index": 1,
+    },
+    "retirement_savings": {
+        "required": 3,
+        "ranges": [(1, 1e6), (1, 70), (0, 15), (0, 1e9)],
+        "rate_index": 2,
+    },
+    "savings_goal": {
+        "required": 3,
+        "ranges": [(100, 1e10), (1, 70), (0, 15), (0, 1e10)],
+        "rate_index": 2,
+    },
+    "emergency_fund": {"required": 1, "ranges": [(50, 1e6), (1, 24)]},
+    "income_tax": {"required": 1, "ranges": [(1, 1e9)]},
+    # Debts as (balance, APR %, minimum payment) groups, then the monthly budget
+    "debt_payoff": {
+        "required": 4,
+        "group_ranges": [(1, 1e8), (0, 40), (1, 1e6)],
+        "ranges": [(1, 1e7)],
+    },
+}
+
 # Session Configuration
 SESSION_CONFIG = {
     "max_history_length": 50,
     "session_timeout_hours": 24,
     "auto_save_interval_minutes": 5,
+    "compress_cold_messages": True,
+    "hot_history_entries": 10,
+    "compress_min_chars": 512,
     "default_preferences": {
         "risk_tolerance": "moderate",
         "investment_horizon": "long_term",
@@ -3,8 +3,9 @@ Application settings using pydantic-settings for environment management.
 """
 
 from functools import lru_cache
+from typing import List, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -12,7 +13,46 @@ class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
     # API Configuration
-    google_api_key: str = Field(..., description="Google Gemini API key")
+    google_api_key: str = Field(default="", description="Google Gemini API key")
+    google_api_keys: list[str] = Field(
+        default=[], description="Additional Gemini API keys pooled with google_api_key"
+    )
+
+    # Gemini Key Pool
+    genai_requests_per_minute: float = Field(default=60, description="Request quota per API key")
+    genai_key_burst: float = Field(default=10, description="Requests a key may send in a burst")
+    genai_key_cooldown_seconds: float = Field(
+        default=30.0, description="Base cooldown for a key after a 429, doubled on repeats"
+    )
+
+    # Model Backend (set to "fake" for load tests without the Gemini API)
+    genai_backend: str = Field(default="gemini", description="Model backend: gemini or fake")
+    fake_genai_latency_ms: float = Field(
+        default=800.0, description="Fake backend median latency to the response or first chunk"
+    )
+    fake_genai_latency_distribution: str = Field(
+        default="lognormal",
+        description="Fake latency distribution: fixed, uniform, exponential, lognormal",
+    )
+    fake_genai_latency_sigma: float = Field(
+        default=0.5, description="Fake lognormal latency shape (larger means a longer tail)"
+    )
+    fake_genai_chunk_interval_ms: float = Field(
+        default=40.0, description="Fake backend delay between stream chunks"
+    )
+    fake_genai_chunk_words: int = Field(
+        default=4, description="Fake backend words per stream chunk"
+    )
+    fake_genai_error_rate: float = Field(
+        default=0.0, description="Fraction of fake backend calls failing with a 503"
+    )
+    fake_genai_rate_limit_rate: float = Field(
+        default=0.0, description="Fraction of fake backend calls failing with a 429"
+    )
+    fake_genai_requests_per_minute: int = Field(
+        default=0, description="Per-key quota enforced by the fake backend (0 for none)"
+    )
+    fake_genai_seed: Optional[int] = Field(default=None, description="Fake backend random seed")
 
     # Server Configuration
     host: str = Field(default="0.0.0.0", description="Server host")
@@ -31,6 +71,64 @@ class Settings(BaseSettings):
     session_timeout_hours: int = Field(default=24, description="Session timeout in hours")
     max_history_length: int = Field(default=50, description="Maximum conversation history length")
 
+    # Calculator Fast Path
+    calculation_fast_path: bool = Field(
+        default=True, description="Answer calculator requests from templates without the AI model"
+    )
+    calculation_fast_path_explain: bool = Field(
+        default=True, description="Stream an AI explanation after fast-path answers on /chat/stream"
+    )
+
+    # Semantic Cache
+    semantic_cache_enabled: bool = Field(
+        default=True, description="Serve paraphrased generic questions from the semantic cache"
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.85, description="Minimum cosine similarity for a semantic cache hit"
+    )
+    semantic_cache_capacity: int = Field(
+        default=5000, description="Maximum number of semantic cache entries"
+    )
+
+    # Knowledge Base
+    knowledge_base_enabled: bool = Field(
+        default=True, description="Ground answers with the local knowledge base"
+    )
+    knowledge_index_path: Optional[str] = Field(
+        default=None, description="Precomputed knowledge base index (built at startup if unset)"
+    )
+    knowledge_top_k: int = Field(default=3, description="Passages added to the prompt")
+    knowledge_direct_answer_threshold: float = Field(
+        default=0.75, description="Heading confidence needed to answer without the AI model"
+    )
+
+    # Profiling
+    profiling_enabled: bool = Field(
+        default=False,
+        description="Enable the request profiler, loop lag monitor and admin endpoints",
+    )
+    profiling_sample_rate: float = Field(
+        default=0.0, description="Fraction of requests profiled without the X-Profile header"
+    )
+    profiling_interval_ms: float = Field(default=5.0, description="Stack sampling interval")
+    profiling_slow_request_ms: float = Field(
+        default=2000.0,
+        description="Capture stacks of requests running longer than this (0 disables)",
+    )
+    profiling_loop_lag_interval_ms: float = Field(
+        default=100.0, description="Event-loop lag probe interval (0 disables the monitor)"
+    )
+    profiling_loop_stall_ms: float = Field(
+        default=250.0, description="Event-loop lag that triggers a stack capture"
+    )
+    profiling_max_profiles: int = Field(
+        default=50, description="Finished profiles kept for download"
+    )
+    admin_token: Optional[str] = Field(
+        default=None,
+        description="Token required in X-Admin-Token for admin endpoints (unset disables them)",
+    )
+
     # Logging
     log_level: str = Field(default="INFO", description="Logging level")
 
@@ -41,6 +139,20 @@ class Settings(BaseSettings):
         "extra": "ignore",
     }
 
+    @model_validator(mode="after")
+    def _require_api_key(self) -> "Settings":
+        """Ensure at least one Gemini API key is configured."""
+        if not self.api_keys:
+            raise ValueError("Set GOOGLE_API_KEY or GOOGLE_API_KEYS")
+        return self
+
+    @property
+    def api_keys(self) -> List[str]:
+        """All configured Gemini API keys, without duplicates."""
+        return list(
+            dict.fromkeys(key for key in [self.google_api_key, *self.google_api_keys] if key)
+        )
+
     @property
     def is_production(self) -> bool:
         """Check if running in production environment."""
@@ -7,6 +7,10 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from .api.admin import admin_router, profiler
+from .api.auth import is_admin
+from .api.middleware import ProfilingMiddleware
+from .api.responses import FastJSONResponse
 from .api.routes import router
 from .config.settings import settings
 from .utils.logger import logger
@@ -16,10 +20,21 @@ app = FastAPI(
     title="FinAI - Financial Advisor",
     description="AI-powered financial advisor agent built with FastAPI and Google Gemini",
     version="2.0.0",
+    default_response_class=FastJSONResponse,
 )
 
 # Include API routes
 app.include_router(router)
+app.include_router(admin_router)
+
+# Profile on demand, by sampling and when slow; not installed at all when disabled
+if profiler is not None:
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiler=profiler,
+        sample_rate=settings.profiling_sample_rate,
+        authorize=is_admin,
+    )
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -30,12 +45,16 @@ async def startup_event():
     """Application startup handler."""
     logger.info(f"Starting FinAI in {settings.environment} mode")
     logger.info(f"Server running on {settings.host}:{settings.port}")
+    if profiler is not None:
+        profiler.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown handler."""
     logger.info("Shutting down FinAI")
+    if profiler is not None:
+        await profiler.stop()
 
 
 def run():
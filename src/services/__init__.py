@@ -1,5 +1,16 @@
 # Services module
 from .genai_service import GenAIService
-from .session_service import SessionService
+from .key_pool import KeyPool
+from .knowledge_service import KnowledgeBase
+from .semantic_cache import SemanticCache
+from .session_service import ConversationEntry, SessionRecord, SessionService
 
-__all__ = ["SessionService", "GenAIService"]
+__all__ = [
+    "SessionService",
+    "SessionRecord",
+    "ConversationEntry",
+    "GenAIService",
+    "KeyPool",
+    "SemanticCache",
+    "KnowledgeBase",
+]
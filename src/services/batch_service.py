@@ -0,0 +1,151 @@
+"""
+Batch chat service.
+Runs many chat requests through the chat pipeline with bounded concurrency,
+for offline evaluation and back-office replay jobs.
+
+Run a JSON Lines file of ChatRequest-shaped items with:
+    python -m src.services.batch_service requests.jsonl --output results.ndjson
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from ..utils.logger import logger
+from ..utils.serialization import ndjson_line
+from .chat_service import ChatService, ChatTurn
+from .session_service import SessionService
+
+
+def _turn_key(turn: ChatTurn, preferences: Optional[Dict]) -> str:
+    """Key identifying turns that would send the model the same prompt."""
+    payload = json.dumps(
+        [
+            turn.history,
+            preferences or {},
+            turn.session.financial_profile,
+            len(turn.session.conversation_history),
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def run_batch(
+    chat_service: ChatService,
+    items: List[Dict],
+    concurrency: int = 8,
+    isolate_sessions: bool = True,
+) -> AsyncIterator[Dict]:
+    """
+    Run chat requests concurrently and yield results in completion order.
+
+    Identical prompts are sent to the model once and the answer is shared.
+
+    Args:
+        chat_service: Chat pipeline to run the items through
+        items: Dicts with ``history`` and optional ``session_id`` and ``user_preferences``
+        concurrency: Maximum number of items processed at once
+        isolate_sessions: Record turns in a private session store instead of
+            the service's live one
+
+    Yields:
+        Result dicts with the item ``index``, ``status``, ``result`` or
+        ``error``, ``deduplicated``, ``queue_ms`` and ``elapsed_ms``
+    """
+    if isolate_sessions:
+        chat_service = chat_service.with_session_service(SessionService())
+
+    semaphore = asyncio.Semaphore(concurrency)
+    generations: Dict[str, asyncio.Future] = {}
+
+    async def run_item(index: int, item: Dict) -> Dict:
+        submitted = time.perf_counter()
+        async with semaphore:
+            started = time.perf_counter()
+            outcome = {"index": index, "deduplicated": False}
+            try:
+                turn = chat_service.prepare_turn(
+                    item["history"], item.get("session_id"), item.get("user_preferences")
+                )
+                if turn.response_text is None:
+                    key = _turn_key(turn, item.get("user_preferences"))
+                    generation = generations.get(key)
+                    if generation is None:
+                        generation = asyncio.ensure_future(
+                            chat_service.genai_service.generate_response(
+                                chat_service.build_prompt(turn)
+                            )
+                        )
+                        generations[key] = generation
+                    else:
+                        outcome["deduplicated"] = True
+                    turn.response_text = await asyncio.shield(generation)
+
+                outcome["status"] = "ok"
+                outcome["result"] = await chat_service.complete_turn(turn)
+            except Exception as e:
+                outcome["status"] = "error"
+                outcome["error"] = str(e)
+
+            finished = time.perf_counter()
+            outcome["queue_ms"] = round((started - submitted) * 1000, 3)
+            outcome["elapsed_ms"] = round((finished - started) * 1000, 3)
+            return outcome
+
+    tasks = [asyncio.ensure_future(run_item(i, item)) for i, item in enumerate(items)]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        for task in tasks:
+            task.cancel()
+        for generation in generations.values():
+            generation.cancel()
+
+
+async def _run_file(args: argparse.Namespace) -> None:
+    """Run a JSON Lines batch file and write NDJSON results."""
+    from ..api.routes import chat_service
+
+    with open(args.input, encoding="utf-8") as f:
+        items = [json.loads(line) for line in f if line.strip()]
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    start = time.perf_counter()
+    errors = 0
+    try:
+        async for result in run_batch(
+            chat_service, items, args.concurrency, not args.shared_sessions
+        ):
+            errors += result["status"] == "error"
+            output.write(ndjson_line(result))
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Batch of {len(items)} items finished in {elapsed:.2f}s with {errors} errors")
+
+
+def main() -> None:
+    """Command line entry point for batch runs."""
+    parser = argparse.ArgumentParser(description="Run chat requests in batch")
+    parser.add_argument("input", help="JSON Lines file of ChatRequest-shaped items")
+    parser.add_argument("--output", help="NDJSON results file (defaults to stdout)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--shared-sessions",
+        action="store_true",
+        help="Record turns in the live session store instead of an isolated one",
+    )
+    asyncio.run(_run_file(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Chat pipeline service.
+Turns a conversation history into a response using tools, the knowledge base,
+the semantic cache and the AI model, and records the turn in the session.
+"""
+
+import copy
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional
+
+from ..agent import FinancialAgent
+from ..utils.logger import logger
+from ..utils.serialization import json_dumps_str
+from .genai_service import GenAIService
+from .knowledge_service import KnowledgeBase
+from .semantic_cache import SemanticCache
+from .session_service import SessionRecord, SessionService
+
+# Confidence reported for each way a turn can be answered
+CONFIDENCE = {
+    "calculation": 0.95,
+    "model_with_calculation": 0.9,
+    "default": 0.8,
+}
+
+
+class ChatTurn:
+    """State for a single chat turn while it moves through the pipeline."""
+
+    __slots__ = (
+        "session_id",
+        "session",
+        "history",
+        "latest_message",
+        "calculation_tool",
+        "calculation_result",
+        "tools_used",
+        "cacheable",
+        "response_text",
+        "source",
+        "timings",
+    )
+
+    def __init__(self, session_id: str, session: SessionRecord, history: List[str]):
+        self.session_id = session_id
+        self.session = session
+        self.history = history
+        self.latest_message = history[-1] if history else ""
+        self.calculation_tool: Optional[str] = None
+        self.calculation_result: Optional[Dict] = None
+        self.tools_used: List[str] = []
+        self.cacheable = False
+        self.response_text: Optional[str] = None
+        self.source = "model"
+        # Milliseconds spent in each pipeline stage
+        self.timings: Dict[str, float] = {}
+
+    @property
+    def confidence(self) -> float:
+        """Get the confidence for the way this turn was answered."""
+        if self.source == "calculation":
+            return CONFIDENCE["calculation"]
+        if self.calculation_result:
+            return CONFIDENCE["model_with_calculation"]
+        return CONFIDENCE["default"]
+
+    def server_timing(self) -> str:
+        """Format stage timings and the answer source as a Server-Timing header value."""
+        metrics = [f"{stage};dur={ms:.3f}" for stage, ms in self.timings.items()]
+        metrics.append(f'source;desc="{self.source}"')
+        return ", ".join(metrics)
+
+
+class ChatService:
+    """
+    Service running the chat pipeline for one or more conversations.
+
+    A turn is first resolved locally where possible (deterministic calculator
+    answers, knowledge base matches, semantic cache hits) and only falls back
+    to the AI model when needed.
+    """
+
+    def __init__(
+        self,
+        session_service: SessionService,
+        genai_service: GenAIService,
+        agent: FinancialAgent,
+        semantic_cache: Optional[SemanticCache] = None,
+        knowledge_base: Optional[KnowledgeBase] = None,
+        calculation_fast_path: bool = True,
+        explain_calculations: bool = True,
+        knowledge_top_k: int = 3,
+        knowledge_direct_answer_threshold: float = 0.75,
+    ):
+        """
+        Initialize the chat service.
+
+        Args:
+            session_service: Session storage
+            genai_service: AI model service
+            agent: Financial agent providing tools and context
+            semantic_cache: Optional cache for generic questions
+            knowledge_base: Optional knowledge base for grounding and direct answers
+            calculation_fast_path: Answer calculator turns from templates without the model
+            explain_calculations: Stream a model explanation after fast-path answers
+            knowledge_top_k: Passages added to the prompt
+            knowledge_direct_answer_threshold: Heading confidence for direct answers
+        """
+        self.session_service = session_service
+        self.genai_service = genai_service
+        self.agent = agent
+        self.semantic_cache = semantic_cache
+        self.knowledge_base = knowledge_base
+        self.calculation_fast_path = calculation_fast_path
+        self.explain_calculations = explain_calculations
+        self.knowledge_top_k = knowledge_top_k
+        self.knowledge_direct_answer_threshold = knowledge_direct_answer_threshold
+        # Prefix for generation keys, set on copies with their own session store
+        self._generation_scope: Optional[str] = None
+
+    def with_session_service(self, session_service: SessionService) -> "ChatService":
+        """
+        Get a copy of this service that records turns in another session store.
+
+        Session IDs in the copy refer to its own sessions, so its model calls
+        never supersede, and are never superseded by, calls for the same
+        session ID in this service.
+
+        Args:
+            session_service: Session storage for the copy
+
+        Returns:
+            ChatService sharing everything except session storage
+        """
+        service = copy.copy(self)
+        service.session_service = session_service
+        service._generation_scope = uuid.uuid4().hex
+        return service
+
+    def generation_key(self, session_id: str) -> str:
+        """
+        Get the key identifying a session's model calls in the shared GenAIService.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The session ID, scoped to this service's session store for copies
+        """
+        if self._generation_scope is None:
+            return session_id
+        return f"{self._generation_scope}:{session_id}"
+
+    def prepare_turn(
+        self,
+        history: List[str],
+        session_id: Optional[str] = None,
+        preferences: Optional[Dict] = None,
+    ) -> ChatTurn:
+        """
+        Prepare a turn and resolve it locally where possible.
+
+        Args:
+            history: Conversation history, latest user message last
+            session_id: Optional session identifier (generated if omitted)
+            preferences: Optional user preferences
+
+        Returns:
+            ChatTurn, with ``response_text`` set if no model call is needed
+        """
+        started = time.perf_counter()
+        if session_id:
+            # A newer turn supersedes any model call still running for the session,
+            # even if this turn is answered locally
+            self.genai_service.cancel(self.generation_key(session_id), "superseded")
+        session_id = session_id or str(uuid.uuid4())
+        session = self.session_service.get_or_create_session(
+            session_id=session_id, preferences=preferences
+        )
+        turn = ChatTurn(session_id, session, history)
+
+        # Check for calculation requests
+        parameters_valid = False
+        calculation_request = self.agent.detect_calculation_request(turn.latest_message)
+        if calculation_request:
+            numbers = self.agent.extract_numbers(turn.latest_message)
+            if numbers and calculation_request.get("goal"):
+                # Goal solver results are explained by the model, never templated
+                turn.calculation_tool = calculation_request["tool"]
+                turn.calculation_result = self.agent.execute_goal(
+                    calculation_request["goal"], numbers, turn.latest_message
+                )
+                turn.tools_used.append(calculation_request["description"])
+            elif numbers:
+                turn.calculation_tool = calculation_request["tool"]
+                turn.calculation_result = self.agent.execute_tool(
+                    turn.calculation_tool, numbers, turn.latest_message
+                )
+                turn.tools_used.append(calculation_request["description"])
+                parameters_valid = self.agent.validate_parameters(
+                    turn.calculation_tool, numbers, turn.latest_message
+                )
+
+        # Positionally parsed numbers are only trusted without the model when they fit the tool
+        if turn.calculation_result and parameters_valid and self.calculation_fast_path:
+            turn.response_text = self.agent.render_calculation(
+                turn.calculation_tool, turn.calculation_result
+            )
+            if turn.response_text is not None:
+                turn.source = "calculation"
+                return self._timed(turn, "prepare", started)
+
+        # Generic first-turn questions can be answered without the AI model
+        turn.cacheable = not turn.tools_used and SemanticCache.is_cacheable(
+            history, preferences, session.financial_profile
+        )
+        if turn.cacheable and self.knowledge_base is not None:
+            passage = self.knowledge_base.direct_answer(
+                turn.latest_message, self.knowledge_direct_answer_threshold
+            )
+            if passage is not None:
+                turn.response_text = KnowledgeBase.format_answer(passage)
+                turn.source = "knowledge"
+                return self._timed(turn, "prepare", started)
+
+        if turn.cacheable and self.semantic_cache is not None:
+            turn.response_text = self.semantic_cache.get(turn.latest_message)
+            if turn.response_text is not None:
+                turn.source = "cache"
+
+        return self._timed(turn, "prepare", started)
+
+    def build_prompt(self, turn: ChatTurn) -> str:
+        """
+        Build the full model prompt for a turn.
+
+        Args:
+            turn: Prepared chat turn
+
+        Returns:
+            Prompt with agent context, tool results or references, and history
+        """
+        context = self.agent.get_enhanced_context(turn.session)
+
+        # Add calculation results to context if available
+        if turn.calculation_result and "error" not in turn.calculation_result:
+            context += f"\n\nCALCULATION RESULT:\n{json_dumps_str(turn.calculation_result)}\n\nPlease explain these results to the user in a clear, educational manner."
+        elif self.knowledge_base is not None:
+            context += KnowledgeBase.format_context(
+                self.knowledge_base.search(turn.latest_message, self.knowledge_top_k)
+            )
+
+        # Combine context with conversation history
+        return context + "\n\nCONVERSATION HISTORY:\n" + "\n".join(turn.history)
+
+    async def complete_turn(self, turn: ChatTurn) -> Dict:
+        """
+        Complete a turn, calling the AI model if it was not resolved locally.
+
+        Args:
+            turn: Prepared chat turn
+
+        Returns:
+            Dictionary with response, session_id, tools_used and confidence
+
+        Raises:
+            GenerationCancelled: If a newer turn for the session superseded this one;
+                the turn is then not recorded
+        """
+        if turn.response_text is None:
+            started = time.perf_counter()
+            prompt = self.build_prompt(turn)
+            self._timed(turn, "prompt", started)
+
+            # A newer turn for the same session cancels this call
+            started = time.perf_counter()
+            turn.response_text = await self.genai_service.generate_response(
+                prompt, generation_key=self.generation_key(turn.session_id)
+            )
+            self._timed(turn, "model", started)
+            self._cache_response(turn)
+
+        started = time.perf_counter()
+        self._record_turn(turn)
+        self._timed(turn, "record", started)
+        return self._response_fields(turn)
+
+    async def stream_turn(self, turn: ChatTurn) -> AsyncIterator[Dict]:
+        """
+        Complete a turn as a stream of events.
+
+        Locally resolved turns emit a ``response`` event immediately; fast-path
+        calculator answers are then followed by ``delta`` events carrying a
+        model explanation if enabled. Model answers are streamed as ``delta``
+        events. Every stream ends with a ``done`` event, which also carries the
+        answer source and per-stage timings in milliseconds.
+
+        If the model call is cancelled, the turn is not recorded and the
+        partial answer is discarded.
+
+        Args:
+            turn: Prepared chat turn
+
+        Yields:
+            Event dictionaries with a ``type`` key
+        """
+        stream_model = turn.response_text is None or (
+            turn.source == "calculation" and self.explain_calculations
+        )
+
+        parts = []
+        if turn.response_text is not None:
+            parts.append(turn.response_text)
+            yield {"type": "response", **self._response_fields(turn)}
+            if stream_model:
+                parts.append("\n\n")
+                yield {"type": "delta", "text": "\n\n"}
+
+        if stream_model:
+            started = time.perf_counter()
+            prompt = self.build_prompt(turn)
+            self._timed(turn, "prompt", started)
+
+            started = time.perf_counter()
+            async for chunk in self.genai_service.generate_response_stream(
+                prompt, generation_key=self.generation_key(turn.session_id)
+            ):
+                if "model_first_chunk" not in turn.timings:
+                    self._timed(turn, "model_first_chunk", started)
+                parts.append(chunk)
+                yield {"type": "delta", "text": chunk}
+            self._timed(turn, "model", started)
+
+        if turn.response_text is None:
+            turn.response_text = "".join(parts)
+            self._cache_response(turn)
+        else:
+            turn.response_text = "".join(parts)
+
+        started = time.perf_counter()
+        self._record_turn(turn)
+        self._timed(turn, "record", started)
+        fields = self._response_fields(turn)
+        del fields["response"]
+        yield {"type": "done", **fields, "source": turn.source, "timings": turn.timings}
+
+    @staticmethod
+    def _timed(turn: ChatTurn, stage: str, started: float) -> ChatTurn:
+        """Record the time since ``started`` as a pipeline stage of a turn."""
+        turn.timings[stage] = (time.perf_counter() - started) * 1000
+        return turn
+
+    def _cache_response(self, turn: ChatTurn) -> None:
+        """Store a model answer for a generic question in the semantic cache."""
+        if turn.cacheable and self.semantic_cache is not None:
+            self.semantic_cache.put(turn.latest_message, turn.response_text)
+
+    def _record_turn(self, turn: ChatTurn) -> None:
+        """Add the completed turn to the session history."""
+        self.session_service.add_conversation_entry(
+            session_id=turn.session_id,
+            user_message=turn.latest_message,
+            ai_response=turn.response_text,
+            tools_used=turn.tools_used,
+        )
+        logger.info(
+            f"Chat processed for session {turn.session_id}, "
+            f"source: {turn.source}, tools: {turn.tools_used}"
+        )
+
+    @staticmethod
+    def _response_fields(turn: ChatTurn) -> Dict:
+        """Get the ChatResponse fields for a turn."""
+        return {
+            "response": turn.response_text,
+            "session_id": turn.session_id,
+            "tools_used": turn.tools_used,
+            "confidence": turn.confidence,
+        }
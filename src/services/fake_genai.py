@@ -0,0 +1,223 @@
+"""
+Local fake of the Gemini model client.
+Mirrors the parts of ``google.generativeai.GenerativeModel`` that GenAIService
+uses, with configurable latency, streaming cadence, error rates and a per-key
+request quota, so the service can be load tested without network access or
+real keys. Select it with ``GENAI_BACKEND=fake``.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional
+
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+DEFAULT_REPLY = """## Here's how to think about it
+
+Start with the fundamentals: know where your money goes each month, keep an **emergency fund**
+of three to six months of expenses, and pay down high-interest debt before investing aggressively.
+
+- **Budget**: track spending and set targets by category
+- **Save**: automate transfers on payday
+- **Invest**: favor low-cost diversified funds for long-term goals
+
+> **Important**: This is educational information only. Please consult a qualified professional."""
+
+
+class FakeQuota:
+    """Sliding one-minute request window per API key, shared by all fake clients."""
+
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self._calls: Dict[str, Deque[float]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def check(self, key: str) -> None:
+        """
+        Record a request for a key.
+
+        Raises:
+            ResourceExhausted: If the key already used its quota in the last minute
+        """
+        now = time.monotonic()
+        with self._lock:
+            calls = self._calls[key]
+            while calls and now - calls[0] >= 60:
+                calls.popleft()
+            if len(calls) >= self.requests_per_minute:
+                raise ResourceExhausted(f"Quota exceeded for key ...{key[-4:]}")
+            calls.append(now)
+
+
+class LatencyModel:
+    """Samples latencies in seconds from a named distribution."""
+
+    def __init__(
+        self,
+        median_ms: float = 0.0,
+        distribution: str = "fixed",
+        sigma: float = 0.5,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the latency model.
+
+        Args:
+            median_ms: Median latency
+            distribution: fixed, uniform (0 to 2x median), exponential or lognormal
+            sigma: Shape of the lognormal distribution (larger means a longer tail)
+            seed: Optional random seed for reproducible runs
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {distribution!r}")
+        self.median = median_ms / 1000
+        self.distribution = distribution
+        self.sigma = sigma
+        self._random = random.Random(seed)
+
+    def sample(self) -> float:
+        """Draw one latency in seconds."""
+        if self.median <= 0 or self.distribution == "fixed":
+            return max(self.median, 0.0)
+        if self.distribution == "uniform":
+            return self._random.uniform(0, 2 * self.median)
+        if self.distribution == "exponential":
+            return self._random.expovariate(math.log(2) / self.median)
+        return self._random.lognormvariate(math.log(self.median), self.sigma)
+
+
+class FakeResponse:
+    """Response or stream chunk with a ``text`` attribute."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeStream:
+    """Async iterable of response chunks delivered at a fixed cadence."""
+
+    def __init__(self, chunks: List[str], interval: float = 0.0):
+        self._chunks = chunks
+        self._interval = interval
+
+    async def __aiter__(self) -> AsyncIterator[FakeResponse]:
+        for i, chunk in enumerate(self._chunks):
+            await asyncio.sleep(self._interval if i else 0)
+            yield FakeResponse(chunk)
+
+
+class FakeGenerativeModel:
+    """Fake model client bound to one API key."""
+
+    def __init__(
+        self,
+        key: str,
+        quota: Optional[FakeQuota] = None,
+        reply: str = DEFAULT_REPLY,
+        latency: Optional[LatencyModel] = None,
+        chunk_interval_ms: float = 0.0,
+        chunk_words: int = 4,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the fake client.
+
+        Args:
+            key: API key the client is bound to
+            quota: Optional shared per-key quota to enforce
+            reply: Text returned for every prompt
+            latency: Time to the full response, or to the first chunk when streaming
+            chunk_interval_ms: Delay between stream chunks
+            chunk_words: Words per stream chunk
+            error_rate: Fraction of calls failing with a 503
+            rate_limit_rate: Fraction of calls failing with a 429, on top of the quota
+            seed: Optional random seed for reproducible runs
+        """
+        self.key = key
+        self.quota = quota
+        self.reply = reply
+        self.latency = latency or LatencyModel()
+        self.chunk_interval = chunk_interval_ms / 1000
+        self.chunk_words = max(chunk_words, 1)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+
+    def _check(self) -> None:
+        """Apply the quota and injected failures."""
+        if self.quota is not None:
+            self.quota.check(self.key)
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            raise ResourceExhausted("Simulated rate limit")
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise ServiceUnavailable("Simulated upstream error")
+
+    def _chunks(self) -> List[str]:
+        """Split the reply into stream chunks of whole words."""
+        words = self.reply.split(" ")
+        chunks = [
+            " ".join(words[i : i + self.chunk_words])
+            for i in range(0, len(words), self.chunk_words)
+        ]
+        return [chunk + " " for chunk in chunks[:-1]] + chunks[-1:]
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        """Return the canned reply after a sampled latency."""
+        self._check()
+        time.sleep(self.latency.sample())
+        return FakeResponse(self.reply)
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        """Return the canned reply, or a stream of its chunks, after a sampled latency."""
+        self._check()
+        await asyncio.sleep(self.latency.sample())
+        if stream:
+            return FakeStream(self._chunks(), self.chunk_interval)
+        return FakeResponse(self.reply)
+
+
+def fake_model_factory(settings) -> Callable[[str], FakeGenerativeModel]:
+    """
+    Create a model factory for GenAIService from the ``fake_genai_*`` settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Callable creating a fake client for an API key
+    """
+    quota = (
+        FakeQuota(settings.fake_genai_requests_per_minute)
+        if settings.fake_genai_requests_per_minute > 0
+        else None
+    )
+
+    def create(key: str) -> FakeGenerativeModel:
+        return FakeGenerativeModel(
+            key,
+            quota=quota,
+            latency=LatencyModel(
+                settings.fake_genai_latency_ms,
+                settings.fake_genai_latency_distribution,
+                settings.fake_genai_latency_sigma,
+                settings.fake_genai_seed,
+            ),
+            chunk_interval_ms=settings.fake_genai_chunk_interval_ms,
+            chunk_words=settings.fake_genai_chunk_words,
+            error_rate=settings.fake_genai_error_rate,
+            rate_limit_rate=settings.fake_genai_rate_limit_rate,
+            seed=settings.fake_genai_seed,
+        )
+
+    return create
@@ -3,12 +3,53 @@ Google Gemini AI service wrapper.
 Handles AI model initialization and response generation.
 """
 
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
 import google.generativeai as genai
+from google.api_core.exceptions import TooManyRequests
+from google.generativeai import client as genai_client
 
 from ..config import API_CONFIG
 from ..config.settings import settings
-from ..utils.exceptions import AIServiceError
+from ..utils.exceptions import AIServiceError, ConfigurationError, GenerationCancelled
 from ..utils.logger import logger
+from ..utils.metrics import metrics
+from .fake_genai import fake_model_factory
+from .key_pool import KeyPool
+
+# Stream queue markers for the end of a response and a cancelled generation
+_STREAM_END = object()
+_STREAM_CANCELLED = object()
+
+
+class Generation:
+    """An in-flight model call, run as a task so it can be cancelled."""
+
+    __slots__ = ("task", "cancel_reason")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.cancel_reason: Optional[str] = None
+
+    def cancel(self, reason: str) -> bool:
+        """
+        Cancel the model call if it is still running.
+
+        A call already cancelled along with its awaiting caller is recorded too.
+
+        Args:
+            reason: Why the generation is cancelled, counted in metrics
+
+        Returns:
+            True if the call was running and is now cancelled
+        """
+        if self.cancel_reason is not None or (self.task.done() and not self.task.cancelled()):
+            return False
+        self.cancel_reason = reason
+        self.task.cancel()
+        metrics.increment(f"generations_cancelled_{reason}")
+        return True
 
 
 class GenAIService:
@@ -16,42 +57,219 @@ class GenAIService:
     Service wrapper for Google Gemini AI.
 
     Provides a clean interface for AI interactions with
-    error handling and logging.
+    error handling and logging. Requests are spread over a pool
+    of API keys and retried on another key when one is rate limited.
+
+    Calls made with a ``generation_key`` (the chat session ID) are tracked, so
+    a newer call with the same key cancels the one it supersedes.
     """
 
-    def __init__(self):
-        """Initialize the Gemini AI service."""
-        self._configure_api()
-        self._model = genai.GenerativeModel(API_CONFIG["model"])
-        logger.info(f"GenAI service initialized with model: {API_CONFIG['model']}")
+    def __init__(
+        self,
+        api_keys: Optional[List[str]] = None,
+        model_factory: Optional[Callable[[str], Any]] = None,
+        pool: Optional[KeyPool] = None,
+    ):
+        """
+        Initialize the Gemini AI service.
 
-    def _configure_api(self) -> None:
-        """Configure the Gemini API with credentials."""
+        Args:
+            api_keys: API keys to pool (defaults to the configured keys)
+            model_factory: Creates a model client for a key (defaults to the
+                configured backend)
+            pool: Ready-made key pool, replacing ``api_keys`` and ``model_factory``
+                (defaults to a pool with the configured quota)
+        """
+        if pool is None:
+            if model_factory is None:
+                if settings.genai_backend == "fake":
+                    model_factory = fake_model_factory(settings)
+                elif settings.genai_backend == "gemini":
+                    model_factory = self._create_model
+                else:
+                    raise ConfigurationError(f"Unknown model backend {settings.genai_backend!r}")
+            pool = KeyPool(
+                api_keys or settings.api_keys,
+                model_factory,
+                requests_per_minute=settings.genai_requests_per_minute,
+                burst=settings.genai_key_burst,
+                cooldown_seconds=settings.genai_key_cooldown_seconds,
+                max_wait_seconds=API_CONFIG["timeout_seconds"],
+            )
+        self._pool = pool
+        self._generations: Dict[str, Generation] = {}
+        logger.info(
+            f"GenAI service initialized with model: {API_CONFIG['model']} "
+            f"and {len(self._pool.keys)} API key(s), backend: {settings.genai_backend}"
+        )
+
+    @staticmethod
+    def _create_model(api_key: str) -> genai.GenerativeModel:
+        """
+        Create a Gemini model whose clients are bound to one API key.
+
+        ``genai.configure`` sets a single process-wide key, so each model gets
+        its own client manager instead. The SDK has no public API for this:
+        ``_ClientManager`` and the model's ``_client``/``_async_client``
+        attributes are private, which is why requirements.txt pins
+        google-generativeai to the 0.8 series. Check them before raising the pin.
+        """
         try:
-            genai.configure(api_key=settings.google_api_key)
+            manager = genai_client._ClientManager()
+            manager.configure(api_key=api_key)
+            model = genai.GenerativeModel(API_CONFIG["model"])
+            model._client = manager.make_client("generative")
+            model._async_client = manager.make_client("generative_async")
         except Exception as e:
             logger.error(f"Failed to configure Gemini API: {str(e)}")
             raise AIServiceError("Failed to initialize AI service. Check API key configuration.")
+        return model
+
+    def _start(self, generation_key: Optional[str], call: Awaitable) -> Generation:
+        """Run a model call as a task, superseding the previous call with the same key."""
+        if generation_key is not None:
+            self.cancel(generation_key, "superseded")
+        generation = Generation(asyncio.ensure_future(call))
+        if generation_key is not None:
+            self._generations[generation_key] = generation
+            generation.task.add_done_callback(lambda _: self._forget(generation_key, generation))
+        return generation
+
+    def _forget(self, generation_key: str, generation: Generation) -> None:
+        """Drop a finished generation unless a newer one took its key."""
+        if self._generations.get(generation_key) is generation:
+            del self._generations[generation_key]
+
+    def cancel(self, generation_key: str, reason: str = "cancelled") -> bool:
+        """
+        Cancel the in-flight generation for a key.
 
-    async def generate_response(self, prompt: str) -> str:
+        Args:
+            generation_key: Key the generation was started with
+            reason: Why it is cancelled, counted in metrics
+
+        Returns:
+            True if a running generation was cancelled
+        """
+        generation = self._generations.pop(generation_key, None)
+        if generation is None or not generation.cancel(reason):
+            return False
+        logger.info(f"Generation for {generation_key} cancelled: {reason}")
+        return True
+
+    async def generate_response(self, prompt: str, generation_key: Optional[str] = None) -> str:
         """
         Generate a response from the AI model.
 
         Args:
             prompt: The prompt to send to the model
+            generation_key: Optional key; a newer call with the same key cancels this one
 
         Returns:
             Generated response text
 
         Raises:
             AIServiceError: If response generation fails
+            GenerationCancelled: If a newer call superseded this one
+        """
+        generation = self._start(generation_key, self._generate(prompt))
+        try:
+            return await generation.task
+        except asyncio.CancelledError:
+            if generation.cancel_reason is None:
+                # The caller itself was cancelled, e.g. because the client went away
+                generation.cancel("disconnected")
+                raise
+            raise GenerationCancelled(generation.cancel_reason)
+
+    async def _generate(self, prompt: str) -> str:
+        """Call the model, retrying on another key when one is rate limited."""
+        for _ in range(API_CONFIG["retry_attempts"]):
+            try:
+                async with self._pool.lease() as key:
+                    response = await key.model.generate_content_async(prompt)
+                    return response.text
+            except TooManyRequests:
+                continue
+            except AIServiceError:
+                raise
+            except Exception as e:
+                logger.error(f"AI generation error: {str(e)}")
+                raise AIServiceError(f"Failed to generate response: {str(e)}")
+        raise AIServiceError("Failed to generate response: all API keys are rate limited")
+
+    async def generate_response_stream(
+        self, prompt: str, generation_key: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response from the AI model as a stream of text chunks.
+
+        The upstream stream is read by a separate task, so it is cancelled
+        when this generator is closed early or superseded by a newer call.
+
+        Args:
+            prompt: The prompt to send to the model
+            generation_key: Optional key; a newer call with the same key cancels this one
+
+        Yields:
+            Response text chunks as they arrive
+
+        Raises:
+            AIServiceError: If response generation fails
+            GenerationCancelled: If a newer call superseded this one
         """
+        queue: asyncio.Queue = asyncio.Queue()
+        generation = self._start(generation_key, self._pump_stream(prompt, queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    return
+                if item is _STREAM_CANCELLED:
+                    raise GenerationCancelled(generation.cancel_reason or "cancelled")
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            generation.cancel("disconnected")
+
+    async def _pump_stream(self, prompt: str, queue: asyncio.Queue) -> None:
+        """Copy upstream stream chunks, errors and the end of the stream into a queue."""
         try:
-            response = self._model.generate_content(prompt)
-            return response.text
+            async for chunk in self._stream(prompt):
+                queue.put_nowait(chunk)
+            queue.put_nowait(_STREAM_END)
+        except asyncio.CancelledError:
+            queue.put_nowait(_STREAM_CANCELLED)
+            raise
         except Exception as e:
-            logger.error(f"AI generation error: {str(e)}")
-            raise AIServiceError(f"Failed to generate response: {str(e)}")
+            queue.put_nowait(e)
+
+    async def _stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream from the model, retrying a rate limit on another key only
+        before the first chunk arrives.
+        """
+        for _ in range(API_CONFIG["retry_attempts"]):
+            started = False
+            try:
+                async with self._pool.lease() as key:
+                    response = await key.model.generate_content_async(prompt, stream=True)
+                    async for chunk in response:
+                        if chunk.text:
+                            started = True
+                            yield chunk.text
+                return
+            except TooManyRequests as e:
+                if started:
+                    logger.error(f"AI streaming error: {str(e)}")
+                    raise AIServiceError(f"Failed to generate response: {str(e)}")
+            except AIServiceError:
+                raise
+            except Exception as e:
+                logger.error(f"AI streaming error: {str(e)}")
+                raise AIServiceError(f"Failed to generate response: {str(e)}")
+        raise AIServiceError("Failed to generate response: all API keys are rate limited")
 
     def generate_response_sync(self, prompt: str) -> str:
         """
@@ -63,12 +281,22 @@ class GenAIService:
         Returns:
             Generated response text
         """
-        try:
-            response = self._model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            logger.error(f"AI generation error: {str(e)}")
-            raise AIServiceError(f"Failed to generate response: {str(e)}")
+        for _ in range(API_CONFIG["retry_attempts"]):
+            try:
+                with self._pool.lease_nowait() as key:
+                    return key.model.generate_content(prompt).text
+            except TooManyRequests:
+                continue
+            except AIServiceError:
+                raise
+            except Exception as e:
+                logger.error(f"AI generation error: {str(e)}")
+                raise AIServiceError(f"Failed to generate response: {str(e)}")
+        raise AIServiceError("Failed to generate response: all API keys are rate limited")
+
+    def key_usage(self) -> List[Dict]:
+        """Get per-key usage, remaining quota and cooldowns."""
+        return self._pool.usage()
 
     @property
     def model_name(self) -> str:
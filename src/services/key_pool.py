@@ -0,0 +1,272 @@
+"""
+API key pool with per-key token buckets.
+Spreads model requests across several Gemini API keys by remaining quota and
+cools keys down when the upstream API rate limits them.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from google.api_core.exceptions import TooManyRequests
+
+from ..utils.exceptions import AIServiceError
+from ..utils.logger import logger
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            capacity: Maximum tokens (burst size)
+            rate: Tokens added per second
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> float:
+        """Add tokens accrued since the last update and return the balance."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def seconds_until_token(self, now: float) -> float:
+        """Time until at least one token is available."""
+        missing = 1 - self.refill(now)
+        return max(missing / self.rate, 0.0) if self.rate > 0 else float("inf")
+
+
+class KeyState:
+    """One API key with its quota, cooldown, client and usage counters."""
+
+    __slots__ = (
+        "key",
+        "label",
+        "bucket",
+        "cooldown_until",
+        "consecutive_rate_limits",
+        "in_flight",
+        "requests",
+        "successes",
+        "rate_limited",
+        "errors",
+        "cancelled",
+        "_model",
+        "_model_factory",
+    )
+
+    def __init__(self, key: str, bucket: TokenBucket, model_factory: Callable[[str], Any]):
+        self.key = key
+        self.label = f"...{key[-4:]}" if len(key) > 8 else "key"
+        self.bucket = bucket
+        self.cooldown_until = 0.0
+        self.consecutive_rate_limits = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.successes = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.cancelled = 0
+        self._model = None
+        self._model_factory = model_factory
+
+    @property
+    def model(self) -> Any:
+        """Model client bound to this key, created on first use."""
+        if self._model is None:
+            self._model = self._model_factory(self.key)
+        return self._model
+
+
+class KeyPool:
+    """
+    Pool of API keys that picks the key with the most remaining quota.
+
+    Each key has a token bucket sized to its request quota. A key that the
+    upstream API rate limits is cooled down, with the cooldown doubling on
+    consecutive rate limits, and its bucket is emptied.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        model_factory: Callable[[str], Any],
+        requests_per_minute: float = 60,
+        burst: float = 10,
+        cooldown_seconds: float = 30.0,
+        max_wait_seconds: float = 30.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            keys: API keys
+            model_factory: Creates a model client for a key
+            requests_per_minute: Per-key request quota
+            burst: Per-key bucket capacity
+            cooldown_seconds: Base cooldown after a rate limit
+            max_wait_seconds: Longest time to wait for a key before failing
+        """
+        if not keys:
+            raise AIServiceError("At least one API key is required")
+        self.cooldown_seconds = cooldown_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.keys = [
+            KeyState(key, TokenBucket(burst, requests_per_minute / 60), model_factory)
+            for key in dict.fromkeys(keys)
+        ]
+
+    def _pick(self, now: float) -> Optional[KeyState]:
+        """Take a token from the usable key with the most remaining quota."""
+        best, best_rank = None, None
+        for state in self.keys:
+            if state.cooldown_until > now:
+                continue
+            tokens = state.bucket.refill(now)
+            rank = (tokens, -state.in_flight)
+            if tokens >= 1 and (best_rank is None or rank > best_rank):
+                best, best_rank = state, rank
+        if best is not None:
+            best.bucket.tokens -= 1
+            best.requests += 1
+            best.in_flight += 1
+        return best
+
+    def _wait_time(self, now: float) -> float:
+        """Time until some key can take a request."""
+        return min(
+            max(state.cooldown_until - now, state.bucket.seconds_until_token(now))
+            for state in self.keys
+        )
+
+    def acquire_nowait(self) -> KeyState:
+        """
+        Take quota from the best key without waiting.
+
+        Raises:
+            AIServiceError: If every key is out of quota or cooling down
+        """
+        state = self._pick(time.monotonic())
+        if state is None:
+            raise AIServiceError("All API keys are rate limited, please retry shortly")
+        return state
+
+    async def acquire(self) -> KeyState:
+        """
+        Take quota from the best key, waiting for quota to refill if needed.
+
+        Raises:
+            AIServiceError: If no key frees up within ``max_wait_seconds``
+        """
+        deadline = time.monotonic() + self.max_wait_seconds
+        while True:
+            now = time.monotonic()
+            state = self._pick(now)
+            if state is not None:
+                return state
+            wait = self._wait_time(now)
+            if now + wait > deadline:
+                raise AIServiceError("All API keys are rate limited, please retry shortly")
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[KeyState]:
+        """
+        Use the best key for one request, waiting for quota if needed.
+
+        The outcome is recorded when the block exits: a ``TooManyRequests``
+        error cools the key down, any other error counts against it.
+        """
+        state = await self.acquire()
+        with self._recording(state):
+            yield state
+
+    @contextmanager
+    def lease_nowait(self) -> Iterator[KeyState]:
+        """Use the best key for one request without waiting for quota."""
+        state = self.acquire_nowait()
+        with self._recording(state):
+            yield state
+
+    @contextmanager
+    def _recording(self, state: KeyState) -> Iterator[None]:
+        """Record the outcome of the request made inside the block."""
+        try:
+            yield
+        except TooManyRequests:
+            self.rate_limited(state)
+            raise
+        except asyncio.CancelledError:
+            state.in_flight -= 1
+            state.cancelled += 1
+            raise
+        except BaseException:
+            self.release(state, success=False)
+            raise
+        else:
+            self.release(state)
+
+    def release(self, state: KeyState, success: bool = True) -> None:
+        """
+        Record the outcome of a request that did not hit a rate limit.
+
+        Args:
+            state: Key the request used
+            success: Whether the request succeeded
+        """
+        state.in_flight -= 1
+        if success:
+            state.successes += 1
+            state.consecutive_rate_limits = 0
+        else:
+            state.errors += 1
+
+    def rate_limited(self, state: KeyState) -> None:
+        """
+        Cool a key down after the upstream API rate limited it.
+
+        Args:
+            state: Key that was rate limited
+        """
+        state.in_flight -= 1
+        state.rate_limited += 1
+        state.consecutive_rate_limits += 1
+        cooldown = self.cooldown_seconds * 2 ** min(state.consecutive_rate_limits - 1, 4)
+        now = time.monotonic()
+        state.cooldown_until = now + cooldown
+        state.bucket.refill(now)
+        state.bucket.tokens = 0.0
+        logger.warning(f"API key {state.label} rate limited, cooling down for {cooldown:g}s")
+
+    def usage(self) -> List[Dict]:
+        """
+        Get per-key usage and quota.
+
+        Returns:
+            One dictionary per key with its masked label, counters, remaining
+            tokens and cooldown
+        """
+        now = time.monotonic()
+        return [
+            {
+                "key": state.label,
+                "requests": state.requests,
+                "successes": state.successes,
+                "rate_limited": state.rate_limited,
+                "errors": state.errors,
+                "cancelled": state.cancelled,
+                "in_flight": state.in_flight,
+                "tokens_remaining": round(state.bucket.refill(now), 3),
+                "cooldown_seconds": round(max(state.cooldown_until - now, 0.0), 3),
+            }
+            for state in self.keys
+        ]
@@ -0,0 +1,442 @@
+"""
+Local knowledge base service.
+Retrieves curated Markdown passages with BM25 for prompt grounding and for
+answering common educational questions without an AI model call.
+
+Build a precomputed index with:
+    python -m src.services.knowledge_service --output knowledge/index.json
+"""
+
+import argparse
+import json
+import math
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import RESPONSE_TEMPLATES
+from ..utils.logger import logger
+from .semantic_cache import tokenize
+
+DEFAULT_ARTICLES_DIR = Path(__file__).resolve().parents[2] / "knowledge" / "articles"
+
+# Question words that tokenize drops as stopwords but that carry a heading's intent,
+# e.g. "What is an emergency fund?" versus "Where should I keep my emergency fund?"
+INTENT_WORDS = {
+    "what": "what",
+    "where": "where",
+    "when": "when",
+    "how": "how",
+    "why": "why",
+    "which": "which",
+    "who": "who",
+    "keep": "keep",
+    "need": "need",
+    "needs": "need",
+}
+INTENT_WEIGHT = 1.0
+
+# Share of a heading's weighted terms a question must cover to be answered directly
+MIN_HEADING_COVERAGE = 0.8
+
+_WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+def heading_terms(text: str) -> FrozenSet[str]:
+    """
+    Get the terms used to match a question against a heading.
+
+    Args:
+        text: Question or heading text
+
+    Returns:
+        Content tokens plus intent words
+    """
+    intent = {INTENT_WORDS[w] for w in _WORD_PATTERN.findall(text.lower()) if w in INTENT_WORDS}
+    return frozenset(tokenize(text)) | intent
+
+
+class Passage:
+    """A section of a knowledge base article."""
+
+    __slots__ = ("article", "heading", "text", "heading_terms")
+
+    def __init__(self, article: str, heading: str, text: str):
+        self.article = article
+        self.heading = heading
+        self.text = text
+        self.heading_terms = heading_terms(heading)
+
+    def to_markdown(self) -> str:
+        """Render the passage as a Markdown section."""
+        return f"## {self.heading}\n\n{self.text}"
+
+
+def split_article(markdown: str) -> List[Passage]:
+    """
+    Split a Markdown article into passages at its second-level headings.
+
+    The article's first-level heading becomes the article title and its
+    introduction is kept as a passage of its own.
+
+    Args:
+        markdown: Article text
+
+    Returns:
+        List of passages
+    """
+    title = ""
+    heading = ""
+    lines: List[str] = []
+    passages = []
+
+    def flush() -> None:
+        text = "\n".join(lines).strip()
+        if text:
+            passages.append(Passage(title, heading or title, text))
+
+    for line in markdown.splitlines():
+        if line.startswith("# "):
+            title = line[2:].strip()
+        elif line.startswith("## "):
+            flush()
+            heading = line[3:].strip()
+            lines = []
+        else:
+            lines.append(line)
+    flush()
+    return passages
+
+
+class BM25Index:
+    """
+    Inverted index with BM25 scoring.
+
+    Term weights are computed at build time and each posting list is held as
+    a pair of numpy arrays, so a query only scatters precomputed weights into
+    a score vector.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation parameter
+            b: Document length normalization parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self.idf: Dict[str, float] = {}
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.num_documents = 0
+
+    def build(self, documents: Iterable[List[str]]) -> None:
+        """
+        Build the index from tokenized documents.
+
+        Args:
+            documents: Iterable of token lists, indexed by position
+        """
+        term_frequencies: List[Dict[str, int]] = []
+        for tokens in documents:
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            term_frequencies.append(counts)
+
+        self.num_documents = len(term_frequencies)
+        doc_lengths = np.array(
+            [sum(counts.values()) for counts in term_frequencies], dtype=np.float64
+        )
+        average_length = float(doc_lengths.mean()) if self.num_documents else 0.0
+
+        raw_postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_id, counts in enumerate(term_frequencies):
+            for term, frequency in counts.items():
+                raw_postings.setdefault(term, []).append((doc_id, frequency))
+
+        self.idf = {}
+        self.postings = {}
+        for term, postings in raw_postings.items():
+            df = len(postings)
+            idf = math.log(1 + (self.num_documents - df + 0.5) / (df + 0.5))
+            self.idf[term] = idf
+            doc_ids = np.fromiter((doc_id for doc_id, _ in postings), dtype=np.int32)
+            frequencies = np.fromiter((frequency for _, frequency in postings), dtype=np.float64)
+            norms = self.k1 * (1 - self.b + self.b * doc_lengths[doc_ids] / average_length)
+            self.postings[term] = (
+                doc_ids,
+                idf * frequencies * (self.k1 + 1) / (frequencies + norms),
+            )
+
+    def search(self, terms: Iterable[str], k: int = 3) -> List[Tuple[int, float]]:
+        """
+        Find the top scoring documents for query terms.
+
+        Args:
+            terms: Query tokens
+            k: Number of results
+
+        Returns:
+            List of (document id, score) pairs, best first
+        """
+        scores = np.zeros(self.num_documents)
+        for term in set(terms):
+            posting = self.postings.get(term)
+            if posting is not None:
+                # Document ids are unique within a posting list
+                scores[posting[0]] += posting[1]
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+        ranked = matched[np.argsort(scores[matched])[::-1]]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in ranked]
+
+    def to_dict(self) -> Dict:
+        """Serialize the index to a JSON-compatible dictionary."""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "num_documents": self.num_documents,
+            "idf": self.idf,
+            "postings": {
+                term: [doc_ids.tolist(), weights.tolist()]
+                for term, (doc_ids, weights) in self.postings.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BM25Index":
+        """Load an index serialized with ``to_dict``."""
+        index = cls(k1=data["k1"], b=data["b"])
+        index.num_documents = data["num_documents"]
+        index.idf = data["idf"]
+        index.postings = {
+            term: (np.array(doc_ids, dtype=np.int32), np.array(weights, dtype=np.float64))
+            for term, (doc_ids, weights) in data["postings"].items()
+        }
+        return index
+
+
+class KnowledgeBase:
+    """
+    In-process knowledge base over curated Markdown articles.
+
+    Passages are retrieved with BM25. A passage whose heading closely matches
+    the question is considered a confident match and can be served directly.
+    """
+
+    def __init__(self, passages: List[Passage], index: Optional[BM25Index] = None):
+        """
+        Initialize the knowledge base.
+
+        Args:
+            passages: Knowledge base passages
+            index: Prebuilt index over the passages (built if omitted)
+        """
+        self.passages = passages
+        self.index = index
+        if self.index is None:
+            self.index = BM25Index()
+            self.index.build(self._passage_terms(p) for p in passages)
+        # Terms the index has never seen are weighted as the rarest indexed term
+        self._unseen_weight = max(self.index.idf.values(), default=1.0)
+
+    @staticmethod
+    def _passage_terms(passage: Passage) -> List[str]:
+        """Tokenize a passage for indexing, counting heading terms twice."""
+        heading_terms = tokenize(passage.heading)
+        return heading_terms * 2 + tokenize(passage.text)
+
+    @classmethod
+    def from_directory(cls, directory: Path = DEFAULT_ARTICLES_DIR) -> "KnowledgeBase":
+        """
+        Build a knowledge base from the Markdown articles in a directory.
+
+        Args:
+            directory: Directory containing ``*.md`` articles
+
+        Returns:
+            KnowledgeBase instance
+        """
+        passages = []
+        for path in sorted(Path(directory).glob("*.md")):
+            passages.extend(split_article(path.read_text(encoding="utf-8")))
+        logger.info(f"Knowledge base built with {len(passages)} passages from {directory}")
+        return cls(passages)
+
+    @classmethod
+    def load(cls, path: Path) -> "KnowledgeBase":
+        """
+        Load a knowledge base saved with ``save``.
+
+        Args:
+            path: Path to the precomputed index file
+
+        Returns:
+            KnowledgeBase instance
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        passages = [Passage(p["article"], p["heading"], p["text"]) for p in data["passages"]]
+        logger.info(f"Knowledge base loaded with {len(passages)} passages from {path}")
+        return cls(passages, BM25Index.from_dict(data["index"]))
+
+    def save(self, path: Path) -> None:
+        """
+        Save the passages and index to a JSON file.
+
+        Args:
+            path: Output path
+        """
+        data = {
+            "passages": [
+                {"article": p.article, "heading": p.heading, "text": p.text} for p in self.passages
+            ],
+            "index": self.index.to_dict(),
+        }
+        Path(path).write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[Passage, float]]:
+        """
+        Retrieve the passages most relevant to a query.
+
+        Args:
+            query: User question
+            k: Number of passages
+
+        Returns:
+            List of (passage, BM25 score) pairs, best first
+        """
+        return [
+            (self.passages[doc_id], score)
+            for doc_id, score in self.index.search(tokenize(query), k)
+        ]
+
+    def _weight(self, term: str) -> float:
+        """Weight of a heading match term."""
+        if term in INTENT_WORDS:
+            return INTENT_WEIGHT
+        return self.index.idf.get(term, self._unseen_weight)
+
+    def confidence(self, query: str, passage: Passage) -> float:
+        """
+        Score how closely a question matches a passage heading.
+
+        Uses IDF-weighted Jaccard overlap between the question terms and the
+        heading terms, so 1.0 means they share exactly the same terms. Question
+        words such as "where" and "need" count, so a question asking something
+        else about the same topic does not match.
+
+        Args:
+            query: User question
+            passage: Candidate passage
+
+        Returns:
+            Confidence between 0 and 1
+        """
+        query_terms = heading_terms(query)
+        union = query_terms | passage.heading_terms
+        if not union:
+            return 0.0
+        shared = sum(self._weight(term) for term in query_terms & passage.heading_terms)
+        total = sum(self._weight(term) for term in union)
+        return shared / total if total else 0.0
+
+    def covers_heading(self, query: str, passage: Passage) -> bool:
+        """
+        Check that a question asks what a passage heading asks.
+
+        Every intent word of the heading must appear in the question, and the
+        question must cover at least ``MIN_HEADING_COVERAGE`` of the heading's
+        weighted terms.
+
+        Args:
+            query: User question
+            passage: Candidate passage
+
+        Returns:
+            True if the passage heading is covered by the question
+        """
+        query_terms = heading_terms(query)
+        heading_intent = {term for term in passage.heading_terms if term in INTENT_WORDS}
+        if not heading_intent <= query_terms:
+            return False
+        total = sum(self._weight(term) for term in passage.heading_terms)
+        shared = sum(self._weight(term) for term in query_terms & passage.heading_terms)
+        return total > 0 and shared / total >= MIN_HEADING_COVERAGE
+
+    def direct_answer(self, query: str, threshold: float, k: int = 3) -> Optional[Passage]:
+        """
+        Get a passage that answers the question on its own, if any.
+
+        The top ``k`` BM25 results are re-ranked by heading confidence, and
+        only passages whose heading the question covers are considered.
+
+        Args:
+            query: User question
+            threshold: Minimum heading confidence
+            k: Number of BM25 results to consider
+
+        Returns:
+            The most confident passage if it meets the threshold, None otherwise
+        """
+        best_passage, best_confidence = None, threshold
+        for passage, _ in self.search(query, k):
+            confidence = self.confidence(query, passage)
+            if confidence >= best_confidence and self.covers_heading(query, passage):
+                best_passage, best_confidence = passage, confidence
+        return best_passage
+
+    @staticmethod
+    def format_answer(passage: Passage) -> str:
+        """
+        Render a passage as a standalone chat answer.
+
+        Args:
+            passage: Passage returned by ``direct_answer``
+
+        Returns:
+            Markdown answer with source and disclaimer
+        """
+        return (
+            f"{passage.to_markdown()}\n\n*Source: FinAI knowledge base, {passage.article}*\n"
+            f"{RESPONSE_TEMPLATES['disclaimer']}"
+        )
+
+    @staticmethod
+    def format_context(results: List[Tuple[Passage, float]]) -> str:
+        """
+        Format retrieved passages as reference material for a prompt.
+
+        Args:
+            results: Search results
+
+        Returns:
+            Prompt section text, or an empty string if there are no results
+        """
+        if not results:
+            return ""
+        sections = "\n\n".join(
+            f"[{passage.article}] {passage.to_markdown()}" for passage, _ in results
+        )
+        return "\n\nREFERENCE MATERIAL (use it to ground your answer where relevant):\n" + sections
+
+
+def main() -> None:
+    """Build and save a precomputed knowledge base index."""
+    parser = argparse.ArgumentParser(description="Build the knowledge base index")
+    parser.add_argument("--articles", type=Path, default=DEFAULT_ARTICLES_DIR)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    knowledge_base = KnowledgeBase.from_directory(args.articles)
+    knowledge_base.save(args.output)
+    print(f"Saved {len(knowledge_base.passages)} passages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+"""
+Semantic response cache.
+Serves cached answers for paraphrased questions without calling the AI model.
+
+Questions are embedded offline with hashed TF-IDF vectors and looked up through
+a random-hyperplane LSH index, so no network or model download is needed.
+"""
+
+import hashlib
+import math
+import re
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config import SESSION_CONFIG
+from ..utils.logger import logger
+
+SparseVector = Dict[int, float]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+# Joins account names like "401(k)" and "403 (b)" into a single token
+_ACCOUNT_PATTERN = re.compile(r"(\d+)\s*\(([a-z])\)")
+
+STOPWORDS = frozenset("""
+    a about am an and are as at be been being but by can could do does did for from get
+    give go good had has have help how i if in into is it its just keep know me my need
+    needs of on or our please should so some tell than that the their them then there
+    these they this to us user want was we what when where which who why will with would
+    you your
+    """.split())
+
+# Common paraphrase variants mapped to a canonical term
+SYNONYMS = {
+    "big": "size",
+    "large": "size",
+    "sized": "size",
+    "much": "size",
+    "many": "size",
+    "bigger": "size",
+    "kept": "keep",
+    "saving": "save",
+    "savings": "save",
+    "saved": "save",
+    "loans": "loan",
+    "debts": "debt",
+    "paying": "pay",
+    "payoff": "pay",
+    "repay": "pay",
+    "begin": "start",
+    "beginner": "start",
+    "starting": "start",
+    "investing": "invest",
+    "investment": "invest",
+    "investments": "invest",
+    "retire": "retirement",
+    "retiring": "retirement",
+    "mortgages": "mortgage",
+    "budgets": "budget",
+    "budgeting": "budget",
+    "explain": "understand",
+    "meaning": "understand",
+    "mean": "understand",
+    "work": "understand",
+    "works": "understand",
+    "difference": "compare",
+    "versus": "compare",
+    "vs": "compare",
+    "better": "compare",
+    "prioritize": "first",
+    "priority": "first",
+}
+
+# Question intents that stopword removal would otherwise erase, so "When should I
+# start saving for retirement?" and "Why should I ...?" embed differently. Bare
+# "what" and "how" are left out: explanation questions use them interchangeably.
+INTENT_PATTERNS = [
+    ("amount", re.compile(r"\bhow (?:much|many|big|large)\b|\bwhat size\b")),
+    ("when", re.compile(r"\bwhen\b|\bhow (?:long|soon)\b|\bwhat age\b")),
+    ("why", re.compile(r"\bwhy\b")),
+    ("where", re.compile(r"\bwhere\b")),
+    ("which", re.compile(r"\bwhich\b")),
+    ("who", re.compile(r"\bwho\b")),
+]
+
+# Representative questions used to seed inverse document frequencies
+SEED_CORPUS = [
+    "How big should my emergency fund be?",
+    "What is compound interest?",
+    "How does a 401(k) work?",
+    "What is the difference between a Roth IRA and a traditional IRA?",
+    "How should I prioritize paying off debt vs saving?",
+    "What is the 50/30/20 budgeting rule?",
+    "How do I start investing as a beginner?",
+    "What are the benefits of a Roth IRA?",
+    "How much should I save for retirement?",
+    "What is a good credit score?",
+    "Should I pay off my mortgage early?",
+    "What is an index fund?",
+    "How do tax brackets work?",
+    "What insurance do I need?",
+    "How do I make a budget?",
+    "What is the avalanche method for paying off debt?",
+    "What is the snowball method for paying off debt?",
+    "How much house can I afford?",
+    "What is diversification?",
+    "Is term life insurance better than whole life insurance?",
+    "What is a high-yield savings account?",
+    "How do capital gains taxes work?",
+    "When should I start saving for retirement?",
+    "What is dollar cost averaging?",
+]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Normalize text into content tokens.
+
+    Stopwords are removed, synonyms folded to a canonical term and simple
+    plurals stripped.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of normalized tokens
+    """
+    tokens = []
+    text = _ACCOUNT_PATTERN.sub(r"\1\2", text.lower())
+    for token in _TOKEN_PATTERN.findall(text):
+        if token in STOPWORDS or (len(token) == 1 and not token.isdigit()):
+            continue
+        token = SYNONYMS.get(token, token)
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = SYNONYMS.get(token[:-1], token[:-1])
+        tokens.append(token)
+    return tokens
+
+
+def intent_tokens(text: str) -> List[str]:
+    """
+    Get tokens for the question intents expressed in text.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        One "?intent" token per matched intent; the prefix keeps them apart from
+        content tokens
+    """
+    text = text.lower()
+    return [f"?{intent}" for intent, pattern in INTENT_PATTERNS if pattern.search(text)]
+
+
+class HashedTfidfEmbedder:
+    """
+    Offline question embedder using hashed TF-IDF features.
+
+    Tokens are normalized with ``tokenize``, extended with ``intent_tokens`` and
+    hashed into a fixed number of buckets with crc32 so vectors are stable
+    across processes.
+    """
+
+    def __init__(self, dim: int = 4096, corpus: Optional[Iterable[str]] = None):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Number of hash buckets
+            corpus: Questions used to estimate inverse document frequencies
+        """
+        self.dim = dim
+        self._idf: Dict[int, float] = {}
+        self._default_idf = 1.0
+        self.fit(SEED_CORPUS if corpus is None else corpus)
+
+    def fit(self, corpus: Iterable[str]) -> None:
+        """
+        Estimate inverse document frequencies from a corpus.
+
+        Args:
+            corpus: Iterable of question strings
+        """
+        document_frequency: Dict[int, int] = {}
+        num_documents = 0
+        for text in corpus:
+            num_documents += 1
+            for bucket in {self._bucket(token) for token in self.tokenize(text)}:
+                document_frequency[bucket] = document_frequency.get(bucket, 0) + 1
+
+        self._idf = {
+            bucket: math.log((1 + num_documents) / (1 + df)) + 1
+            for bucket, df in document_frequency.items()
+        }
+        self._default_idf = math.log(1 + num_documents) + 1
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """
+        Normalize text into content and intent tokens.
+
+        Args:
+            text: Raw question text
+
+        Returns:
+            List of normalized tokens
+        """
+        return tokenize(text) + intent_tokens(text)
+
+    def embed(self, text: str) -> SparseVector:
+        """
+        Embed text as an L2-normalized sparse vector.
+
+        Args:
+            text: Raw question text
+
+        Returns:
+            Mapping of hash bucket to weight
+        """
+        counts: Dict[int, int] = {}
+        for token in self.tokenize(text):
+            bucket = self._bucket(token)
+            counts[bucket] = counts.get(bucket, 0) + 1
+
+        vector = {
+            bucket: (1 + math.log(count)) * self._idf.get(bucket, self._default_idf)
+            for bucket, count in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm == 0:
+            return {}
+        return {bucket: weight / norm for bucket, weight in vector.items()}
+
+    def _bucket(self, token: str) -> int:
+        """Hash a token into a bucket index."""
+        return zlib.crc32(token.encode("utf-8")) % self.dim
+
+
+def cosine_similarity(a: SparseVector, b: SparseVector) -> float:
+    """Compute the cosine similarity of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
+
+
+class LSHIndex:
+    """
+    Approximate nearest-neighbour index using random-hyperplane hashing.
+
+    Each table hashes a vector to the sign pattern of its projections onto
+    ``num_bits`` random hyperplanes; similar vectors collide in at least one
+    table with high probability. Hyperplane coefficients are derived from a
+    hash of (seed, bucket) so nothing is materialized up front.
+    """
+
+    def __init__(self, num_tables: int = 24, num_bits: int = 8, seed: int = 13):
+        """
+        Initialize the index.
+
+        Args:
+            num_tables: Number of hash tables
+            num_bits: Hyperplanes per table
+            seed: Seed mixed into the hyperplane hash
+        """
+        self._num_bits = num_bits
+        self._seed = seed
+        self._coefficients: Dict[int, bytes] = {}
+        self._tables: List[Dict[int, set]] = [{} for _ in range(num_tables)]
+
+    def signatures(self, vector: SparseVector) -> Tuple[int, ...]:
+        """
+        Compute the per-table hash signatures of a vector.
+
+        Args:
+            vector: Sparse vector
+
+        Returns:
+            Tuple with one integer signature per table
+        """
+        num_bits = self._num_bits
+        projections = [0.0] * (len(self._tables) * num_bits)
+        for bucket, weight in vector.items():
+            for index, byte in enumerate(self._plane_coefficients(bucket)):
+                projections[index] += weight * (byte / 127.5 - 1.0)
+
+        result = []
+        for offset in range(0, len(projections), num_bits):
+            signature = 0
+            for bit in range(num_bits):
+                if projections[offset + bit] > 0:
+                    signature |= 1 << bit
+            result.append(signature)
+        return tuple(result)
+
+    def _plane_coefficients(self, bucket: int) -> bytes:
+        """Get a bucket's hyperplane coefficients for all tables, one byte each."""
+        coefficients = self._coefficients.get(bucket)
+        if coefficients is None:
+            coefficients = hashlib.shake_128(f"{self._seed}:{bucket}".encode("utf-8")).digest(
+                len(self._tables) * self._num_bits
+            )
+            self._coefficients[bucket] = coefficients
+        return coefficients
+
+    def add(self, key: int, signatures: Tuple[int, ...]) -> None:
+        """Add a key under its signatures."""
+        for table, signature in zip(self._tables, signatures):
+            table.setdefault(signature, set()).add(key)
+
+    def remove(self, key: int, signatures: Tuple[int, ...]) -> None:
+        """Remove a key previously added under its signatures."""
+        for table, signature in zip(self._tables, signatures):
+            bucket = table.get(signature)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[signature]
+
+    def candidates(self, signatures: Tuple[int, ...]) -> set:
+        """Get all keys colliding with the signatures in any table."""
+        keys: set = set()
+        for table, signature in zip(self._tables, signatures):
+            keys.update(table.get(signature, ()))
+        return keys
+
+
+class _CacheEntry:
+    """A cached question and its response."""
+
+    __slots__ = ("question", "vector", "signatures", "response")
+
+    def __init__(
+        self, question: str, vector: SparseVector, signatures: Tuple[int, ...], response: str
+    ):
+        self.question = question
+        self.vector = vector
+        self.signatures = signatures
+        self.response = response
+
+
+class SemanticCache:
+    """
+    Capacity-bounded semantic cache for AI responses.
+
+    Entries are evicted in least-recently-used order once capacity is reached.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 5000,
+        threshold: float = 0.9,
+        embedder: Optional[HashedTfidfEmbedder] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            capacity: Maximum number of cached entries
+            threshold: Minimum cosine similarity for a hit
+            embedder: Question embedder (defaults to HashedTfidfEmbedder)
+        """
+        self.capacity = capacity
+        self.threshold = threshold
+        self._embedder = embedder or HashedTfidfEmbedder()
+        self._index = LSHIndex()
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._exact: Dict[str, int] = {}
+        self._next_key = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def is_cacheable(
+        history: List[str], preferences: Optional[Dict], financial_profile: Optional[Dict]
+    ) -> bool:
+        """
+        Check whether a turn is generic enough to share a cached answer.
+
+        Only first turns without personal data qualify; preferences matching
+        the session defaults do not count as personalization.
+
+        Args:
+            history: Conversation history for the turn
+            preferences: User preferences sent with the request
+            financial_profile: Session financial profile
+
+        Returns:
+            True if the turn can be served from or stored in the cache
+        """
+        if len(history) != 1 or financial_profile:
+            return False
+        defaults = SESSION_CONFIG["default_preferences"]
+        return all(defaults.get(key) == value for key, value in (preferences or {}).items())
+
+    def lookup(self, question: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the cached response for a question or a close paraphrase.
+
+        Args:
+            question: User question
+
+        Returns:
+            Tuple of (response, similarity) or None on a miss
+        """
+        key = self._exact.get(self._normalize(question))
+        if key is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key].response, 1.0
+
+        vector = self._embedder.embed(question)
+        if not vector:
+            self.misses += 1
+            return None
+
+        best_key, best_score = None, self.threshold
+        for candidate in self._index.candidates(self._index.signatures(vector)):
+            score = cosine_similarity(vector, self._entries[candidate].vector)
+            if score >= best_score:
+                best_key, best_score = candidate, score
+
+        if best_key is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(best_key)
+        self.hits += 1
+        logger.debug(f"Semantic cache hit ({best_score:.2f}) for: {question[:80]}")
+        return self._entries[best_key].response, best_score
+
+    def get(self, question: str) -> Optional[str]:
+        """
+        Get the cached response for a question.
+
+        Args:
+            question: User question
+
+        Returns:
+            Cached response text or None on a miss
+        """
+        result = self.lookup(question)
+        return result[0] if result else None
+
+    def put(self, question: str, response: str) -> None:
+        """
+        Cache a response for a question.
+
+        Args:
+            question: User question
+            response: AI response text
+        """
+        normalized = self._normalize(question)
+        if normalized in self._exact:
+            return
+
+        vector = self._embedder.embed(question)
+        if not vector:
+            return
+
+        key = self._next_key
+        self._next_key += 1
+        entry = _CacheEntry(normalized, vector, self._index.signatures(vector), response)
+        self._entries[key] = entry
+        self._exact[normalized] = key
+        self._index.add(key, entry.signatures)
+
+        while len(self._entries) > self.capacity:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._index.remove(evicted_key, evicted.signatures)
+            del self._exact[evicted.question]
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        for key, entry in self._entries.items():
+            self._index.remove(key, entry.signatures)
+        self._entries.clear()
+        self._exact.clear()
+
+    @property
+    def stats(self) -> Dict:
+        """Get cache size and hit statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        """Normalize a question for exact-match lookup."""
+        return " ".join(_TOKEN_PATTERN.findall(question.lower()))
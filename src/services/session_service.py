@@ -2,14 +2,133 @@
 Session management service.
 Handles session CRUD operations with in-memory storage.
 Can be extended to use database storage in production.
+
+Sessions and conversation entries are stored as slotted records rather than
+nested dicts to keep per-session overhead low at high session counts. Use
+``SessionRecord.to_dict()`` to get the JSON-compatible representation.
 """
 
+import sys
+import time
+import zlib
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
+from ..config import SESSION_CONFIG
 from ..utils.logger import logger
 
 
+class ConversationEntry:
+    """
+    A single conversation turn.
+
+    Timestamps are stored as epoch floats, tool names are interned and message
+    bodies may be zlib-compressed once the entry becomes cold.
+    """
+
+    __slots__ = ("timestamp", "_user_message", "_ai_response", "tools_used")
+
+    def __init__(
+        self,
+        user_message: str,
+        ai_response: str,
+        tools_used: Tuple[str, ...] = (),
+        timestamp: Optional[float] = None,
+    ):
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._user_message: Union[str, bytes] = user_message
+        self._ai_response: Union[str, bytes] = ai_response
+        self.tools_used = tools_used
+
+    @property
+    def user_message(self) -> str:
+        """Get the user's message, decompressing it if needed."""
+        return _inflate(self._user_message)
+
+    @property
+    def ai_response(self) -> str:
+        """Get the AI's response, decompressing it if needed."""
+        return _inflate(self._ai_response)
+
+    @property
+    def is_compressed(self) -> bool:
+        """Check whether any message body is stored compressed."""
+        return isinstance(self._user_message, bytes) or isinstance(self._ai_response, bytes)
+
+    def compress(self, min_chars: int) -> None:
+        """
+        Compress message bodies that are at least ``min_chars`` long.
+
+        Args:
+            min_chars: Minimum message length worth compressing
+        """
+        self._user_message = _deflate(self._user_message, min_chars)
+        self._ai_response = _deflate(self._ai_response, min_chars)
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the entry to its JSON-compatible dictionary form.
+
+        Returns:
+            Dictionary with timestamp, user_message, ai_response and tools_used
+        """
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "user_message": self.user_message,
+            "ai_response": self.ai_response,
+            "tools_used": list(self.tools_used),
+        }
+
+
+class SessionRecord:
+    """In-memory record for a single user session."""
+
+    __slots__ = (
+        "session_id",
+        "created_at",
+        "conversation_history",
+        "preferences",
+        "financial_profile",
+    )
+
+    def __init__(self, session_id: str, preferences: Optional[Dict] = None):
+        self.session_id = session_id
+        self.created_at = time.time()
+        self.conversation_history: List[ConversationEntry] = []
+        self.preferences: Dict = preferences or {}
+        self.financial_profile: Dict = {}
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the session to its JSON-compatible dictionary form.
+
+        Returns:
+            Session data dictionary
+        """
+        return {
+            "session_id": self.session_id,
+            "created_at": datetime.fromtimestamp(self.created_at),
+            "conversation_history": [entry.to_dict() for entry in self.conversation_history],
+            "preferences": self.preferences,
+            "financial_profile": self.financial_profile,
+        }
+
+
+def _deflate(text: Union[str, bytes], min_chars: int) -> Union[str, bytes]:
+    """Compress a message body if it is long enough to benefit."""
+    if isinstance(text, bytes) or len(text) < min_chars:
+        return text
+    compressed = zlib.compress(text.encode("utf-8"))
+    return compressed if len(compressed) < len(text) else text
+
+
+def _inflate(body: Union[str, bytes]) -> str:
+    """Decompress a message body stored by ``_deflate``."""
+    if isinstance(body, bytes):
+        return zlib.decompress(body).decode("utf-8")
+    return body
+
+
 class SessionService:
     """
     Service for managing user sessions.
@@ -20,7 +139,10 @@ class SessionService:
 
     def __init__(self):
         """Initialize session service with in-memory storage."""
-        self._sessions: Dict[str, Dict] = {}
+        self._sessions: Dict[str, SessionRecord] = {}
+        self._compress_cold_messages = SESSION_CONFIG["compress_cold_messages"]
+        self._hot_history_entries = SESSION_CONFIG["hot_history_entries"]
+        self._compress_min_chars = SESSION_CONFIG["compress_min_chars"]
 
     def get_session(self, session_id: str) -> Optional[Dict]:
         """
@@ -32,9 +154,24 @@ class SessionService:
         Returns:
             Session data dictionary or None if not found
         """
+        record = self._sessions.get(session_id)
+        return record.to_dict() if record is not None else None
+
+    def get_record(self, session_id: str) -> Optional[SessionRecord]:
+        """
+        Get the session record by ID without materializing it as a dict.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            SessionRecord or None if not found
+        """
         return self._sessions.get(session_id)
 
-    def get_or_create_session(self, session_id: str, preferences: Optional[Dict] = None) -> Dict:
+    def get_or_create_session(
+        self, session_id: str, preferences: Optional[Dict] = None
+    ) -> SessionRecord:
         """
         Get existing session or create a new one.
 
@@ -43,19 +180,15 @@ class SessionService:
             preferences: Optional user preferences
 
         Returns:
-            Session data dictionary
+            SessionRecord for the session
         """
-        if session_id not in self._sessions:
-            self._sessions[session_id] = {
-                "session_id": session_id,
-                "created_at": datetime.now(),
-                "conversation_history": [],
-                "preferences": preferences or {},
-                "financial_profile": {},
-            }
+        record = self._sessions.get(session_id)
+        if record is None:
+            record = SessionRecord(session_id, preferences)
+            self._sessions[session_id] = record
             logger.info(f"Created new session: {session_id}")
 
-        return self._sessions[session_id]
+        return record
 
     def add_conversation_entry(
         self, session_id: str, user_message: str, ai_response: str, tools_used: List[str]
@@ -69,15 +202,22 @@ class SessionService:
             ai_response: AI's response
             tools_used: List of tools used in response
         """
-        if session_id in self._sessions:
-            self._sessions[session_id]["conversation_history"].append(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "user_message": user_message,
-                    "ai_response": ai_response,
-                    "tools_used": tools_used,
-                }
+        record = self._sessions.get(session_id)
+        if record is None:
+            return
+
+        history = record.conversation_history
+        history.append(
+            ConversationEntry(
+                user_message=user_message,
+                ai_response=ai_response,
+                tools_used=tuple(sys.intern(tool) for tool in tools_used),
             )
+        )
+
+        # Compress the entry that just dropped out of the hot window
+        if self._compress_cold_messages and len(history) > self._hot_history_entries:
+            history[-self._hot_history_entries - 1].compress(self._compress_min_chars)
 
     def update_preferences(self, session_id: str, preferences: Dict) -> None:
         """
@@ -88,7 +228,7 @@ class SessionService:
             preferences: New preferences to merge
         """
         if session_id in self._sessions:
-            self._sessions[session_id]["preferences"].update(preferences)
+            self._sessions[session_id].preferences.update(preferences)
 
     def update_financial_profile(self, session_id: str, profile: Dict) -> None:
         """
@@ -99,7 +239,7 @@ class SessionService:
             profile: New profile data to merge
         """
         if session_id in self._sessions:
-            self._sessions[session_id]["financial_profile"].update(profile)
+            self._sessions[session_id].financial_profile.update(profile)
 
     def delete_session(self, session_id: str) -> bool:
         """
@@ -124,4 +264,4 @@ class SessionService:
         Returns:
             Dictionary of all sessions
         """
-        return self._sessions.copy()
+        return {session_id: record.to_dict() for session_id, record in self._sessions.items()}
@@ -1,5 +1,6 @@
 # Utils module
-from .exceptions import AIServiceError, SessionError
+from .exceptions import AIServiceError, GenerationCancelled, SessionError
 from .logger import logger
+from .metrics import metrics
 
-__all__ = ["logger", "AIServiceError", "SessionError"]
+__all__ = ["logger", "metrics", "AIServiceError", "GenerationCancelled", "SessionError"]
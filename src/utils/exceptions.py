@@ -38,3 +38,11 @@ class ValidationError(FinAIException):
 
     def __init__(self, message: str):
         super().__init__(message, code="VALIDATION_ERROR")
+
+
+class GenerationCancelled(FinAIException):
+    """Exception raised when an in-flight AI generation is cancelled."""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Generation cancelled: {reason}", code="GENERATION_CANCELLED")
@@ -0,0 +1,35 @@
+"""
+In-process metrics counters.
+"""
+
+import threading
+from collections import Counter
+from typing import Dict
+
+
+class Metrics:
+    """Thread-safe named counters."""
+
+    def __init__(self):
+        self._counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def snapshot(self) -> Dict[str, int]:
+        """Get a copy of all counters."""
+        with self._lock:
+            return dict(self._counters)
+
+
+# Global metrics instance
+metrics = Metrics()
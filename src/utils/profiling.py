@@ -0,0 +1,356 @@
+"""
+Statistical request profiler and event-loop lag monitor.
+Stacks are sampled from a background thread and kept in folded
+(flamegraph-compatible) form: one ``frame;frame;frame count`` line per stack.
+"""
+
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+from .logger import logger
+
+# Marker appended to stacks of requests that are suspended on an await
+AWAITING = "[awaiting]"
+
+# Trace of the request whose context is active, inherited by tasks it spawns
+_active_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("active_trace", default=None)
+
+
+def _frame_label(frame) -> str:
+    """Label a frame by function, so samples aggregate per function."""
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _thread_stack(frame) -> List[str]:
+    """
+    Collect a thread's stack from the outermost frame inwards.
+
+    Event loop machinery above the running callback is dropped.
+    """
+    labels = []
+    events_module = os.path.join("asyncio", "events.py")
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == "_run" and code.co_filename.endswith(events_module):
+            break
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _await_stack(task: asyncio.Task) -> List[str]:
+    """Collect the await chain of a suspended task, from its outermost coroutine inwards."""
+    labels = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        frame = frame or getattr(awaitable, "ag_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame))
+        awaitable = (
+            getattr(awaitable, "cr_await", None)
+            or getattr(awaitable, "gi_yieldfrom", None)
+            or getattr(awaitable, "ag_await", None)
+        )
+    labels.append(AWAITING)
+    return labels
+
+
+class Profile:
+    """Sampled stacks for one request or event-loop stall."""
+
+    __slots__ = ("profile_id", "method", "path", "reason", "started_at", "duration_ms", "samples")
+
+    def __init__(self, profile_id: str, method: str, path: str, reason: str):
+        self.profile_id = profile_id
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.samples: Counter = Counter()
+
+    def folded(self) -> str:
+        """Render samples in folded stack format."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def summary(self) -> Dict:
+        """Get profile metadata without the stacks."""
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "samples": sum(self.samples.values()),
+        }
+
+
+class RequestTrace:
+    """An in-flight request watched by the profiler, with the tasks it runs in."""
+
+    __slots__ = ("tasks", "method", "path", "started", "profile", "_token")
+
+    def __init__(self, task: asyncio.Task, method: str, path: str, profile: Optional[Profile]):
+        self.tasks = [task]
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.profile = profile
+        self._token = None
+
+
+class Profiler:
+    """
+    Opt-in sampling profiler for asyncio request handlers.
+
+    A daemon thread wakes every ``interval_ms`` and records a stack for each
+    profiled request: the event loop thread's stack when one of the request's
+    tasks is running, or the await chain of its newest live task when it is
+    suspended. Tasks spawned while handling a request (such as a streaming
+    response body) are attributed to it through a task factory. Requests still
+    running after ``slow_request_ms`` start being sampled automatically, and
+    stacks of the loop thread are captured while the event loop is stalled.
+    """
+
+    def __init__(
+        self,
+        interval_ms: float = 5.0,
+        slow_request_ms: float = 0.0,
+        loop_lag_interval_ms: float = 100.0,
+        loop_stall_ms: float = 250.0,
+        max_profiles: int = 50,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval_ms: Time between stack samples
+            slow_request_ms: Start sampling requests running longer than this (0 disables)
+            loop_lag_interval_ms: Event-loop lag probe interval (0 disables the monitor)
+            loop_stall_ms: Lag beyond which the loop thread's stack is captured
+            max_profiles: Number of finished profiles kept for download
+        """
+        self.interval = interval_ms / 1000
+        self.slow_request = slow_request_ms / 1000
+        self.loop_lag_interval = loop_lag_interval_ms / 1000
+        self.loop_stall = loop_stall_ms / 1000
+        self.profiles: Deque[Profile] = deque(maxlen=max_profiles)
+
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._traces: Dict[int, RequestTrace] = {}
+        self._lags: Deque[float] = deque(maxlen=1000)
+        self._stalls = 0
+        self._stall_profile: Optional[Profile] = None
+        self._heartbeat = time.perf_counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lag_task: Optional[asyncio.Task] = None
+        self._previous_task_factory = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start sampling; must be called from the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stopped.clear()
+        self._previous_task_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._create_task)
+        if self.loop_lag_interval > 0:
+            self._lag_task = self._loop.create_task(self._monitor_loop_lag())
+        self._thread = threading.Thread(target=self._sample_forever, name="profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Profiler started with a {self.interval * 1000:g}ms sampling interval")
+
+    async def stop(self) -> None:
+        """Stop sampling and the lag monitor."""
+        self._stopped.set()
+        if self._loop is not None:
+            self._loop.set_task_factory(self._previous_task_factory)
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    @property
+    def watches_all_requests(self) -> bool:
+        """Whether every request must be traced to catch slow ones."""
+        return self.slow_request > 0
+
+    def begin(self, method: str, path: str, reason: Optional[str] = None) -> RequestTrace:
+        """
+        Start tracing the current task's request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            reason: Why the request is profiled from the start (``header`` or
+                ``sampled``), or None to sample it only if it turns out slow
+
+        Returns:
+            Trace handle to pass to ``end``
+        """
+        profile = self._new_profile(method, path, reason) if reason else None
+        trace = RequestTrace(asyncio.current_task(), method, path, profile)
+        trace._token = _active_trace.set(trace)
+        with self._lock:
+            self._traces[id(trace)] = trace
+        return trace
+
+    def end(self, trace: RequestTrace) -> Optional[Profile]:
+        """
+        Stop tracing a request and keep its profile if one was recorded.
+
+        Args:
+            trace: Handle returned by ``begin``
+
+        Returns:
+            The finished profile, or None if the request was not sampled
+        """
+        _active_trace.reset(trace._token)
+        with self._lock:
+            self._traces.pop(id(trace), None)
+        profile = trace.profile
+        if profile is None:
+            return None
+        profile.duration_ms = round((time.perf_counter() - trace.started) * 1000, 3)
+        self.profiles.append(profile)
+        if profile.reason == "slow":
+            logger.warning(
+                f"Slow request {trace.method} {trace.path} took {profile.duration_ms:.0f}ms "
+                f"(profile {profile.profile_id})"
+            )
+        return profile
+
+    def get_profile(self, profile_id: str) -> Optional[Profile]:
+        """Find a finished profile by ID."""
+        return next((p for p in self.profiles if p.profile_id == profile_id), None)
+
+    def folded(self, reason: Optional[str] = None) -> str:
+        """
+        Merge finished profiles into one folded stack listing.
+
+        Args:
+            reason: Only include profiles captured for this reason
+
+        Returns:
+            Folded stacks, one ``stack count`` line each
+        """
+        merged: Counter = Counter()
+        for profile in list(self.profiles):
+            if reason is None or profile.reason == reason:
+                merged.update(profile.samples)
+        return "".join(f"{stack} {count}\n" for stack, count in merged.most_common())
+
+    def clear(self) -> None:
+        """Drop finished profiles and lag history."""
+        self.profiles.clear()
+        self._lags.clear()
+        self._stalls = 0
+
+    def loop_lag_stats(self) -> Dict:
+        """
+        Summarize event-loop lag measured by the monitor.
+
+        Returns:
+            Dictionary with probe count, mean/p50/p99/max lag in ms and stall count
+        """
+        lags = np.array(self._lags, dtype=float) * 1000
+        if lags.size == 0:
+            return {"probes": 0, "stalls": self._stalls}
+        return {
+            "probes": int(lags.size),
+            "mean_ms": round(float(lags.mean()), 3),
+            "p50_ms": round(float(np.percentile(lags, 50)), 3),
+            "p99_ms": round(float(np.percentile(lags, 99)), 3),
+            "max_ms": round(float(lags.max()), 3),
+            "stalls": self._stalls,
+        }
+
+    def _new_profile(self, method: str, path: str, reason: str) -> Profile:
+        """Create a profile with a new ID."""
+        return Profile(f"{os.getpid()}-{next(self._ids)}", method, path, reason)
+
+    def _create_task(self, loop, coro, context=None):
+        """Task factory that attributes tasks to the request that spawned them."""
+        kwargs = {} if context is None else {"context": context}
+        if self._previous_task_factory is not None:
+            task = self._previous_task_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        trace = _active_trace.get() if context is None else context.get(_active_trace)
+        if trace is not None:
+            trace.tasks.append(task)
+        return task
+
+    async def _monitor_loop_lag(self) -> None:
+        """Measure how late the event loop wakes up from fixed sleeps."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.loop_lag_interval)
+            self._heartbeat = time.perf_counter()
+            self._lags.append(max(self._heartbeat - started - self.loop_lag_interval, 0.0))
+
+    def _sample_forever(self) -> None:
+        """Background thread body."""
+        while not self._stopped.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:  # pragma: no cover - sampling must never kill the thread
+                logger.error(f"Profiler sampling error: {str(e)}")
+
+    def _sample(self) -> None:
+        """Take one sample of every traced request and of a stalled loop."""
+        now = time.perf_counter()
+        loop_frame = sys._current_frames().get(self._loop_thread_id)
+        current_task = asyncio.current_task(self._loop)
+        loop_stack = None
+
+        if self._lag_task is not None:
+            stalled = now - self._heartbeat > self.loop_lag_interval + self.loop_stall
+            if stalled and loop_frame is not None:
+                if self._stall_profile is None:
+                    self._stalls += 1
+                    self._stall_profile = self._new_profile("", "event-loop", "loop_stall")
+                    self._stall_profile.started_at = time.time() - (now - self._heartbeat)
+                loop_stack = ";".join(_thread_stack(loop_frame))
+                self._stall_profile.samples[loop_stack] += 1
+            elif not stalled and self._stall_profile is not None:
+                profile, self._stall_profile = self._stall_profile, None
+                profile.duration_ms = round((time.time() - profile.started_at) * 1000, 3)
+                self.profiles.append(profile)
+                logger.warning(f"Event loop stalled for {profile.duration_ms:.0f}ms")
+
+        with self._lock:
+            for trace in self._traces.values():
+                if trace.profile is None:
+                    if not self.slow_request or now - trace.started < self.slow_request:
+                        continue
+                    trace.profile = self._new_profile(trace.method, trace.path, "slow")
+                if current_task in trace.tasks and loop_frame is not None:
+                    if loop_stack is None:
+                        loop_stack = ";".join(_thread_stack(loop_frame))
+                    trace.profile.samples[loop_stack] += 1
+                    continue
+                live = [task for task in trace.tasks if not task.done()]
+                if live:
+                    trace.profile.samples[";".join(_await_stack(live[-1]))] += 1
@@ -0,0 +1,67 @@
+"""
+JSON serialization helpers.
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode types the standard library json module does not handle."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(value: Any) -> bytes:
+    """
+    Serialize a value to compact UTF-8 JSON.
+
+    Datetimes are encoded as ISO 8601 strings, matching FastAPI's encoder.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(
+        value, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_dumps_str(value: Any) -> str:
+    """
+    Serialize a value to a compact JSON string.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        Encoded JSON text
+    """
+    return json_dumps(value).decode("utf-8")
+
+
+def ndjson_line(value: Any) -> bytes:
+    """
+    Serialize a value as one newline-terminated NDJSON line.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        Encoded line bytes
+    """
+    return json_dumps(value) + b"\n"
@@ -0,0 +1,68 @@
+"""
+Tests for answering calculator turns from templates without a model call.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+from src.agent import FinancialAgent  # noqa: E402
+from src.services.chat_service import ChatService  # noqa: E402
+from src.services.fake_genai import DEFAULT_REPLY, FakeGenerativeModel  # noqa: E402
+from src.services.genai_service import GenAIService  # noqa: E402
+from src.services.key_pool import KeyPool  # noqa: E402
+from src.services.session_service import SessionService  # noqa: E402
+
+FORWARD_QUESTIONS = [
+    "What's the monthly loan payment on $250,000 at 6.5% for 30 years?",
+    "Calculate compound interest for $10,000 at 5% for 10 years",
+    "Debt payoff plan: $4,300 at 22.9% with $95 minimum, $12,000 at 5.5% with $312 minimum, "
+    "budget $900",
+]
+
+INVERSE_QUESTIONS = [
+    "How much house can I afford with a $2,000 monthly payment at 6% over 30 years?",
+    "How many years to reach $1,000,000 if I save $2,000 a month at 7%?",
+    "How long will it take to pay off a $250,000 mortgage at 6.5% with a $2,000 monthly payment?",
+    "What rate do I need for compound interest to grow $10,000 into $20,000 in 10 years?",
+    "I can pay $1,500 a month on a car loan at 7% over 5 years, how much car can I afford?",
+    "How much do I need to save monthly to reach $1,000,000 in 25 years at 7%?",
+]
+
+
+@pytest.fixture
+def service() -> ChatService:
+    pool = KeyPool(["test-key-0001"], lambda key: FakeGenerativeModel(key))
+    return ChatService(SessionService(), GenAIService(pool=pool), FinancialAgent())
+
+
+@pytest.mark.parametrize("message", FORWARD_QUESTIONS)
+def test_forward_questions_are_answered_from_templates(service, message):
+    turn = service.prepare_turn([message], "session")
+
+    assert turn.source == "calculation"
+    assert turn.response_text is not None
+
+
+@pytest.mark.parametrize("message", INVERSE_QUESTIONS)
+def test_inverse_questions_are_not_answered_from_templates(service, message):
+    turn = service.prepare_turn([message], "session")
+    assert turn.source != "calculation"
+    assert turn.response_text is None
+
+    fields = asyncio.run(service.complete_turn(turn))
+    assert turn.source == "model"
+    assert fields["response"] == DEFAULT_REPLY
+    assert fields["confidence"] < 0.95
+
+
+def test_ambiguous_rate_units_fall_back_to_the_model(service):
+    turn = service.prepare_turn(
+        ["Calculate compound interest for $10,000 at 5 for 10 years"], "session"
+    )
+
+    assert turn.calculation_result is not None
+    assert turn.source != "calculation"
@@ -0,0 +1,139 @@
+"""
+Tests for cancelling model calls on disconnect, supersession and stream close.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+from src.agent import FinancialAgent  # noqa: E402
+from src.services.batch_service import run_batch  # noqa: E402
+from src.services.chat_service import ChatService  # noqa: E402
+from src.services.fake_genai import DEFAULT_REPLY, FakeGenerativeModel, LatencyModel  # noqa: E402
+from src.services.genai_service import GenAIService  # noqa: E402
+from src.services.key_pool import KeyPool  # noqa: E402
+from src.services.session_service import SessionService  # noqa: E402
+from src.utils.exceptions import GenerationCancelled  # noqa: E402
+from src.utils.metrics import metrics  # noqa: E402
+
+QUESTION = "How should I prioritize paying off debt vs saving?"
+CALCULATION = "What's the monthly loan payment on $250,000 at 6.5% for 30 years?"
+
+
+def make_service() -> ChatService:
+    """Build a chat service whose fake model answers after 200 ms, streaming every 20 ms."""
+    pool = KeyPool(
+        ["test-key-0001"],
+        lambda key: FakeGenerativeModel(
+            key, latency=LatencyModel(200, "fixed"), chunk_interval_ms=20, chunk_words=2
+        ),
+    )
+    return ChatService(SessionService(), GenAIService(pool=pool), FinancialAgent())
+
+
+def cancellations(reason: str) -> int:
+    """Current count of generations cancelled for a reason."""
+    return metrics.snapshot().get(f"generations_cancelled_{reason}", 0)
+
+
+def pool_usage(service: ChatService) -> dict:
+    """Usage of the single pooled key."""
+    return service.genai_service.key_usage()[0]
+
+
+def test_newer_turn_supersedes_running_model_call():
+    service = make_service()
+    superseded = cancellations("superseded")
+
+    async def scenario():
+        first = asyncio.ensure_future(
+            service.complete_turn(service.prepare_turn([QUESTION], "session"))
+        )
+        await asyncio.sleep(0.05)
+        # Answered from a template, but still supersedes the running call
+        second = service.prepare_turn([QUESTION, "AI: ...", CALCULATION], "session")
+        assert second.source == "calculation"
+        await service.complete_turn(second)
+        with pytest.raises(GenerationCancelled) as cancelled:
+            await first
+        return cancelled.value.reason
+
+    assert asyncio.run(scenario()) == "superseded"
+    assert cancellations("superseded") == superseded + 1
+    # Only the newer turn is recorded
+    assert len(service.session_service.get_record("session").conversation_history) == 1
+    assert pool_usage(service)["cancelled"] == 1
+    assert pool_usage(service)["in_flight"] == 0
+
+
+def test_disconnect_cancels_model_call():
+    service = make_service()
+    disconnected = cancellations("disconnected")
+
+    async def scenario():
+        task = asyncio.ensure_future(
+            service.complete_turn(service.prepare_turn([QUESTION], "session"))
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert cancellations("disconnected") == disconnected + 1
+    assert pool_usage(service)["cancelled"] == 1
+    assert pool_usage(service)["in_flight"] == 0
+    assert service.session_service.get_record("session").conversation_history == []
+
+
+def test_closing_stream_cancels_model_call():
+    service = make_service()
+    disconnected = cancellations("disconnected")
+
+    async def scenario():
+        stream = service.stream_turn(service.prepare_turn([QUESTION], "session"))
+        events = [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()
+        return events
+
+    events = asyncio.run(scenario())
+    assert [event["type"] for event in events] == ["delta", "delta"]
+    assert cancellations("disconnected") == disconnected + 1
+    assert pool_usage(service)["cancelled"] == 1
+    assert pool_usage(service)["in_flight"] == 0
+
+
+def test_finished_call_is_not_counted_as_cancelled():
+    service = make_service()
+    before = metrics.snapshot()
+
+    fields = asyncio.run(service.complete_turn(service.prepare_turn([QUESTION], "session")))
+
+    assert fields["response"] == DEFAULT_REPLY
+    after = metrics.snapshot()
+    for reason in ("superseded", "disconnected"):
+        name = f"generations_cancelled_{reason}"
+        assert after.get(name, 0) == before.get(name, 0)
+
+
+def test_isolated_batch_does_not_supersede_live_calls():
+    service = make_service()
+    superseded = cancellations("superseded")
+
+    async def scenario():
+        live = asyncio.ensure_future(
+            service.complete_turn(service.prepare_turn([QUESTION], "session"))
+        )
+        await asyncio.sleep(0.05)
+        items = [{"history": [CALCULATION], "session_id": "session"}]
+        results = [result async for result in run_batch(service, items)]
+        return results, await live
+
+    results, live_fields = asyncio.run(scenario())
+    assert results[0]["status"] == "ok"
+    assert live_fields["response"] == DEFAULT_REPLY
+    assert cancellations("superseded") == superseded
+    assert len(service.session_service.get_record("session").conversation_history) == 1
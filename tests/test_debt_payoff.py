@@ -0,0 +1,50 @@
+"""
+Tests for the debt payoff optimizer and its templated answer.
+"""
+
+import os
+from datetime import date
+
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+from src.agent import FinancialAgent, FinancialTools  # noqa: E402
+
+DEBTS = [
+    {"name": "Credit card", "balance": 4300, "apr": 22.9, "minimum_payment": 95},
+    {"name": "Student loan", "balance": 12000, "apr": 5.5, "minimum_payment": 312},
+]
+
+
+def test_avalanche_is_recommended_when_it_costs_less():
+    result = FinancialTools.calculate_debt_payoff(DEBTS, 900, start_date=date(2026, 1, 1))
+
+    assert result["feasible"]
+    avalanche, snowball = result["strategies"]["avalanche"], result["strategies"]["snowball"]
+    assert avalanche["total_interest"] <= snowball["total_interest"]
+    assert result["recommended"] == "avalanche"
+    # The first payment is made in the start month
+    years, month = divmod(avalanche["months_to_debt_free"] - 1, 12)
+    assert avalanche["debt_free_date"] == f"{2026 + years}-{month + 1:02d}"
+
+
+def test_budget_below_monthly_interest_is_rejected():
+    debts = [{"balance": 20000, "apr": 24, "minimum_payment": 300}]
+    with pytest.raises(ValueError, match="interest"):
+        FinancialTools.calculate_debt_payoff(debts, 350)
+
+    agent = FinancialAgent()
+    message = "Debt payoff plan: $20,000 at 24% with $300 minimum, budget $350"
+    result = agent.execute_tool("debt_payoff", agent.extract_numbers(message), message)
+    assert "error" in result
+
+
+def test_plan_longer_than_the_horizon_is_not_rendered():
+    debts = [{"balance": 20000, "apr": 24, "minimum_payment": 300}]
+    result = FinancialTools.calculate_debt_payoff(debts, 400.1)
+
+    assert not result["feasible"]
+    assert result["recommended"] is None
+    assert result["strategies"]["avalanche"]["months_to_debt_free"] is None
+    assert FinancialAgent().render_calculation("debt_payoff", result) is None
@@ -0,0 +1,123 @@
+"""
+Tests for the API key pool against fake clients that enforce per-key quotas.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+from google.api_core.exceptions import ResourceExhausted  # noqa: E402
+
+from src.services.fake_genai import DEFAULT_REPLY, FakeGenerativeModel, FakeQuota  # noqa: E402
+from src.services.genai_service import GenAIService  # noqa: E402
+from src.services.key_pool import KeyPool  # noqa: E402
+from src.utils.exceptions import AIServiceError  # noqa: E402
+
+KEYS = ["test-key-0001", "test-key-0002"]
+
+
+def make_service(quota: FakeQuota, **model_options) -> GenAIService:
+    """Build a service over KEYS whose fake clients share one quota."""
+    pool = KeyPool(
+        KEYS,
+        lambda key: FakeGenerativeModel(key, quota, **model_options),
+        requests_per_minute=60,
+        burst=10,
+        cooldown_seconds=30.0,
+        max_wait_seconds=0.5,
+    )
+    return GenAIService(pool=pool)
+
+
+def usage_by_key(service: GenAIService) -> dict:
+    """Key usage indexed by the key's last four characters."""
+    return {usage["key"][-4:]: usage for usage in service.key_usage()}
+
+
+def test_fake_quota_is_enforced_per_key():
+    quota = FakeQuota(requests_per_minute=2)
+    quota.check(KEYS[0])
+    quota.check(KEYS[0])
+    with pytest.raises(ResourceExhausted):
+        quota.check(KEYS[0])
+    quota.check(KEYS[1])
+
+
+def test_rate_limited_key_cools_down_and_request_retries_on_another_key():
+    quota = FakeQuota(requests_per_minute=5)
+    for _ in range(5):
+        quota.check(KEYS[0])  # first key has already used its upstream quota
+    service = make_service(quota)
+
+    async def scenario():
+        return [await service.generate_response(f"question {i}") for i in range(2)]
+
+    assert asyncio.run(scenario()) == [DEFAULT_REPLY, DEFAULT_REPLY]
+
+    usage = usage_by_key(service)
+    exhausted, healthy = usage["0001"], usage["0002"]
+    assert exhausted["rate_limited"] == 1
+    assert exhausted["successes"] == 0
+    assert exhausted["cooldown_seconds"] > 25
+    assert exhausted["tokens_remaining"] < 1
+    assert healthy["rate_limited"] == 0
+    assert healthy["successes"] == 2
+    assert healthy["cooldown_seconds"] == 0
+
+
+def test_cooldown_doubles_on_consecutive_rate_limits():
+    pool = KeyPool(KEYS[:1], lambda key: None, cooldown_seconds=10.0)
+    state = pool.keys[0]
+
+    for expected in (10.0, 20.0):
+        with pytest.raises(ResourceExhausted):
+            with pool.lease_nowait():
+                raise ResourceExhausted("quota")
+        assert pool.usage()[0]["cooldown_seconds"] == pytest.approx(expected, abs=0.5)
+        state.cooldown_until = 0.0
+        state.bucket.tokens = 1.0
+
+    with pool.lease_nowait():
+        pass
+    assert state.consecutive_rate_limits == 0
+
+
+def test_fails_once_every_key_is_rate_limited():
+    quota = FakeQuota(requests_per_minute=1)
+    for key in KEYS:
+        quota.check(key)
+    service = make_service(quota)
+
+    with pytest.raises(AIServiceError):
+        asyncio.run(service.generate_response("question"))
+
+    for usage in service.key_usage():
+        assert usage["requests"] == 1
+        assert usage["rate_limited"] == 1
+        assert usage["successes"] == 0
+        assert usage["in_flight"] == 0
+
+
+def test_usage_counts_successes_and_errors():
+    service = make_service(FakeQuota(requests_per_minute=100))
+
+    async def scenario():
+        return await asyncio.gather(*(service.generate_response(f"q {i}") for i in range(6)))
+
+    asyncio.run(scenario())
+    usage = service.key_usage()
+    assert sum(key["requests"] for key in usage) == 6
+    assert sum(key["successes"] for key in usage) == 6
+    assert all(key["requests"] == 3 for key in usage)
+    assert all(key["in_flight"] == 0 and key["errors"] == 0 for key in usage)
+
+    failing = make_service(FakeQuota(requests_per_minute=100), error_rate=1.0)
+    with pytest.raises(AIServiceError):
+        asyncio.run(failing.generate_response("question"))
+    usage = failing.key_usage()
+    assert sum(key["errors"] for key in usage) == 1
+    assert sum(key["rate_limited"] for key in usage) == 0
+    assert all(key["in_flight"] == 0 for key in usage)
@@ -0,0 +1,51 @@
+"""
+Tests for matching paraphrased questions in the semantic cache.
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+from src.services.semantic_cache import SemanticCache, intent_tokens  # noqa: E402
+
+THRESHOLD = 0.85
+
+
+@pytest.mark.parametrize(
+    "cached, question",
+    [
+        ("When should I start saving for retirement?", "Why should I start saving for retirement?"),
+        ("Where should I keep my emergency fund?", "How big should my emergency fund be?"),
+        ("When can I withdraw from my 401(k)?", "How much can I withdraw from my 401(k)?"),
+        ("Who needs life insurance?", "Why do I need life insurance?"),
+    ],
+)
+def test_questions_with_a_different_intent_miss(cached, question):
+    cache = SemanticCache(capacity=10, threshold=THRESHOLD)
+    cache.put(cached, "answer")
+
+    assert cache.get(question) is None
+
+
+@pytest.mark.parametrize(
+    "cached, question",
+    [
+        ("How big should my emergency fund be?", "How large should an emergency fund be?"),
+        ("How much should I save for retirement?", "How much do I need to save for retirement?"),
+        ("How do tax brackets work?", "What do tax brackets mean?"),
+    ],
+)
+def test_paraphrases_with_the_same_intent_hit(cached, question):
+    cache = SemanticCache(capacity=10, threshold=THRESHOLD)
+    cache.put(cached, "answer")
+
+    assert cache.get(question) == "answer"
+
+
+def test_intent_tokens():
+    assert intent_tokens("How many months of expenses?") == ["?amount"]
+    assert intent_tokens("At what age should I retire?") == ["?when"]
+    # Explanation questions carry no intent token
+    assert intent_tokens("What is compound interest?") == []
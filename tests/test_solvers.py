@@ -0,0 +1,165 @@
+"""
+Tests for the goal-seeking solvers and how chat routes inverse questions to them.
+"""
+
+import math
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+from src.agent import FinancialAgent, FinancialTools, GoalSolvers  # noqa: E402
+from src.agent.solvers import solve_increasing  # noqa: E402
+from src.services.chat_service import ChatService  # noqa: E402
+from src.services.fake_genai import FakeGenerativeModel  # noqa: E402
+from src.services.genai_service import GenAIService  # noqa: E402
+from src.services.key_pool import KeyPool  # noqa: E402
+from src.services.session_service import SessionService  # noqa: E402
+
+
+def test_solve_increasing_converges_within_its_iteration_bound():
+    targets = np.array([1e-6, 0.5, 2.0, 123.456, 9e5])
+    tol = 1e-12
+    roots, converged, iterations = solve_increasing(
+        lambda x: x**3 + x - targets, np.zeros(5), np.full(5, 100.0), tol=tol
+    )
+
+    assert converged.all()
+    assert np.allclose(roots**3 + roots, targets, rtol=1e-9)
+    assert iterations <= 2 * math.log2(100.0 / tol) + 2
+
+
+def test_solve_increasing_reports_unbracketed_roots():
+    roots, converged, _ = solve_increasing(
+        lambda x: x - np.array([5.0, 50.0]), np.zeros(2), np.full(2, 10.0)
+    )
+
+    assert converged.tolist() == [True, False]
+    assert roots[0] == pytest.approx(5.0)
+    assert np.isnan(roots[1])
+
+
+@pytest.mark.parametrize("rate", [0.5, 3.25, 6.5, 12.0, 29.9])
+@pytest.mark.parametrize("years", [1, 15, 30])
+def test_loan_solvers_invert_the_payment_calculator(rate, years):
+    principal = 250000.0
+    payment = FinancialTools.calculate_loan_payment(principal, rate, years)["monthly_payment"]
+
+    solved = GoalSolvers.solve_loan_rate(principal, payment, years)
+    assert solved["converged"]
+    assert solved["rate"] == pytest.approx(rate, abs=1e-3)
+    assert GoalSolvers.solve_loan_principal(payment, rate, years)["principal"] == pytest.approx(
+        principal, rel=1e-5
+    )
+    assert GoalSolvers.solve_loan_term(principal, payment, rate)["years"] == pytest.approx(
+        years, abs=0.01
+    )
+
+
+@pytest.mark.parametrize("annual_return", [0.0, 2.0, 7.0, 14.0])
+def test_retirement_solvers_invert_the_savings_calculator(annual_return):
+    contribution, years, current = 800.0, 30, 42500.0
+    target = FinancialTools.calculate_retirement_savings(
+        contribution, years, annual_return, current
+    )["total_savings"]
+
+    assert GoalSolvers.solve_monthly_contribution(target, years, annual_return, current)[
+        "monthly_contribution"
+    ] == pytest.approx(contribution, abs=0.01)
+    assert GoalSolvers.solve_retirement_years(target, contribution, annual_return, current)[
+        "years"
+    ] == pytest.approx(years, abs=0.01)
+    solved = GoalSolvers.solve_retirement_return(target, contribution, years, current)
+    assert solved["converged"]
+    assert solved["annual_return"] == pytest.approx(annual_return, abs=1e-3)
+
+
+def test_solvers_broadcast_and_flag_unreachable_goals():
+    solved = GoalSolvers.solve_loan_term(250000, [2000, 1000], 6.5)
+    assert solved["years"][0] == pytest.approx(17.44, abs=0.01)
+    # $1,000 a month never covers the interest on $250,000 at 6.5%
+    assert solved["years"][1] is None
+
+    solved = GoalSolvers.solve_retirement_return([1e6, 1e20], 1000, 30)
+    assert solved["converged"] == [True, False]
+    assert solved["annual_return"][1] is None
+
+
+@pytest.mark.parametrize(
+    "message, goal, field, expected",
+    [
+        (
+            "How much house can I afford with a $2,000 monthly payment at 6% over 30 years?",
+            "loan_principal",
+            "principal",
+            333583.23,
+        ),
+        (
+            "How many years to reach $1,000,000 if I save $2,000 a month at 7%?",
+            "retirement_years",
+            "years",
+            19.56,
+        ),
+        (
+            "How long will it take to pay off a $250,000 mortgage at 6.5% with a $2,000 "
+            "monthly payment?",
+            "loan_term",
+            "years",
+            17.44,
+        ),
+        (
+            "What interest rate is my $250,000 mortgage if the monthly payment is $1,580 "
+            "over 30 years?",
+            "loan_rate",
+            "rate",
+            6.499,
+        ),
+        (
+            "What return do I need to reach $1,000,000 saving $1,000 a month for 30 years?",
+            "retirement_return",
+            "annual_return",
+            5.9764,
+        ),
+        (
+            "How much do I need to save monthly to reach $1,000,000 in 25 years at 7%?",
+            "monthly_contribution",
+            "monthly_contribution",
+            1234.46,
+        ),
+    ],
+)
+def test_inverse_questions_run_the_matching_solver(message, goal, field, expected):
+    agent = FinancialAgent()
+    request = agent.detect_calculation_request(message)
+    assert request["goal"] == goal
+
+    result = agent.execute_goal(goal, agent.extract_numbers(message), message)
+    assert result["solved_for"] == goal
+    assert result[field] == pytest.approx(expected, abs=0.01)
+
+
+def test_goal_inputs_that_do_not_fit_are_not_solved():
+    agent = FinancialAgent()
+    # No rate written as a percentage
+    message = "How much house can I afford with a $2,000 monthly payment at 6 over 30 years?"
+    assert agent.execute_goal("loan_principal", agent.extract_numbers(message), message) is None
+
+    message = "How long to pay off a $250,000 mortgage at 6.5% paying $1,000 monthly?"
+    result = agent.execute_goal("loan_term", agent.extract_numbers(message), message)
+    assert "error" in result
+
+
+def test_chat_explains_solver_results_with_the_model():
+    pool = KeyPool(["test-key-0001"], lambda key: FakeGenerativeModel(key))
+    service = ChatService(SessionService(), GenAIService(pool=pool), FinancialAgent())
+    turn = service.prepare_turn(
+        ["How many years to reach $1,000,000 if I save $2,000 a month at 7%?"], "session"
+    )
+
+    assert turn.response_text is None
+    assert turn.calculation_result["solved_for"] == "retirement_years"
+    prompt = service.build_prompt(turn)
+    assert '"solved_for":"retirement_years"' in prompt
+    assert '"monthly_contribution":0.0' not in prompt